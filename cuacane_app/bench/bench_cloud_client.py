@@ -0,0 +1,50 @@
+import argparse
+import time
+
+import requests
+
+from cuacane_app.utils.cloud_client import CloudClient
+from cuacane_app.utils.cloud_stub_server import CloudStubServer
+
+LINE = "0R0,Dn=255#,Dm=331#,Dx=065#,Sn=0.1#,Sm=0.9#,Sx=1.4#,Ta=25.0C,Tp=25.3C,Ua=70.2P,Pa=0.9248B,Rc=0.0M,Rd=0s,Ri=0.0M,Th=23.4C,Vs=12.0N"
+
+
+def bench_fresh_requests(url, n):
+    """Cara lama: requests.get baru setiap polling."""
+    total_bytes = 0
+    t0 = time.perf_counter()
+    for _ in range(n):
+        r = requests.get(f"{url}/latest_raw", timeout=5)
+        total_bytes += len(r.content)
+        r.json().get("raw", "")
+    return time.perf_counter() - t0, total_bytes
+
+def bench_session_client(url, n):
+    client = CloudClient(base_url=url)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        client.fetch_latest_raw()
+    elapsed = time.perf_counter() - t0
+    client.close()
+    return elapsed, client.stats["bytes"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark polling /latest_raw secara offline")
+    parser.add_argument("-n", type=int, default=200, help="jumlah polling")
+    parser.add_argument("--handshake-ms", type=float, default=20.0, help="simulasi biaya koneksi baru (ms)")
+    parser.add_argument("--padding", type=int, default=2048, help="ukuran tambahan body respons (byte)")
+    args = parser.parse_args()
+
+    server = CloudStubServer(handshake_delay=args.handshake_ms / 1000.0, padding=args.padding).start()
+    server.push_line(LINE)
+    try:
+        for name, fn in (("requests.get (lama)", bench_fresh_requests), ("CloudClient", bench_session_client)):
+            conn_before = server.connections
+            elapsed, nbytes = fn(server.url, args.n)
+            print(f"{name:22s} {elapsed * 1000 / args.n:8.2f} ms/poll  "
+                  f"{nbytes / args.n:8.0f} B/poll  koneksi baru={server.connections - conn_before}")
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
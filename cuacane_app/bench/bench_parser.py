@@ -0,0 +1,113 @@
+import argparse
+import contextlib
+import io
+import random
+import time
+from datetime import datetime
+
+from cuacane_app.utils.line_parser import parse_0R0_line, parse_many
+
+LINE = "0R0,Dn=255#,Dm=331#,Dx=065#,Sn=0.1#,Sm=0.9#,Sx=1.4#,Ta=25.0C,Tp=25.3C,Ua=70.2P,Pa=0.9248B,Rc=0.0M,Rd=0s,Ri=0.0M,Th=23.4C,Vs=12.0N"
+
+
+def legacy_parse_0R0_line(payload: str, timestamp: str = None) -> dict:
+    """Parser lama (replace berantai + match per key), acuan paritas & baseline benchmark."""
+    try:
+        now = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        data_parts = payload.strip().split(',')
+
+        data_dict = {
+            "datetime": now,
+            "wind_dir_avg": None,
+            "wind_dir_min": None,
+            "wind_dir_max": None,
+            "wind_speed_avg": None,
+            "wind_speed_min": None,
+            "wind_speed_max": None,
+            "temp_air": None,
+            "temp_probe": None,
+            "humidity": None,
+            "pressure": None,
+            "rain_accum": None,
+            "rain_duration": None,
+            "rain_intensity": None,
+            "heating_temp": None,
+            "voltage_supply": None,
+        }
+
+        for part in data_parts:
+            if '=' in part:
+                key, raw_value = part.split('=')
+                key = key.strip()
+                raw_value = raw_value.strip()
+                value = raw_value.replace('#', '') \
+                                 .replace('C', '').replace('P', '').replace('B', '') \
+                                 .replace('M', '').replace('N', '').replace('s', '') \
+                                 .replace('V', '').replace('D', '').replace(',', '.')
+
+                try:
+                    match key:
+                        case 'Dn': data_dict['wind_dir_min'] = int(value)
+                        case 'Dm': data_dict['wind_dir_avg'] = int(value)
+                        case 'Dx': data_dict['wind_dir_max'] = int(value)
+                        case 'Sn': data_dict['wind_speed_min'] = float(value)
+                        case 'Sm': data_dict['wind_speed_avg'] = float(value)
+                        case 'Sx': data_dict['wind_speed_max'] = float(value)
+                        case 'Ta': data_dict['temp_air'] = float(value)
+                        case 'Tp': data_dict['temp_probe'] = float(value)
+                        case 'Ua': data_dict['humidity'] = float(value)
+                        case 'Pa': data_dict['pressure'] = float(value) * 1000  # bar to Pa
+                        case 'Rc': data_dict['rain_accum'] = float(value)
+                        case 'Rd': data_dict['rain_duration'] = float(value)
+                        case 'Ri': data_dict['rain_intensity'] = float(value)
+                        case 'Th': data_dict['heating_temp'] = float(value)
+                        case 'Vs': data_dict['voltage_supply'] = float(value)
+                except ValueError:
+                    print(f"[⚠️] Invalid number format for key {key}: {value}")
+
+        return data_dict
+    except Exception as e:
+        print(f"[ERROR] Failed to parse line: {e}")
+        return {}
+
+def make_lines(n, seed=0, digits=1):
+    """Line 0R0 sintetis dengan nilai acak (semua valid); digits besar → nilai hampir unik."""
+    rng = random.Random(seed)
+    d = digits
+    lines = []
+    for _ in range(n):
+        lines.append(
+            f"0R0,Dn={rng.randint(0, 359):03d}#,Dm={rng.randint(0, 359):03d}#,Dx={rng.randint(0, 359):03d}#,"
+            f"Sn={rng.uniform(0, 3):.{d}f}#,Sm={rng.uniform(0, 6):.{d}f}#,Sx={rng.uniform(0, 9):.{d}f}#,"
+            f"Ta={rng.uniform(20, 32):.{d}f}C,Tp={rng.uniform(20, 32):.{d}f}C,Ua={rng.uniform(40, 95):.{d}f}P,"
+            f"Pa={rng.uniform(0.91, 0.93):.4f}B,Rc={rng.uniform(0, 5):.2f}M,Rd={rng.randint(0, 600)}s,"
+            f"Ri={rng.uniform(0, 20):.{d}f}M,Th={rng.uniform(20, 30):.{d}f}C,Vs={rng.uniform(11, 13):.{d}f}N"
+        )
+    return lines
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(*args)
+    return time.perf_counter() - t0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser line 0R0")
+    parser.add_argument("-n", type=int, default=100000, help="jumlah line")
+    parser.add_argument("--digits", type=int, default=1,
+                        help="jumlah desimal nilai acak (besar = kasus terburuk untuk cache)")
+    args = parser.parse_args()
+
+    lines = make_lines(args.n, digits=args.digits)
+    results = [
+        ("legacy per-line", timed(lambda: [legacy_parse_0R0_line(l) for l in lines])),
+        ("parse_0R0_line", timed(lambda: [parse_0R0_line(l) for l in lines])),
+        ("parse_many (batch)", timed(parse_many, lines)),
+    ]
+    base = results[0][1]
+    for name, elapsed in results:
+        print(f"{name:20s} {elapsed * 1e6 / args.n:8.2f} µs/line  {args.n / elapsed:12.0f} line/s  x{base / elapsed:.2f}")
+
+if __name__ == "__main__":
+    main()
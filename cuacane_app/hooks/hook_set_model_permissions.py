@@ -1,7 +1,7 @@
 import os
 import stat
 
-def make_files_readable(path, extensions=(".pth", ".pkl", ".csv")):
+def make_files_readable(path, extensions=(".npz", ".pth", ".pkl", ".csv")):
     for dirpath, _, filenames in os.walk(path):
         for fname in filenames:
             if fname.endswith(extensions):
@@ -4,6 +4,7 @@ from PyQt5 import QtWebEngineWidgets  # ⬅ trigger import agar context dibuat
 PyQt5.QtCore.QCoreApplication.setOrganizationName("Cuacane")
 PyQt5.QtCore.QCoreApplication.setOrganizationDomain("cuacane.local")
 PyQt5.QtCore.QCoreApplication.setApplicationName("Cuacane App")
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 from cuacane_app.main_window import MainWindow
 
@@ -17,6 +18,8 @@ def main():
     print("[DEBUG] MainWindow dibuat")
     window.showMaximized()
     print("[DEBUG] Window ditampilkan")
+    # Model prediksi dimuat di latar setelah UI tampil (atau saat horizon pertama dipakai)
+    QTimer.singleShot(0, window.sensor_manager.prefetch_models)
 
     sys.exit(app.exec_())
 
@@ -8,7 +8,7 @@ from PyQt5.QtQml import qmlRegisterSingletonType
 from PyQt5.QtGui import QIcon
 import os
 
-from cuacane_app.utils.convert_to_mh2 import batch_convert
+from cuacane_app.utils.convert_to_mh2 import convert_log_range
 from cuacane_app.views.settings_manager import SettingsManager
 from cuacane_app.utils.sensor_connection import SensorConnectionManager
 import sys
@@ -22,12 +22,17 @@ def resource_path(relative_path):
 
 
 class ConvertSignalHandler(QObject):
+    def __init__(self, log_path="cuacane_app/data_logs/realtime_log.csv", archive_path=None, parent=None):
+        super().__init__(parent)
+        self.log_path = log_path
+        # Log aktif hanya berisi hari ini; hari-hari sebelumnya ada di arsip gzip
+        self.archive_path = archive_path or os.path.join(os.path.dirname(log_path), "archive")
+
     @pyqtSlot(str)
     def convertNow(self, output_path):
         try:
-            input_file = "cuacane_app/data_logs/realtime_log.csv"
             output_file = os.path.join(output_path, "output.MH2")
-            batch_convert(input_path=input_file, output_path=output_file)
+            convert_log_range(self.log_path, output_file, archive_path=self.archive_path)
             QMessageBox.information(None, "Sukses", f"File MH2 berhasil disimpan di:\n{output_file}")
         except Exception as e:
             QMessageBox.critical(None, "Gagal", f"Gagal membuat file MH2:\n{str(e)}")
@@ -107,6 +112,8 @@ class MainWindow(QWidget):
         self.settings_manager = SettingsManager()
         self.sensor_manager = SensorConnectionManager()
         self.sensor_manager.main_window = self
+        self.settings_manager.historyCapacityChanged.connect(
+            lambda: self.sensor_manager.setHistoryCapacity(self.settings_manager.historyCapacity))
 
         # === Theme QML Singleton
         qmlRegisterSingletonType(QUrl.fromLocalFile(resource_path("views/Theme.qml")), "AppTheme", 1, 0, "Theme")
@@ -128,7 +135,7 @@ class MainWindow(QWidget):
         prediksi_page = QWidget()
         prediksi_layout = QVBoxLayout(prediksi_page)
 
-        prediksi_qml = QQuickWidget()
+        self.prediksi_qml = prediksi_qml = QQuickWidget()
         prediksi_qml.rootContext().setContextProperty("settingsManager", self.settings_manager)
         prediksi_qml.rootContext().setContextProperty("windPredictionModel", self.sensor_manager.windPredictionModel)
         prediksi_qml.setResizeMode(QQuickWidget.SizeRootObjectToView)
@@ -137,6 +144,12 @@ class MainWindow(QWidget):
 
         prediksi_layout.addWidget(prediksi_qml)
 
+        # Model prediksi mengikuti stasiun yang dipilih di dashboard
+        self.sensor_manager.currentStationChanged.connect(
+            lambda: self.prediksi_qml.rootContext().setContextProperty(
+                "windPredictionModel", self.sensor_manager.windPredictionModel)
+        )
+
         # === GPM Maps Page ===
         gpm_page = QWidget()
         gpm_layout = QVBoxLayout(gpm_page)
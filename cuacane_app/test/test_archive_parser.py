@@ -0,0 +1,84 @@
+import csv
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+from cuacane_app.utils.archive_parser import CsvLogSink, parse_archive, split_archive_line
+from cuacane_app.utils.line_parser import parse_0R0_line
+
+LINE = "0R0,Dn=255#,Dm={dir:03d}#,Dx=065#,Sn=0.1#,Sm=0.9#,Sx=1.4#,Ta=25.0C,Ua=70.2P,Pa=0.9248B"
+START = datetime(2025, 7, 29, 12, 0, 0)
+
+
+def write_archive(path, n):
+    """Arsip dengan sedikit baris tertukar urutan, plus baris rusak/tanpa timestamp."""
+    rng = random.Random(3)
+    rows = [(START + timedelta(seconds=5 * i), LINE.format(dir=i % 360)) for i in range(n)]
+    for i in range(0, n - 1, 7):
+        j = min(n - 1, i + rng.randint(1, 3))
+        rows[i], rows[j] = rows[j], rows[i]
+    with open(path, "w") as f:
+        for k, (ts, raw) in enumerate(rows):
+            sep = "\t" if k % 2 else " "
+            f.write(f"{ts:%Y-%m-%d %H:%M:%S}{sep}{raw}\n")
+            if k % 50 == 0:
+                f.write("0R0,Dm=1#\n")                       # tanpa timestamp
+                f.write(f"{ts:%Y-%m-%d %H:%M:%S} 0R0,Ta=1=2\n")  # rusak
+    return rows
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+def test_split_archive_line():
+    epoch, raw = split_archive_line("2025-07-29 12:00:05, 0R0,Ta=25.0C")
+    assert raw == "0R0,Ta=25.0C"
+    assert epoch == int(datetime(2025, 7, 29, 12, 0, 5).timestamp())
+    assert split_archive_line("0R0,Ta=25.0C")[0] is None
+
+def test_archive_sorted_with_reject_counts():
+    n = 400
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "raw.txt")
+        write_archive(archive, n)
+        outputs = {}
+        for workers in (0, 2):
+            out = os.path.join(tmp, f"log_{workers}.csv")
+            sink = CsvLogSink(out)
+            stats = parse_archive([archive], sink=sink, workers=workers, chunk_bytes=2048, reorder_window=60)
+            sink.close()
+            outputs[workers] = read_rows(out)
+
+            assert stats["rows"] == n and stats["written"] == n
+            assert stats["no_timestamp"] == 8
+            assert stats["malformed"] == 8
+            assert stats["lines"] == n + 16
+            assert stats["late"] == 0
+
+        assert outputs[0] == outputs[2], "❌ Hasil pool harus sama dengan mode tanpa pool"
+        rows = outputs[0]
+        stamps = [r[0] for r in rows[1:]]
+        assert stamps == sorted(stamps)
+
+        # Format baris sama dengan append_to_log (str dari hasil parse_0R0_line)
+        expected = parse_0R0_line(LINE.format(dir=3), timestamp=stamps[3])
+        assert rows[4] == ["" if v is None else str(v) for v in expected.values()]
+
+def test_sink_skips_already_logged_period():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "raw.txt")
+        write_archive(archive, 100)
+        out = os.path.join(tmp, "log.csv")
+        for expected_written in (100, 0):
+            sink = CsvLogSink(out)
+            stats = parse_archive([archive], sink=sink, workers=0)
+            sink.close()
+            assert stats["written"] == expected_written
+        assert len(read_rows(out)) == 101
+
+if __name__ == "__main__":
+    test_split_archive_line()
+    test_archive_sorted_with_reject_counts()
+    test_sink_skips_already_logged_period()
+    print("✅ Semua test archive parser berhasil!")
@@ -0,0 +1,89 @@
+import os
+import tempfile
+from datetime import datetime
+
+from cuacane_app.utils.backfill import read_last_logged_timestamp, iter_backfill_batches, find_gap
+from cuacane_app.utils.cloud_client import CloudClient
+from cuacane_app.utils.cloud_stub_server import CloudStubServer
+from cuacane_app.utils.ingestion_worker import IngestionWorker
+from cuacane_app.utils.sensor_sources import CloudSource
+
+LINE = "0R0,Dn=255#,Dm={dir}#,Dx=065#,Sn=0.1#,Sm=0.9#,Sx=1.4#,Ta=25.0C"
+
+def test_read_last_logged_timestamp():
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "realtime_log.csv")
+        with open(log_path, "w") as f:
+            f.write("datetime,temp_air\n")
+            for i in range(2000):
+                f.write(f"2025-07-29 12:{i // 60 % 60:02d}:{i % 60:02d},25.0\n")
+            f.write("\n")
+
+        assert read_last_logged_timestamp(log_path) == datetime(2025, 7, 29, 12, 33, 19)
+        assert read_last_logged_timestamp(os.path.join(tmp, "tidak_ada.csv")) is None
+
+def test_batch_sorted_without_duplicates():
+    last_ts = datetime(2025, 7, 29, 12, 0, 0)
+    items = [
+        ("2025-07-29 12:00:10", LINE.format(dir=110)),
+        ("2025-07-29 11:59:59", LINE.format(dir=100)),   # sudah tercatat
+        ("2025-07-29 12:00:05", LINE.format(dir=105)),
+        ("2025-07-29 12:00:10", LINE.format(dir=110)),   # duplikat
+        ("bukan-timestamp", LINE.format(dir=1)),
+    ]
+    (columns, last_raw), = iter_backfill_batches(items, last_ts=last_ts)
+
+    assert columns["wind_dir_avg"].tolist() == [105, 110]
+    assert columns["epoch"][0] == int(datetime(2025, 7, 29, 12, 0, 5).timestamp())
+    assert last_raw == LINE.format(dir=110)
+
+def test_batches_stream_pages():
+    items = ((f"2025-07-29 12:{i // 60:02d}:{i % 60:02d}", LINE.format(dir=i % 360)) for i in range(1, 1200))
+    pages = [columns["epoch"] for columns, _ in iter_backfill_batches(items, batch_size=500)]
+    assert [len(p) for p in pages] == [500, 500, 199], "❌ Generator dibaca per halaman"
+    assert all((p[1:] > p[:-1]).all() for p in pages)
+
+def test_find_gap():
+    now = datetime(2025, 7, 29, 13, 0, 0)
+    assert find_gap(datetime(2025, 7, 29, 12, 59, 30), now=now) is None
+    assert find_gap(datetime(2025, 7, 29, 12, 0, 0), now=now) == (datetime(2025, 7, 29, 12, 0, 0), now)
+    assert find_gap(None, now=now) is None
+
+def test_worker_backfills_gap_from_cloud():
+    server = CloudStubServer().start()
+    try:
+        for i in range(12):
+            server.push_line(LINE.format(dir=100 + i), timestamp=f"2025-07-29 12:{i:02d}:00")
+
+        client = CloudClient(base_url=server.url)
+        logged = []
+        source = CloudSource(client.fetch_latest_raw,
+                             lambda start, end: client.fetch_raw_range(start, end, page_size=5))
+        worker = IngestionWorker(
+            source, logged.append,
+            last_logged_ts=datetime(2025, 7, 29, 12, 3, 0),
+        )
+        batches = []
+        worker.batchReady.connect(batches.append)
+        added = worker.run_backfill(now=datetime(2025, 7, 29, 13, 0, 0))
+
+        assert added == 8
+        assert [r["wind_dir_avg"] for r in logged] == list(range(104, 112))
+        # Semua kecuali yang terbaru langsung ke history; yang terbaru lewat queue live
+        assert [d for b in batches for d in b["wind_dir_avg"].tolist()] == list(range(104, 111))
+        (latest, ts), = worker.drain()
+        assert latest["wind_dir_avg"] == 111 and ts == datetime(2025, 7, 29, 12, 11, 0)
+        # Raw terakhir sudah masuk lewat backfill → polling live tidak mencatat ulang
+        worker.poll_once()
+        assert len(logged) == 8
+        client.close()
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    test_read_last_logged_timestamp()
+    test_batch_sorted_without_duplicates()
+    test_batches_stream_pages()
+    test_find_gap()
+    test_worker_backfills_gap_from_cloud()
+    print("✅ Semua test backfill berhasil!")
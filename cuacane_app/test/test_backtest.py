@@ -0,0 +1,117 @@
+import math
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from cuacane_app.utils.backtest import (
+    build_feature_table, feature_matrix, hourly_summary, load_history, match_observations,
+    predict_batch, run_backtest,
+)
+from cuacane_app.utils.multi_predictor import FEATURE_ORDER, load_model, new_prediction_state, predict_from_data
+from cuacane_app.utils.numpy_engine import NumpyMLP
+
+def write_log(path, n, step_s=60):
+    """Log sintetis: satu baris per menit mulai 2025-07-29 08:00:00, angin berubah tiap baris."""
+    with open(path, "w") as f:
+        f.write("timestamp,temp_air,humidity,pressure,wind_speed_avg,wind_dir_avg\n")
+        for i in range(n):
+            s = i * step_s
+            ts = f"2025-07-29 {8 + s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}"
+            speed = 1.0 + (i % 7) * 0.3
+            direction = (i * 17) % 360
+            f.write(f"{ts},{(i * 5) % 360},{direction},{direction + 10},0.5,{speed},{speed + 1},"
+                    f"22.7,23.1,75.2,925.0,0.0,0.0,0.0,20.8,12.2\n")
+
+def persistence_models():
+    """Engine linear yang mengeluarkan prev_windspeed/sin/cos → prediksi = observasi saat terbit."""
+    models = {}
+    for h, order in FEATURE_ORDER.items():
+        W = np.zeros((len(order), 3))
+        for out, name in enumerate(("prev_windspeed", "prev_sin_dir", "prev_cos_dir")):
+            W[order.index(name), out] = 1.0
+        models[h] = {"engine": NumpyMLP([W], [np.zeros(3)]), **new_prediction_state()}
+    return models
+
+def test_feature_table_matches_live_input():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.csv")
+        write_log(path, 10)
+        history = load_history(path)
+    table = build_feature_table(history)
+
+    i = 6   # baris "terbaru": history angin [-3]/[-4] = baris 4/3
+    speed, direction = history["wind_speed_avg"], history["wind_dir_avg"]
+    now = datetime.fromtimestamp(int(history["epoch"][i]))
+    expected = {
+        "air_temp": 22.7, "relative_humid": 75.2, "air_pressure": 925.0 / 1013.25,
+        "hour": now.hour, "month": now.month, "weekday": now.weekday(),
+        "sin_hour": np.sin(2 * np.pi * now.hour / 24), "cos_month": np.cos(2 * np.pi * now.month / 12),
+        "prev_windspeed": speed[i], "prev_sin_dir": np.sin(np.radians(direction[i])),
+        "lag2_windspeed": speed[i - 2], "lag3_windspeed": speed[i - 3],
+        "lag2_sin_dir": np.sin(np.radians(direction[i - 2])), "lag3_cos_dir": np.cos(np.radians(direction[i - 3])),
+    }
+    for key, value in expected.items():
+        assert math.isclose(table[key][i], value, abs_tol=1e-9), key
+    X = feature_matrix(table, "1h")
+    assert X.shape == (10, len(FEATURE_ORDER["1h"])) and X.dtype == np.float32
+
+def test_match_observations_tolerance():
+    epochs = np.array([0, 60, 120, 300])
+    idx = match_observations(epochs, np.array([59, 90, 170, 1000, -5]), tolerance=60)
+    assert idx.tolist() == [1, 1, 2, -1, 0], "❌ Observasi terdekat dalam ±tolerance, selain itu -1"
+    assert match_observations(np.array([], dtype=np.int64), np.array([1])).tolist() == [-1]
+
+def test_predict_batch_independent_of_batch_size():
+    rng = np.random.default_rng(0)
+    engine = NumpyMLP([rng.normal(size=(11, 8)), rng.normal(size=(8, 3))], [np.zeros(8), np.zeros(3)])
+    X = rng.normal(size=(1000, 11)).astype(np.float32)
+    full = predict_batch({"engine": engine}, X, batch_size=4096)
+    chunked = predict_batch({"engine": engine}, X, batch_size=64)
+    assert np.allclose(full[0], chunked[0], atol=1e-5) and np.allclose(full[1], chunked[1], atol=1e-3)
+
+def test_hourly_summary_bins_by_hour():
+    hours = np.array([3, 3, 5])
+    rows = hourly_summary(hours, np.array([1.0, -3.0, 2.0]), np.zeros(3), np.array([1.0, 3.0, 2.0]))
+    assert [r["hour"] for r in rows] == [3, 5]
+    assert rows[0]["n"] == 2 and math.isclose(rows[0]["mae"], 2.0) and math.isclose(rows[0]["rmse"], math.sqrt(5))
+
+def test_run_backtest_persistence_engine():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.csv")
+        write_log(path, 8 * 60)    # 08:00 … 15:59, tiap menit
+        results, timer = run_backtest(path, models=persistence_models(), batch_size=100)
+
+    r15 = results["15m"]
+    # Baris dengan lag lengkap & observasi pada +15 menit (±60 s → satu baris terakhir masih cocok)
+    assert r15["n"] == 8 * 60 - 3 - 14, "❌ Jumlah baris backtest 15m"
+    assert r15["missed"] == 14
+    assert math.isclose(r15["vectorRmse"], r15["persistenceVectorRmse"], rel_tol=1e-5)
+    assert abs(r15["skill"]) < 1e-5
+    assert results["6h"]["n"] == 8 * 60 - 3 - (6 * 60 - 1)
+    assert sum(row["n"] for row in r15["hourly"]) == r15["n"]
+    assert "predict_15m" in timer.stats and r15["rowsPerSecond"] > 0
+
+def test_backtest_matches_predict_from_data():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.csv")
+        write_log(path, 10)
+        history = load_history(path)
+    table = build_feature_table(history)
+    models = {"1h": load_model("1h")}
+    speed, direction = predict_batch(models["1h"], feature_matrix(table, "1h"))
+
+    i = 7
+    single_speed, single_dir = predict_from_data(models, {k: table[k][i] for k in table}, "1h")
+    assert math.isclose(speed[i], single_speed, rel_tol=1e-4, abs_tol=1e-4)
+    assert math.isclose(direction[i], single_dir, abs_tol=1e-2)
+
+if __name__ == "__main__":
+    test_feature_table_matches_live_input()
+    test_match_observations_tolerance()
+    test_predict_batch_independent_of_batch_size()
+    test_hourly_summary_bins_by_hour()
+    test_run_backtest_persistence_engine()
+    test_backtest_matches_predict_from_data()
+    print("✅ Semua test backtest berhasil!")
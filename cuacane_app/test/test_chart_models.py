@@ -0,0 +1,85 @@
+from cuacane_app.utils.sensor_record import HistorySeries
+from cuacane_app.views.chart_models import HistoryListModel, ItemListModel
+
+
+def record_changes(model):
+    events = []
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("insert", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(("remove", first, last)))
+    model.modelReset.connect(lambda: events.append(("reset",)))
+    return events
+
+def values(model):
+    return [model.data(model.index(row, 0), HistoryListModel.ValueRole) for row in range(model.rowCount())]
+
+
+def test_history_model_incremental():
+    series = HistorySeries(maxlen=10)
+    for i in range(3):
+        series.append(1000 + i, float(i))
+    model = HistoryListModel(series, window=4)
+    events = record_changes(model)
+    assert model.rowCount() == 3 and model.columnCount() == 2
+
+    series.append(1003, 3.0)
+    model.sync()
+    assert events == [("insert", 3, 3)]
+
+    events.clear()
+    series.append(1004, 4.0)
+    series.append(1005, 5.0)
+    model.sync()
+    # Dua sampel tergusur dari jendela 4 titik, dua sampel baru di belakang
+    assert events == [("remove", 0, 1), ("insert", 2, 3)]
+    assert values(model) == [2.0, 3.0, 4.0, 5.0]
+    assert model.data(model.index(0, 0)) == 2, "❌ Kolom 0 = nomor sampel (x grafik)"
+    assert model.data(model.index(3, 1)) == 5.0
+    assert (model.minValue, model.maxValue) == (2.0, 5.0)
+
+    events.clear()
+    model.sync()
+    assert events == [], "❌ Tanpa data baru tidak ada sinyal"
+
+    for i in range(6, 20):
+        series.append(1000 + i, float(i))
+    model.sync()
+    assert events == [("reset",)] and values(model) == [16.0, 17.0, 18.0, 19.0]
+
+def test_item_model_shift_and_evict():
+    model = ItemListModel(["timestamp", "speed", "dir"], maxlen=3)
+    events = record_changes(model)
+    for i in range(3):
+        model.append({"timestamp": f"10:0{i}", "speed": float(i), "dir": 10.0 * i})
+    assert events == [("insert", 0, 0), ("insert", 1, 1), ("insert", 2, 2)]
+
+    events.clear()
+    model.append({"timestamp": "10:03", "speed": 3.0, "dir": 30.0})
+    assert events == [("remove", 0, 0), ("insert", 2, 2)]
+    assert [item["speed"] for item in model.items] == [1.0, 2.0, 3.0]
+
+    events.clear()
+    items = model.items[1:] + [{"timestamp": "10:04", "speed": 4.0, "dir": 40.0}]
+    model.set_items(items)
+    assert events == [("remove", 0, 0), ("insert", 2, 2)]
+    role = {name: role for role, name in model.roleNames().items()}[b"dir"]
+    assert model.data(model.index(2, 0), role) == 40.0
+    assert model.data(model.index(2, 3)) == 40.0
+    # Kolom 0 = nomor sampel tetap: item yang bertahan tidak berubah x-nya saat jendela bergeser
+    assert [model.data(model.index(r, 0)) for r in range(3)] == [2, 3, 4]
+    sample = {name: role for role, name in model.roleNames().items()}[b"sample"]
+    assert model.data(model.index(0, 0), sample) == 2
+    assert (model.firstSample, model.lastSample) == (2, 4)
+
+    events.clear()
+    model.set_items([{"timestamp": "10:01", "speed": 1.5, "dir": 15.0}] + model.items[:2])
+    assert events == [("remove", 2, 2), ("insert", 0, 0)]
+    assert [model.data(model.index(r, 0)) for r in range(3)] == [1, 2, 3], "❌ Item baru di depan → nomor sebelum item lama"
+
+    events.clear()
+    model.set_items([{"timestamp": "11:00", "speed": 9.0, "dir": 90.0}])
+    assert events == [("reset",)] and model.rowCount() == 1
+
+if __name__ == "__main__":
+    test_history_model_incremental()
+    test_item_model_shift_and_evict()
+    print("✅ Semua test model grafik berhasil!")
@@ -0,0 +1,35 @@
+from cuacane_app.utils.cloud_client import CloudClient
+from cuacane_app.utils.cloud_stub_server import CloudStubServer
+
+LINE_A = "0R0,Dn=255#,Dm=331#,Dx=065#,Sn=0.1#,Sm=0.9#,Sx=1.4#,Ta=25.0C"
+LINE_B = "0R0,Dn=250#,Dm=320#,Dx=060#,Sn=0.2#,Sm=1.1#,Sx=1.6#,Ta=25.2C"
+
+def test_conditional_request_and_reuse():
+    server = CloudStubServer().start()
+    try:
+        server.push_line(LINE_A)
+        client = CloudClient(base_url=server.url)
+
+        assert client.fetch_latest_raw() == LINE_A
+        # Data belum berubah → 304, raw terakhir dikembalikan lagi
+        assert client.fetch_latest_raw() == LINE_A
+        assert client.fetch_latest_raw() == LINE_A
+        assert client.stats["not_modified"] == 2
+
+        server.push_line(LINE_B)
+        assert client.fetch_latest_raw() == LINE_B
+
+        assert server.requests == 4
+        assert server.connections == 1, "❌ Koneksi harus dipakai ulang (keep-alive)"
+        client.close()
+    finally:
+        server.stop()
+
+def test_fetch_failure_returns_none():
+    client = CloudClient(base_url="http://127.0.0.1:9", timeout=0.5)
+    assert client.fetch_latest_raw() is None
+
+if __name__ == "__main__":
+    test_conditional_request_and_reuse()
+    test_fetch_failure_returns_none()
+    print("✅ Semua test cloud client berhasil!")
@@ -32,6 +32,62 @@ def test_append_to_log():
     print("✅ Test data logger berhasil.")
 
 
+def test_logger_recovers_tail_on_reopen():
+    import tempfile
+    from cuacane_app.utils.data_logger import DataLogger
+
+    row = {"datetime": "2025-07-29 19:45:00", "temp_air": 25.3, "humidity": None}
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "log.csv")
+        first = DataLogger(log_path)
+        assert first.append(row)
+        first.close()
+
+        # Logger baru (mis. setelah restart) tetap tahu baris terakhir
+        second = DataLogger(log_path)
+        assert not second.append(row), "❌ Baris terakhir harus dipulihkan dari tail file"
+        assert second.append(dict(row, temp_air=25.4))
+        second.close()
+
+        with open(log_path) as f:
+            assert len(list(csv.DictReader(f))) == 2
+
+def test_logger_batches_flushes():
+    import tempfile
+    from cuacane_app.utils.data_logger import DataLogger
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "log.csv")
+        logger = DataLogger(log_path, flush_interval=3600, fsync_interval=None)
+        for i in range(5):
+            logger.append({"datetime": f"2025-07-29 19:45:0{i}", "temp_air": 25.0 + i})
+
+        with open(log_path) as f:
+            assert len(f.readlines()) == 2, "❌ Hanya record pertama yang langsung di-flush"
+        logger.flush()
+        with open(log_path) as f:
+            assert len(f.readlines()) == 6
+        logger.close()
+
+def test_logger_reopens_deleted_file():
+    import tempfile
+    from cuacane_app.utils.data_logger import DataLogger
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "log.csv")
+        logger = DataLogger(log_path)
+        logger.append({"datetime": "2025-07-29 19:45:00", "temp_air": 25.0})
+        os.remove(log_path)
+        logger.append({"datetime": "2025-07-29 19:45:05", "temp_air": 25.1})
+
+        with open(log_path) as f:
+            rows = list(csv.DictReader(f))
+        assert [r["temp_air"] for r in rows] == ["25.1"]
+        logger.close()
+
 
 if __name__ == "__main__":
     test_append_to_log()
+    test_logger_recovers_tail_on_reopen()
+    test_logger_batches_flushes()
+    test_logger_reopens_deleted_file()
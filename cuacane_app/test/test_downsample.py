@@ -0,0 +1,87 @@
+import numpy as np
+
+from cuacane_app.utils.downsample import lttb_indices, minmax_indices, DownsampledSeries, DownsampleCache
+from cuacane_app.utils.sensor_record import HistorySeries
+from cuacane_app.views.chart_models import DownsampledListModel
+
+T0 = 1753765200
+
+
+def make_series(n, capacity=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    series = HistorySeries(maxlen=capacity)
+    for i in range(n):
+        series.append(T0 + 5 * i, 20.0 + np.sin(i / 200.0) + rng.normal(0, 0.05))
+    return series
+
+
+def test_lttb_keeps_ends_and_spike():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[437] = 50.0
+    idx = lttb_indices(x, y, 50)
+    assert len(idx) == 50 and idx[0] == 0 and idx[-1] == 999
+    assert 437 in idx, "❌ Puncak harus tetap terlihat"
+    assert np.all(np.diff(idx) > 0)
+    assert lttb_indices(x[:10], y[:10], 50).tolist() == list(range(10))
+
+def test_minmax_keeps_extremes():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=10000)
+    idx = minmax_indices(y, 100)
+    assert len(idx) <= 200
+    assert y.argmin() in idx and y.argmax() in idx
+
+def test_incremental_minmax_matches_fresh():
+    series = make_series(3000, capacity=2000)
+    inc = DownsampledSeries(series, window=1500, width=100, method="minmax")
+    inc.update()
+    for i in range(3000, 3400):
+        series.append(T0 + 5 * i, 21.0 + (i % 7) * 0.1)
+        inc.update()
+    fresh = DownsampledSeries(series, window=1500, width=100, method="minmax")
+    fresh.update()
+    assert inc.samples() == fresh.samples()
+
+def test_incremental_lttb_bounded_and_cached():
+    series = make_series(4000)
+    cache = DownsampleCache()
+    entry = cache.get(series, 3000, 200)
+    samples = entry.samples()
+    assert samples[0] == series.appended - 3000 and samples[-1] == series.appended - 1
+    assert len(samples) <= 202
+    assert cache.get(series, 3000, 200) is entry, "❌ (series, window, width) yang sama memakai cache"
+
+    before = list(samples)
+    series.append(T0 + 5 * 4000, 25.0)
+    after = cache.get(series, 3000, 200).samples()
+    # Bucket yang sudah final tidak berubah; hanya kepala (geser) & ekor yang dihitung ulang
+    common = set(before) & set(after)
+    assert len(common) >= len(before) - 4
+    assert after[-1] == series.appended - 1
+
+def test_downsampled_model_updates_incrementally():
+    series = make_series(4000)
+    cache = DownsampleCache()
+    model = DownsampledListModel()
+    model.set_points(*cache.get(series, 3000, 200).points())
+    n = model.rowCount()
+
+    events = []
+    model.modelReset.connect(lambda: events.append("reset"))
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("insert", first, last)))
+    series.append(T0 + 5 * 4000, 25.0)
+    model.set_points(*cache.get(series, 3000, 200).points())
+    assert "reset" not in events and events
+    # Hanya bucket kepala (geser) & ekor yang dikirim ulang, bukan seluruh grafik
+    assert all(last < 4 or first >= n - 4 for kind, first, last in events)
+    assert model.maxValue == 25.0 and model.lastSample == series.appended - 1
+    assert model.data(model.index(model.rowCount() - 1, 1)) == 25.0
+
+if __name__ == "__main__":
+    test_lttb_keeps_ends_and_spike()
+    test_minmax_keeps_extremes()
+    test_incremental_minmax_matches_fresh()
+    test_incremental_lttb_bounded_and_cached()
+    test_downsampled_model_updates_incrementally()
+    print("✅ Semua test downsampling berhasil!")
@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+import numpy as np
+
+from cuacane_app.utils.stations import DEFAULT_STATION
+from cuacane_app.utils.sensor_sources import CloudSource
+from cuacane_app.utils.sensor_connection import StationState
+from cuacane_app.utils.multi_predictor import HORIZONS, new_prediction_state
+
+LINE = "0R0,Dn=255#,Dm={dir}#,Dx=065#,Sn=0.1#,Sm={speed}#,Sx=1.4#,Ta=25.0C,Ua=70.2P,Pa=0.9248B"
+T0 = 1753765200.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = T0
+
+    def __call__(self):
+        return self.now
+
+
+def make_station(tmp, lines):
+    it = iter(lines)
+    engine = lambda X: np.array([[2.0, 0.0, 1.0]])
+    models = {h: {"model": None, "engine": engine, **new_prediction_state()} for h in HORIZONS}
+    cfg = dict(DEFAULT_STATION, id="s", name="s", log_path=os.path.join(tmp, "s", "realtime_log.csv"))
+    station = StationState(cfg, models=models, source=CloudSource(lambda: next(it)))
+    station.scheduler.clock = FakeClock()
+    return station
+
+def feed(station, n):
+    for _ in range(n):
+        station._ingestion.poll_once()
+    station._drain_ingestion_queue()
+
+
+def test_scheduler_runs_due_horizons_and_persists():
+    lines = [LINE.format(dir=100 + i, speed=1.0 + i) for i in range(6)] + [LINE.format(dir=105, speed=6.0)]
+    with tempfile.TemporaryDirectory() as tmp:
+        station = make_station(tmp, lines)
+        scheduler, clock = station.scheduler, station.scheduler.clock
+
+        feed(station, 3)
+        assert scheduler.run_due() == [], "❌ Buffer belum siap → tidak ada prediksi"
+        feed(station, 2)
+        assert scheduler._timer.isActive(), "❌ Pembacaan baru menjadwalkan prediksi (coalesced)"
+
+        assert scheduler.run_due() == list(HORIZONS)
+        rows = station.prediction_model.store.read()
+        assert [r["horizon"] for r in rows] == list(HORIZONS)
+        assert all(r["source"] == "auto" for r in rows)
+        deltas = {r["horizon"]: r["valid_ts"] - r["issued_ts"] for r in rows}
+        assert deltas == {"15m": 900, "1h": 3600, "3h": 10800, "6h": 21600}
+        assert station.prediction_model._chart_models["15m"].rowCount() == 5
+
+        # Belum jatuh tempo
+        clock.now += 60
+        assert scheduler.run_due() == []
+        # Jatuh tempo tapi input sama → dilewati
+        clock.now += 300
+        assert scheduler.run_due() == []
+        # Input berubah: 15m (cadence 5 menit) jalan lagi; 1h belum jatuh tempo
+        feed(station, 1)
+        clock.now += 300
+        assert scheduler.run_due() == ["15m"]
+        assert len(station.prediction_model.store.read()) == 5
+        station.stop()
+
+def test_manual_prediction_is_persisted():
+    with tempfile.TemporaryDirectory() as tmp:
+        station = make_station(tmp, [LINE.format(dir=100 + i, speed=1.0 + i) for i in range(5)])
+        feed(station, 5)
+        station.prediction_model.predictAll()
+        rows = station.prediction_model.store.read()
+        assert len(rows) == 4 and {r["source"] for r in rows} == {"manual"}
+        assert rows[0]["speed"] == 2.0 and rows[0]["dir"] == 0.0
+        station.stop()
+
+if __name__ == "__main__":
+    test_scheduler_runs_due_horizons_and_persists()
+    test_manual_prediction_is_persisted()
+    print("✅ Semua test forecast scheduler berhasil!")
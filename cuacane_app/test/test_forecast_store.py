@@ -0,0 +1,91 @@
+import math
+import os
+import tempfile
+from collections import namedtuple
+
+import numpy as np
+
+from cuacane_app.utils.forecast_store import ForecastStore, ForecastVerifier, RollingError, wind_errors
+from cuacane_app.utils.multi_predictor import HORIZONS, PRED_HISTORY_LIMIT, new_prediction_state, record_prediction
+from cuacane_app.utils.sensor_record import HistorySeries
+
+T0 = 1753765200
+Forecast = namedtuple("Forecast", "speed direction expiry issued valid")
+
+
+def observed(n, speed=3.0, direction=90.0, step=5):
+    speeds, dirs = HistorySeries(maxlen=n), HistorySeries(maxlen=n)
+    for i in range(n):
+        speeds.append(T0 + step * i, speed)
+        dirs.append(T0 + step * i, direction)
+    return speeds, dirs
+
+
+def test_rolling_error_matches_window():
+    stats = RollingError(window=5)
+    errors = [0.5, -1.0, 2.0, -0.25, 1.5, 3.0, -2.0]
+    for e in errors:
+        stats.add(e, 10.0 * e, abs(e))
+    last = np.array(errors[-5:])
+    summary = stats.summary()
+    assert summary["n"] == 5
+    assert math.isclose(summary["mae"], np.abs(last).mean())
+    assert math.isclose(summary["rmse"], np.sqrt((last ** 2).mean()))
+    assert math.isclose(summary["dirError"], 10 * np.abs(last).mean())
+    assert math.isnan(RollingError().summary()["mae"])
+
+def test_wind_errors_wrap_direction():
+    speed_err, dir_err, vec_err = wind_errors(4.0, 350.0, 3.0, 10.0)
+    assert speed_err == 1.0 and math.isclose(dir_err, -20.0)
+    _, _, vec = wind_errors(2.0, 0.0, 2.0, 180.0)
+    assert math.isclose(vec, 4.0), "❌ Arah berlawanan → selisih vektor 2 × kecepatan"
+
+def test_verifier_joins_at_valid_time():
+    speeds, dirs = observed(100)    # 0 … 495 s
+    verifier = ForecastVerifier(HORIZONS, tolerance=10, limit=4)
+    verifier.add("15m", T0 + 102, 3.5, 100.0)   # sampel terdekat T0+100
+    verifier.add("1h", T0 + 1000, 1.0, 90.0)    # belum jatuh tempo
+    assert verifier.verify(speeds, dirs) == {"15m"}
+    s = verifier.stats["15m"].summary()
+    assert s["n"] == 1 and math.isclose(s["mae"], 0.5) and math.isclose(s["dirError"], 10.0)
+    assert len(verifier) == 1
+
+    # Gap data di sekitar valid time → dihitung missed, bukan error
+    verifier.add("3h", T0 + 300, 3.0, 90.0)
+    speeds2, dirs2 = observed(10, step=100)     # sampel tiap 100 s, tolerance 10 s
+    verifier.add("6h", T0 + 250, 3.0, 90.0)
+    verifier.verify(speeds2, dirs2)
+    assert verifier.missed["6h"] == 1 and verifier.stats["3h"].summary()["n"] == 1
+
+    # Antrian terbatas: yang paling lama dibuang
+    for i in range(6):
+        verifier.add("15m", T0 + 2000 + i, 3.0, 90.0)
+    assert len(verifier) == 4
+
+def test_store_tail_recovers_pending():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ForecastStore(os.path.join(tmp, "forecasts.csv"))
+        for i in range(200):
+            store.append("15m", Forecast(3.0, 90.0, "", T0 + 60 * i, T0 + 60 * i + 900), source="auto")
+        rows = store.read()
+        tail = store.tail(max_bytes=2048)
+        assert len(rows) == 200 and 0 < len(tail) < 200
+        assert tail[-1] == rows[-1] and tail[0] in rows
+
+        verifier = ForecastVerifier(HORIZONS)
+        verifier.load(tail, since=rows[-1]["valid_ts"] - 60)
+        assert len(verifier) == 2
+
+def test_pred_history_is_bounded():
+    models = {"15m": new_prediction_state()}
+    for _ in range(PRED_HISTORY_LIMIT + 10):
+        record_prediction(models, "15m", 3.0, 90.0)
+    assert len(models["15m"]["pred_history"]) == PRED_HISTORY_LIMIT
+
+if __name__ == "__main__":
+    test_rolling_error_matches_window()
+    test_wind_errors_wrap_direction()
+    test_verifier_joins_at_valid_time()
+    test_store_tail_recovers_pending()
+    test_pred_history_is_bounded()
+    print("✅ Semua test forecast store berhasil!")
@@ -0,0 +1,59 @@
+from cuacane_app.utils.ingestion_worker import IngestionWorker
+from cuacane_app.utils.sensor_sources import CloudSource
+
+LINE_A = "0R0,Dn=255#,Dm=331#,Dx=065#,Sn=0.1#,Sm=0.9#,Sx=1.4#,Ta=25.0C,Ua=70.2P,Pa=0.9248B"
+LINE_B = "0R0,Dn=250#,Dm=320#,Dx=060#,Sn=0.2#,Sm=1.1#,Sx=1.6#,Ta=25.2C,Ua=70.0P,Pa=0.9249B"
+
+
+def make_worker(lines, **kwargs):
+    it = iter(lines)
+    logged = []
+    worker = IngestionWorker(CloudSource(lambda: next(it)), logged.append, interval=5.0, **kwargs)
+    return worker, logged
+
+def test_poll_parses_logs_and_queues():
+    worker, logged = make_worker([LINE_A, LINE_A, LINE_B])
+    for _ in range(3):
+        worker.poll_once()
+
+    records = worker.drain()
+    assert len(records) == 2, "❌ Data sama harus dilewati"
+    assert len(logged) == 2
+    parsed, received_at = records[0]
+    assert parsed["wind_dir_avg"] == 331
+    assert worker.drain() == []
+
+def test_queue_bounded_drops_oldest():
+    worker, _ = make_worker([LINE_A, LINE_B, LINE_A], max_queue=2)
+    for _ in range(3):
+        worker.poll_once()
+
+    records = worker.drain()
+    assert len(records) == 2
+    assert worker.dropped_records == 1
+    assert records[0][0]["wind_dir_avg"] == 320
+
+def test_backoff_grows_with_jitter():
+    worker, _ = make_worker([None] * 8, backoff_base=1.0, backoff_max=8.0)
+    delays = [worker.poll_once() for _ in range(6)]
+
+    assert 0.5 <= delays[0] <= 1.0
+    assert 1.0 <= delays[1] <= 2.0
+    assert 2.0 <= delays[2] <= 4.0
+    assert all(4.0 <= d <= 8.0 for d in delays[3:]), "❌ Backoff harus dibatasi backoff_max"
+    assert not worker.is_connected
+
+def test_interval_restored_after_success():
+    worker, _ = make_worker([None, None, LINE_A], jitter=0.1)
+    worker.poll_once()
+    worker.poll_once()
+    delay = worker.poll_once()
+    assert 4.5 <= delay <= 5.5
+    assert worker.is_connected
+
+if __name__ == "__main__":
+    test_poll_parses_logs_and_queues()
+    test_queue_bounded_drops_oldest()
+    test_backoff_grows_with_jitter()
+    test_interval_restored_after_success()
+    print("✅ Semua test ingestion worker berhasil!")
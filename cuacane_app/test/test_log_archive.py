@@ -0,0 +1,142 @@
+import gzip
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from cuacane_app.utils.convert_to_mh2 import batch_convert, convert_log_range
+from cuacane_app.utils.data_logger import DataLogger
+from cuacane_app.utils.log_archive import LogArchive, iter_log_range
+
+T0 = datetime(2025, 7, 29, 0, 0, 0)
+
+
+def make_row(ts, i):
+    return {
+        "datetime": ts.strftime("%Y-%m-%d %H:%M:%S"),
+        "wind_dir_avg": 100 + i % 50, "wind_speed_avg": 1.5, "temp_air": 20.0 + i % 7,
+        "humidity": 80.0, "pressure": 1.0085,
+    }
+
+def write_log(path, rows):
+    logger = DataLogger(path)
+    for row in rows:
+        logger.append(row)
+    logger.close()
+
+
+def test_logger_rolls_over_daily():
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "realtime_log.csv")
+        archive_path = os.path.join(tmp, "archive")
+        logger = DataLogger(log_path, archive_dir=archive_path)
+        rows = [make_row(T0 + timedelta(hours=8 * i), i) for i in range(5)]  # 29, 29, 29, 30, 30
+        for row in rows:
+            assert logger.append(row)
+        logger.close()
+
+        with open(log_path) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 3 and lines[1].startswith("2025-07-30"), "❌ Log aktif hanya berisi hari ini"
+
+        archive = LogArchive(archive_path)
+        assert [p["date"] for p in archive.partitions] == ["2025-07-29"]
+        assert sum(c["rows"] for c in archive.partitions[0]["chunks"]) == 3
+        assert not [n for n in os.listdir(archive_path) if n.startswith("pending-")]
+
+        got = [record["datetime"] for _, record in iter_log_range(log_path, archive_path)]
+        assert got == [row["datetime"] for row in rows]
+
+def test_range_reads_only_overlapping_chunks():
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "legacy_log.csv")
+        rows = [make_row(T0 + timedelta(minutes=15 * i), i) for i in range(3 * 96)]  # 3 hari
+        write_log(log_path, rows)
+        with open(log_path) as f:
+            original = f.read().splitlines()[1:]
+
+        archive = LogArchive(os.path.join(tmp, "archive"))
+        assert archive.add_log_file(log_path, chunk_rows=8) == len(rows)
+        assert not os.path.exists(log_path)
+        assert len(archive.partitions) == 3
+
+        # Tiap partisi tetap file gzip biasa (chunk = gzip member berurutan)
+        restored = []
+        for entry in archive.partitions:
+            with gzip.open(os.path.join(archive.path, entry["file"]), "rt") as f:
+                restored.extend(f.read().splitlines())
+        assert restored == original
+
+        start = (T0 + timedelta(days=1, hours=6)).timestamp()
+        end = (T0 + timedelta(days=1, hours=8)).timestamp()
+        chunks = archive.chunks_for_range(start, end)
+        assert 1 <= len(chunks) <= 3, "❌ Hanya chunk yang beririsan yang dibuka"
+        got = [record["datetime"] for _, record in LogArchive(archive.path).iter_rows(start, end)]
+        expected = [row["datetime"] for row in rows if start <= datetime.strptime(
+            row["datetime"], "%Y-%m-%d %H:%M:%S").timestamp() < end]
+        assert got == expected and len(got) == 8
+
+def test_pending_partition_is_compressed_on_open():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = os.path.join(tmp, "archive")
+        os.makedirs(archive_path)
+        write_log(os.path.join(archive_path, "pending-2025-07-29.csv"), [make_row(T0, 0), make_row(T0 + timedelta(hours=1), 1)])
+
+        logger = DataLogger(os.path.join(tmp, "realtime_log.csv"), archive_dir=archive_path)
+        logger.append(make_row(T0 + timedelta(days=1), 2))
+        logger.close()
+        assert os.listdir(archive_path) and not os.path.exists(os.path.join(archive_path, "pending-2025-07-29.csv"))
+        assert LogArchive(archive_path).last_timestamp() == T0 + timedelta(hours=1)
+
+def test_convert_range_across_partitions():
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = [make_row(T0 + timedelta(hours=3 * i), i) for i in range(20)]
+        full_log = os.path.join(tmp, "full.csv")
+        write_log(full_log, rows)
+        expected = os.path.join(tmp, "expected.MH2")
+        batch_convert(full_log, expected)
+
+        log_path = os.path.join(tmp, "realtime_log.csv")
+        logger = DataLogger(log_path, archive_dir=os.path.join(tmp, "archive"))
+        for row in rows:
+            logger.append(row)
+        logger.close()
+
+        got = os.path.join(tmp, "got.MH2")
+        assert convert_log_range(log_path, got) == len(rows)
+        with open(expected) as a, open(got) as b:
+            assert a.read() == b.read()
+
+def test_ui_export_includes_archived_days():
+    import cuacane_app.main_window as main_window
+
+    class Box:
+        calls = []
+        information = staticmethod(lambda *args: Box.calls.append(("ok", args[2])))
+        critical = staticmethod(lambda *args: Box.calls.append(("error", args[2])))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = [make_row(T0 + timedelta(hours=6 * i), i) for i in range(12)]  # 3 hari
+        log_path = os.path.join(tmp, "realtime_log.csv")
+        logger = DataLogger(log_path, archive_dir=os.path.join(tmp, "archive"))
+        for row in rows:
+            logger.append(row)
+        logger.close()
+        assert len(LogArchive(os.path.join(tmp, "archive")).partitions) == 2
+
+        dummy = main_window.QMessageBox
+        main_window.QMessageBox = Box
+        try:
+            main_window.ConvertSignalHandler(log_path).convertNow(tmp)
+        finally:
+            main_window.QMessageBox = dummy
+        assert Box.calls and Box.calls[0][0] == "ok", Box.calls
+        with open(os.path.join(tmp, "output.MH2")) as f:
+            assert len(f.read().splitlines()) == 1 + len(rows), "❌ Export MH2 memuat hari yang sudah diarsipkan"
+
+if __name__ == "__main__":
+    test_logger_rolls_over_daily()
+    test_range_reads_only_overlapping_chunks()
+    test_pending_partition_is_compressed_on_open()
+    test_convert_range_across_partitions()
+    test_ui_export_includes_archived_days()
+    print("✅ Semua test arsip log berhasil!")
@@ -0,0 +1,62 @@
+import threading
+
+import numpy as np
+import pytest
+
+from cuacane_app.utils.multi_predictor import ModelRegistry, HORIZONS, fork_models, get_full_series_for_chart, new_prediction_state
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, horizon):
+        with self.lock:
+            self.calls.append(horizon)
+        return {"model": object(), "scaler_X": None, "scaler_y": None, **new_prediction_state()}
+
+
+def test_lazy_load_once_per_horizon():
+    loader = CountingLoader()
+    registry = ModelRegistry(loader=loader)
+    assert loader.calls == [], "❌ Tidak boleh ada model dimuat saat registry dibuat"
+    assert registry.get("1h") is None and "1h" not in registry
+    assert get_full_series_for_chart(registry, "1h") == [] and loader.calls == []
+
+    m = registry["15m"]
+    assert registry["15m"] is m and loader.calls == ["15m"]
+    assert "15m" in registry.timings
+    with pytest.raises(KeyError):
+        registry["2h"]
+
+def test_fork_shares_weights_not_state():
+    loader = CountingLoader()
+    registry = ModelRegistry(loader=loader)
+    a, b = fork_models(registry), fork_models(registry)
+    a["3h"]["pred_history"].append(("10:00", 1.0, 90.0))
+    assert a["3h"]["model"] is b["3h"]["model"]
+    assert len(b["3h"]["pred_history"]) == 0
+    assert loader.calls == ["3h"], "❌ Bobot dimuat sekali untuk semua stasiun"
+
+def test_prefetch_loads_remaining_in_background():
+    loader = CountingLoader()
+    registry = ModelRegistry(loader=loader)
+    station = registry.fork()
+    station["15m"]
+    station.prefetch().join(timeout=10)
+    assert sorted(loader.calls) == sorted(HORIZONS)
+    assert set(registry.timings) == set(HORIZONS)
+
+def test_real_model_loads():
+    registry = ModelRegistry()
+    m = registry["6h"]
+    assert m["model"](np.zeros((1, 17))).shape == (1, 3) and m["scaler_X"] is not None
+    assert list(registry) == ["6h"]
+
+if __name__ == "__main__":
+    test_lazy_load_once_per_horizon()
+    test_fork_shares_weights_not_state()
+    test_prefetch_loads_remaining_in_background()
+    test_real_model_loads()
+    print("✅ Semua test model registry berhasil!")
@@ -0,0 +1,113 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from cuacane_app.utils.numpy_engine import NumpyMLP, from_torch
+from cuacane_app.utils.multi_predictor import MODEL_CONFIGS, FEATURE_ORDER, ModelRegistry, predict_from_data, new_prediction_state
+
+torch = pytest.importorskip("torch")
+
+
+def randomize_batchnorm(model):
+    # Statistik BN acak supaya pelipatan benar-benar diuji (bukan mean 0 / var 1)
+    gen = torch.Generator().manual_seed(0)
+    for layer in model:
+        if isinstance(layer, torch.nn.BatchNorm1d):
+            layer.running_mean.copy_(torch.randn(layer.num_features, generator=gen))
+            layer.running_var.copy_(torch.rand(layer.num_features, generator=gen) + 0.5)
+            layer.weight.data.copy_(torch.randn(layer.num_features, generator=gen))
+            layer.bias.data.copy_(torch.randn(layer.num_features, generator=gen))
+    return model.eval()
+
+
+@pytest.mark.parametrize("horizon", list(MODEL_CONFIGS))
+def test_forward_parity_with_torch(horizon, tmp_path):
+    cfg = MODEL_CONFIGS[horizon]
+    torch.manual_seed(1)
+    model = randomize_batchnorm(cfg["builder"](cfg["input_size"], 3))
+    X = np.random.default_rng(2).normal(size=(64, cfg["input_size"])).astype(np.float32)
+    with torch.no_grad():
+        expected = model(torch.from_numpy(X)).numpy()
+
+    engine = from_torch(model)
+    engine.save(tmp_path / "m.npz")
+    loaded = NumpyMLP.load(tmp_path / "m.npz")
+    assert loaded.activation == engine.activation and loaded.input_size == cfg["input_size"]
+    np.testing.assert_allclose(loaded(X), expected, rtol=1e-4, atol=1e-5)
+    assert loaded(X[0]).shape == (1, 3)
+
+def test_shipped_bundles_match_pth():
+    from cuacane_app.utils.multi_predictor import load_torch_model
+
+    registry = ModelRegistry()
+    for h in MODEL_CONFIGS:
+        engine = registry[h]["model"]
+        assert isinstance(engine, NumpyMLP), f"❌ saved_models/model_{h}/model_{h}.npz belum diekspor"
+        X = np.random.default_rng(3).normal(size=(16, engine.input_size)).astype(np.float32)
+        with torch.no_grad():
+            expected = load_torch_model(h)(torch.from_numpy(X)).numpy()
+        np.testing.assert_allclose(engine(X), expected, rtol=1e-4, atol=1e-5)
+
+def test_shipped_bundles_compressed_float32():
+    import os
+    import zipfile
+    from cuacane_app.utils.multi_predictor import resource_path
+
+    for h in MODEL_CONFIGS:
+        npz = str(resource_path(f"saved_models/model_{h}/model_{h}.npz"))
+        with zipfile.ZipFile(npz) as zf:
+            assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in zf.infolist()), h
+        with np.load(npz) as data:
+            assert all(data[k].dtype == np.float32 for k in data.files if k[0] in "Wb"), h
+        assert os.path.getsize(npz) < os.path.getsize(str(resource_path(f"saved_models/model_{h}/model_{h}.pth")))
+
+class ExplodingScaler:
+    def transform(self, X):
+        raise AssertionError("❌ sklearn dipanggil di jalur prediksi")
+    inverse_transform = transform
+
+def test_folded_scalers_match_sklearn_path():
+    from cuacane_app.utils.multi_predictor import forward
+
+    registry = ModelRegistry()
+    rng = np.random.default_rng(4)
+    for h in MODEL_CONFIGS:
+        m = registry[h]
+        sx, sy = m["scaler_X"], m["scaler_y"]
+        X = rng.normal(sx.mean_, sx.scale_, size=(200, len(sx.mean_)))
+        expected = sy.inverse_transform(forward(m["model"], sx.transform(X)))
+        np.testing.assert_allclose(m["engine"](X), expected, rtol=1e-4, atol=2e-4)
+
+    # predict_from_data cukup satu panggilan engine (tanpa scaler sklearn)
+    m = registry["1h"]
+    row = dict(zip(FEATURE_ORDER["1h"], m["scaler_X"].mean_))
+    expected = m["scaler_y"].inverse_transform(forward(m["model"], m["scaler_X"].transform([list(row.values())])))[0]
+    models = {"1h": {**m, "scaler_X": ExplodingScaler(), "scaler_y": ExplodingScaler(), **new_prediction_state()}}
+    speed, _ = predict_from_data(models, row, "1h")
+    assert abs(speed - expected[0]) < 2e-4
+
+def test_runtime_path_without_torch():
+    # Muat model + prediksi di proses terpisah: torch tidak boleh ikut terimpor
+    code = (
+        "import sys\n"
+        "from cuacane_app.utils.multi_predictor import ModelRegistry, predict_from_data\n"
+        "models = ModelRegistry()\n"
+        "models['15m']['buffer_speed'] = models['15m']['buffer_dir'] = []\n"
+        "speed, direction = predict_from_data(models, {}, '15m')\n"
+        "assert 'torch' not in sys.modules, 'torch terimpor'\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    for h in MODEL_CONFIGS:
+        with tempfile.TemporaryDirectory() as d:
+            test_forward_parity_with_torch(h, pathlib.Path(d))
+    test_shipped_bundles_match_pth()
+    test_shipped_bundles_compressed_float32()
+    test_folded_scalers_match_sklearn_path()
+    test_runtime_path_without_torch()
+    print("✅ Semua test numpy engine berhasil!")
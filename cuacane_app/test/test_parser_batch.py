@@ -0,0 +1,82 @@
+import math
+import random
+
+import numpy as np
+
+from cuacane_app.bench.bench_parser import legacy_parse_0R0_line, make_lines
+from cuacane_app.utils.line_parser import NUMERIC_FIELDS, parse_0R0_line, parse_many, timestamp_to_epoch
+
+TS = "2025-07-29 12:00:05"
+ODD_LINES = [
+    "",
+    "this is not a valid sensor line",
+    "0R0,Dn=???,Dm=-999#,Sn=#,Ta=abcC",
+    "0R0,  Dn = 123# , Ta= 30.0C , Pa=1.002B  ",
+    "0R0,Ta=25C,Ua=70P,Xx=12,Ta=26.5C",
+    "0R0,Dm=1D2#,Sm=0.9M#,Ta=NaNC,Ua=nanP",
+    "0R0,Ta=1=2,Sm=0.5#",
+    "0R0,Dm=12.5#,Pa=0.9248B",
+]
+
+
+def same_value(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b and type(a) is type(b)
+
+def fuzz_lines(n, seed=1):
+    rng = random.Random(seed)
+    base = make_lines(n, seed=seed)
+    out = []
+    for line in base:
+        chars = list(line)
+        for _ in range(rng.randint(0, 3)):
+            chars[rng.randrange(len(chars))] = rng.choice("=,#CDN.x 9")
+        out.append("".join(chars))
+    return out
+
+def test_parity_with_legacy_parser():
+    for line in ODD_LINES + make_lines(200) + fuzz_lines(500):
+        new = parse_0R0_line(line, timestamp=TS)
+        old = legacy_parse_0R0_line(line, timestamp=TS)
+        assert list(new) == list(old), f"❌ Urutan key beda untuk {line!r}"
+        assert all(same_value(new[k], old[k]) for k in old), f"❌ Hasil beda untuk {line!r}"
+        # hasil kedua (dari cache) harus identik
+        again = parse_0R0_line(line, timestamp=TS)
+        assert all(same_value(again[k], old[k]) for k in old)
+
+def test_parse_many_matches_per_line():
+    lines = ODD_LINES + fuzz_lines(300)
+    batch = parse_many(lines, timestamps=[TS] * len(lines))
+    assert batch["epoch"].dtype == np.int64
+    assert (batch["epoch"] == timestamp_to_epoch(TS)).all()
+
+    for i, line in enumerate(lines):
+        single = legacy_parse_0R0_line(line, timestamp=TS)
+        for field in NUMERIC_FIELDS:
+            value = single.get(field)
+            got = batch[field][i]
+            if value is None:
+                assert np.isnan(got), f"❌ {field} harus NaN untuk {line!r}"
+            elif not (isinstance(value, float) and math.isnan(value)):
+                assert got == value
+        assert batch["valid"][i] == any(single.get(f) is not None for f in NUMERIC_FIELDS)
+
+def test_parse_many_counts_rejects():
+    batch = parse_many(["0R0,Ta=1=2,Sm=0.5#", "0R0,Dn=???,Ta=25.0C", "garbage"])
+    assert batch["valid"].tolist() == [False, True, False]
+    assert batch["bad_values"].tolist() == [1, 1, 0]
+    assert np.isnan(batch["wind_speed_avg"][0]), "❌ Line rusak ditolak seluruhnya"
+    assert batch["temp_air"][1] == 25.0
+
+def test_timestamp_to_epoch_local_time():
+    from datetime import datetime
+    expected = datetime(2025, 7, 29, 12, 0, 5).timestamp()
+    assert timestamp_to_epoch(TS) == int(expected)
+
+if __name__ == "__main__":
+    test_parity_with_legacy_parser()
+    test_parse_many_matches_per_line()
+    test_parse_many_counts_rejects()
+    test_timestamp_to_epoch_local_time()
+    print("✅ Semua test parser batch berhasil!")
@@ -140,6 +140,92 @@ def test_predict_missing_fields():
     assert round(model._latest_speed, 2) == 3.21
     print("✅ Test 4: field hilang → prediksi tetap jalan")
 
+def test_predict_all():
+    sensor = DummySensorManager()
+    lag_calls = []
+    get_lag = sensor.get_lag_features
+    sensor.get_lag_features = lambda: lag_calls.append(1) or get_lag()
+    model = setup_model(sensor)
+    for h in ("1h", "3h", "6h"):
+        model.models[h] = dict(model.models["15m"], pred_history=[])
+    emitted = []
+    model.predictionChanged.connect(lambda: emitted.append("prediction"))
+
+    model.predictAll()
+    assert len(lag_calls) == 1, "❌ Fitur & lag dibangun sekali untuk semua horizon"
+    assert emitted == ["prediction"], "❌ Hasil semua horizon dipublikasikan sekaligus"
+    assert [f["horizon"] for f in model.forecastAll] == ["15m", "1h", "3h", "6h"]
+    assert all(model._chart_models[h].rowCount() == 5 for h in ("15m", "1h", "3h", "6h"))
+
+    # Ganti horizon → hasil yang sudah ada langsung tampil tanpa prediksi ulang
+    model.setHorizon("6h")
+    assert len(lag_calls) == 1 and round(model._latest_speed, 2) == 3.21
+    assert "Valid Till" in model._prediction_expiry
+    print("✅ Test 5: prediksi semua horizon sekaligus")
+
+class TupleHistorySensorManager(DummySensorManager):
+    """History berisi (epoch, nilai) seperti HistorySeries asli."""
+    def __init__(self):
+        super().__init__()
+        self._history_dict = {
+            "wind_speed_avg": [(1753765200 + 5 * i, 1.0 + 0.2 * i) for i in range(4)],
+            "wind_dir_avg": [(1753765200 + 5 * i, 100.0 + 10 * i) for i in range(4)],
+        }
+
+def test_predict_cache_hit():
+    model = setup_model(TupleHistorySensorManager())
+    import cuacane_app.utils.sensor_connection as sensor_conn
+    calls = []
+    dummy = sensor_conn.predict_from_data
+    sensor_conn.predict_from_data = lambda *args: calls.append(args[2]) or dummy(*args)
+    try:
+        model.predictNow()
+        model.predictNow()
+    finally:
+        sensor_conn.predict_from_data = dummy
+    assert calls == ["15m"], "❌ Data sensor sama → hasil dari cache, model tidak dijalankan ulang"
+    assert model._cache.hits == 1 and round(model._latest_speed, 2) == 3.21
+    assert len(model.models["15m"]["pred_history"]) == 2
+    assert model._chart_models["15m"].rowCount() == 5
+    print("✅ Test 6: cache prediksi")
+
+def test_predict_async_worker():
+    from PyQt5.QtCore import QCoreApplication
+    from cuacane_app.utils.multi_predictor import ModelRegistry, new_prediction_state
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    threads = []
+    seen = []
+
+    class Engine:
+        def __call__(self, X):
+            import threading
+            threads.append(threading.current_thread().name)
+            # State bersama (dibaca GUI thread) belum boleh berubah selama inferensi
+            seen.append({h: (len(m["pred_history"]), len(m["chart"]), len(m["buffer_speed"]))
+                         for h, m in model.models.items()})
+            return np.array([[2.5, 0.0, 1.0]])
+
+    loader = lambda h: {"model": None, "engine": Engine(), **new_prediction_state()}
+    model = MultiHorizonPredictionModel(TupleHistorySensorManager(), models=ModelRegistry(loader=loader))
+    import cuacane_app.utils.sensor_connection as sensor_conn
+    sensor_conn.predict_from_data = multi_predictor.predict_from_data
+
+    model.predictAll()
+    assert model.busy and model.forecastAll == [], "❌ Inferensi tidak boleh memblokir GUI thread"
+    deadline = datetime.now() + timedelta(seconds=10)
+    while model.busy and datetime.now() < deadline:
+        app.processEvents()
+    assert not model.busy
+    assert [f["horizon"] for f in model.forecastAll] == ["15m", "1h", "3h", "6h"]
+    assert round(model._latest_speed, 2) == 2.5 and round(model._latest_direction) == 0
+    assert threads and all(name.startswith("inference") for name in threads)
+    assert all(state == (0, 0, 0) for snapshot in seen for state in snapshot.values()), \
+        "❌ Worker tidak boleh menulis buffer/chart ke self.models"
+    assert all(len(model.models[h]["pred_history"]) == 1 and len(model.models[h]["chart"]) == 5
+               for h in ("15m", "1h", "3h", "6h")), "❌ State diterapkan di GUI thread saat publish"
+    print("✅ Test 7: prediksi di worker thread")
+
 # === RUN SEMUA TEST ===
 
 if __name__ == "__main__":
@@ -147,4 +233,7 @@ if __name__ == "__main__":
     test_predict_lag_zero()
     test_predict_buffer_kurang()
     test_predict_missing_fields()
+    test_predict_all()
+    test_predict_cache_hit()
+    test_predict_async_worker()
     print("🎉 Semua test predictNow() selesai dengan sukses.")
@@ -0,0 +1,102 @@
+import os
+import tempfile
+
+import numpy as np
+
+from cuacane_app.utils.column_store import ColumnStore
+from cuacane_app.utils.line_parser import parse_0R0_record
+from cuacane_app.utils.rollups import RollupEngine
+
+T0 = 1753765200  # kelipatan 3600
+LINE = "0R0,Dm={dir}#,Sm={speed}#,Ta={temp}C"
+
+
+def make_records(n, step=5):
+    return [
+        parse_0R0_record(LINE.format(dir=(350 + 4 * i) % 360, speed=1.0 + i % 3, temp=20.0 + i % 7), ts=T0 + step * i)
+        for i in range(n)
+    ]
+
+def test_tiers_aggregate_per_bucket():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = RollupEngine(os.path.join(tmp, "rollups"))
+        records = make_records(12 * 60 + 1)   # 1 jam + 1 record (menutup bucket 1 jam)
+        for record in records:
+            engine.add_record(record)
+
+        minute = engine.query("1m")
+        assert len(minute["epoch"]) == 60
+        first = records[:12]
+        assert minute["count"][0] == 12
+        assert np.isclose(minute["temp_air_mean"][0], np.mean([r["temp_air"] for r in first]))
+        assert minute["wind_speed_avg_max"][0] == 3.0
+        assert minute["wind_speed_avg_min"][0] == 1.0
+        assert np.isnan(minute["humidity_mean"][0])
+
+        # Rata-rata vektor di sekitar 0°/360° tidak boleh jadi ~180°
+        dirs = np.radians([r["wind_dir_avg"] for r in first])
+        expected = np.degrees(np.arctan2(np.sin(dirs).sum(), np.cos(dirs).sum())) % 360
+        assert np.isclose(minute["wind_dir_vector_mean"][0], expected)
+        assert minute["wind_dir_vector_mean"][0] < 30 or minute["wind_dir_vector_mean"][0] > 330
+
+        assert len(engine.query("15m")["epoch"]) == 4
+        hour = engine.query("1h")
+        assert hour["count"].tolist() == [720]
+        assert len(engine.query("1m", include_open=True)["epoch"]) == 61
+        assert engine.pick_tier(T0, T0 + 86400 * 7, max_points=500) == "1h"
+        assert engine.pick_tier(T0, T0 + 3600, max_points=500) == "1m"
+
+def test_prime_after_restart_matches_live():
+    with tempfile.TemporaryDirectory() as tmp:
+        records = make_records(12 * 90)
+        live = RollupEngine(os.path.join(tmp, "live"))
+        store = ColumnStore(os.path.join(tmp, "store"), dtype="float64")
+        for record in records:
+            live.add_record(record)
+            store.append_record(record)
+        live.tiers["1m"].close()
+
+        # Rollup dibangun ulang dari store mentah (reduceat) harus sama dengan jalur per record
+        rebuilt = RollupEngine(os.path.join(tmp, "rebuilt"))
+        assert rebuilt.prime_from(store) == len(records)
+        rebuilt.tiers["1m"].close()
+        a, b = live.query("1m"), rebuilt.query("1m")
+        assert a["epoch"].tolist() == b["epoch"].tolist()
+        for name in ("temp_air_mean", "wind_speed_avg_max", "count", "wind_dir_vector_mean"):
+            assert np.allclose(a[name], b[name], equal_nan=True)
+
+        # Restart: bucket tersimpan tidak ditulis ulang, bucket terbuka dipulihkan
+        live.close()
+        resumed = RollupEngine(os.path.join(tmp, "live"))
+        resumed.prime_from(store)
+        assert len(resumed.query("1m")["epoch"]) == 90
+        assert resumed.tiers["1h"].snapshot()["count"] == 12 * 30
+
+def test_series_for_wide_chart():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = RollupEngine(os.path.join(tmp, "rollups"))
+        records = make_records(12 * 120 + 1)   # 2 jam + 1 record di bucket yang masih terbuka
+        for record in records:
+            engine.add_record(record)
+        end = T0 + 7201
+
+        samples, epochs, values = engine.series("temp_air", T0, end, max_points=500)
+        minute = engine.query("1m", T0, end, include_open=True)
+        assert epochs.tolist() == minute["epoch"].tolist() and len(epochs) == 121
+        assert samples.tolist() == (epochs // 60).tolist(), "❌ Nomor sampel = nomor bucket"
+        assert np.allclose(values, minute["temp_air_mean"]) and values[-1] == records[-1]["temp_air"]
+
+        # Rentang lebih lebar dari max_points → tier lebih kasar; arah pakai rata-rata vektor
+        _, epochs, values = engine.series("wind_dir_avg", T0, end, max_points=50)
+        assert len(epochs) == 9 and np.all(np.diff(epochs) == 900)
+        assert np.allclose(values, engine.query("15m", T0, end, include_open=True)["wind_dir_vector_mean"])
+
+        # Field tanpa nilai (tidak ada di line) → tidak ada titik
+        assert len(engine.series("humidity", T0, end)[1]) == 0
+        engine.close()
+
+if __name__ == "__main__":
+    test_tiers_aggregate_per_bucket()
+    test_prime_after_restart_matches_live()
+    test_series_for_wide_chart()
+    print("✅ Semua test rollup berhasil!")
@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+
+from cuacane_app.utils.line_parser import parse_0R0_line, parse_0R0_record, timestamp_to_epoch
+from cuacane_app.utils.sensor_record import SensorRecord, HistorySeries
+
+LINE = "0R0,Dn=255#,Dm=331#,Dx=065#,Sn=0.1#,Sm=0.9#,Sx=1.4#,Ta=25.0C,Tp=25.3C,Ua=70.2P,Pa=0.9248B,Rc=0.0M,Rd=0s,Ri=0.0M,Th=23.4C,Vs=12.0N"
+TS = "2025-07-29 12:00:05"
+
+def test_record_matches_dict_parser():
+    record = parse_0R0_record(LINE, ts=timestamp_to_epoch(TS))
+    assert record.to_dict() == parse_0R0_line(LINE, timestamp=TS)
+    assert record["wind_dir_avg"] == 331 and isinstance(record["wind_dir_avg"], int)
+    assert record["datetime"] == TS
+
+    partial = parse_0R0_record("0R0,Sn=0.1#,Ta=abcC", ts=0.0)
+    assert "temp_air" not in partial
+    assert partial.get("temp_air") is None
+    assert math.isnan(partial.get_value("temp_air"))
+    assert partial.to_dict()["temp_air"] is None
+
+    assert parse_0R0_record("0R0,Ta=1=2") is None
+
+def test_record_merge_keeps_old_values():
+    latest = SensorRecord()
+    assert dict(latest) == {}
+    latest.merge(parse_0R0_record("0R0,Ta=25.0C,Ua=70.0P", ts=100.0))
+    latest.merge(parse_0R0_record("0R0,Ta=26.0C", ts=105.0))
+    assert latest["temp_air"] == 26.0
+    assert latest["humidity"] == 70.0
+    assert latest.ts == 105.0
+
+def test_record_from_dict_roundtrip():
+    parsed = parse_0R0_line(LINE, timestamp=TS)
+    assert SensorRecord.from_dict(parsed).to_dict() == parsed
+
+def test_history_bounded_and_compact():
+    series = HistorySeries(maxlen=30)
+    for i in range(1000):
+        series.append(1000.0 + i, float(i))
+
+    assert len(series) == 30
+    assert series[-1] == (1999.0, 999.0)
+    assert series[0] == (1970.0, 970.0)
+    assert [v for _, v in series][:2] == [970.0, 971.0]
+    assert len(series[-4:]) == 4
+    assert len(series.to_qml()) == 30 and set(series.to_qml()[0]) == {"value", "timestamp"}
+    # Ring buffer prealokasi: memori tetap 2x maxlen sampel × (8 + 4) byte
+    assert series._ts.nbytes + series._values.nbytes == 2 * series.maxlen * 12
+
+def test_history_window_is_view():
+    series = HistorySeries(maxlen=8)
+    for i in range(20):
+        series.append(1000 + 10 * i, 0.1 * i)
+
+    ts, values = series.window(1150, 1180)
+    assert ts.tolist() == [1150, 1160, 1170]
+    assert np.shares_memory(values, series._values), "❌ Window harus berupa view"
+    assert [v for _, v in series][-1] == 1.9, "❌ Nilai float32 dikembalikan dengan repr terpendek"
+    assert series.to_qml(start=1180)[-1]["value"] == 1.9
+
+    series.resize(4)
+    assert [t for t, _ in series] == [1160, 1170, 1180, 1190]
+    series.append(1200, 2.0)
+    assert series[0] == (1170, 1.7) and series[-1] == (1200, 2.0)
+
+def test_history_rejects_non_positive_capacity():
+    series = HistorySeries(maxlen=8)
+    for i in range(5):
+        series.append(i, float(i))
+    for bad in (0, -3):
+        try:
+            series.resize(bad)
+            assert False, "❌ Kapasitas <= 0 harus ditolak"
+        except ValueError:
+            pass
+    assert len(series) == 5 and series.maxlen == 8, "❌ Series tetap utuh setelah resize ditolak"
+
+def test_history_extend_matches_append():
+    for maxlen, first, n in ((8, 5, 6), (8, 3, 20), (30, 0, 7)):
+        appended, extended = HistorySeries(maxlen), HistorySeries(maxlen)
+        for i in range(first):
+            appended.append(i, float(i))
+            extended.append(i, float(i))
+        for i in range(first, first + n):
+            appended.append(i, float(i))
+        extended.extend(np.arange(first, first + n), np.arange(first, first + n, dtype=np.float64))
+        assert list(extended) == list(appended), (maxlen, first, n)
+        assert extended.appended == appended.appended
+
+if __name__ == "__main__":
+    test_record_matches_dict_parser()
+    test_record_merge_keeps_old_values()
+    test_record_from_dict_roundtrip()
+    test_history_bounded_and_compact()
+    test_history_window_is_view()
+    test_history_rejects_non_positive_capacity()
+    test_history_extend_matches_append()
+    print("✅ Semua test sensor record berhasil!")
@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from cuacane_app.utils.stations import load_station_configs, DEFAULT_STATION
+from cuacane_app.utils.sensor_sources import CloudSource
+from cuacane_app.utils.sensor_connection import StationState
+
+LINE = "0R0,Dn=255#,Dm={dir}#,Dx=065#,Sn=0.1#,Sm={speed}#,Sx=1.4#,Ta=25.0C,Ua=70.2P,Pa=0.9248B"
+
+def test_load_station_configs():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stations.json")
+        with open(path, "w") as f:
+            json.dump({"stations": [
+                {"id": "default", "name": "Utama"},
+                {"id": "mast2", "lat": -6.9, "lon": 107.7, "source": "tcp://127.0.0.1:4001"},
+                {"id": "mast2"},
+            ]}, f)
+        configs = load_station_configs(path)
+
+    assert [c["id"] for c in configs] == ["default", "mast2"]
+    assert configs[0]["log_path"] == DEFAULT_STATION["log_path"]
+    assert configs[0]["lat"] == DEFAULT_STATION["lat"]
+    assert configs[1]["log_path"].endswith(os.path.join("mast2", "realtime_log.csv"))
+    assert configs[1]["name"] == "mast2"
+
+def test_no_config_gives_default_station():
+    configs = load_station_configs("tidak_ada.json")
+    assert len(configs) == 1 and configs[0]["id"] == "default"
+
+def make_station(station_id, lines, tmp):
+    it = iter(lines)
+    cfg = dict(DEFAULT_STATION, id=station_id, name=station_id,
+               log_path=os.path.join(tmp, station_id, "realtime_log.csv"))
+    return StationState(cfg, models={}, source=CloudSource(lambda: next(it)))
+
+def test_stations_keep_separate_state():
+    with tempfile.TemporaryDirectory() as tmp:
+        a = make_station("a", [LINE.format(dir=100 + i, speed=1.0 + i) for i in range(5)], tmp)
+        b = make_station("b", [LINE.format(dir=200, speed=3.0)], tmp)
+        for _ in range(5):
+            a._ingestion.poll_once()
+        b._ingestion.poll_once()
+        a._drain_ingestion_queue()
+        b._drain_ingestion_queue()
+
+        assert a.latest_data["wind_dir_avg"] == 104
+        assert b.latest_data["wind_dir_avg"] == 200
+        assert len(a._history_dict["wind_speed_avg"]) == 5
+        assert len(b._history_dict["wind_speed_avg"]) == 1
+
+        # Lag hanya tersedia untuk stasiun dengan history cukup
+        assert a.get_lag_features()["lag2_windspeed"] == 3.0
+        assert b.get_lag_features()["lag2_windspeed"] == 0.0
+
+        with open(a.log_path) as f:
+            assert len(f.readlines()) == 6
+        with open(b.log_path) as f:
+            assert len(f.readlines()) == 2
+
+def test_history_signals_per_drain():
+    with tempfile.TemporaryDirectory() as tmp:
+        lines = [LINE.format(dir=100 + i, speed=1.0 + i) for i in range(3)] + ["0R0,Ta=26.0C"]
+        station = make_station("a", lines, tmp)
+        appended = []
+        station.historyAppended.connect(appended.append)
+
+        for _ in range(3):
+            station._ingestion.poll_once()
+        station._drain_ingestion_queue()
+        # Satu sinyal per field per drain, bukan per record
+        assert sorted(appended) == sorted(["temp_air", "humidity", "pressure", "wind_speed_avg", "wind_dir_avg"])
+
+        assert [v for _, v in station._history_dict["wind_speed_avg"]] == [1.0, 2.0, 3.0]
+
+        appended.clear()
+        station._ingestion.poll_once()
+        station._drain_ingestion_queue()
+        assert appended == ["temp_air"], "❌ Hanya field yang bertambah yang diberi sinyal"
+        assert len(station._history_dict["wind_speed_avg"]) == 3 and len(station._history_dict["temp_air"]) == 4
+
+def test_buffer_ready_notifies_only_on_change():
+    class Manager:
+        main_window = object()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        station = make_station("a", [LINE.format(dir=100 + i, speed=1.0 + i) for i in range(6)], tmp)
+        station.manager = Manager()
+        model = station.prediction_model
+        ready, predictions = [], []
+        model.bufferReadyChanged.connect(lambda: ready.append(model.bufferReady))
+        model.predictionChanged.connect(lambda: predictions.append(1))
+
+        for _ in range(6):
+            station._ingestion.poll_once()
+            station._drain_ingestion_queue()
+        station.get_lag_features()
+        station.get_lag_features()
+        assert ready == [True], "❌ bufferReadyChanged hanya saat status berubah"
+        assert predictions == [], "❌ Data masuk tidak memicu predictionChanged"
+
+def test_history_capacity_clamped():
+    with tempfile.TemporaryDirectory() as tmp:
+        station = make_station("a", [LINE.format(dir=100 + i, speed=1.0 + i) for i in range(6)], tmp)
+        for _ in range(6):
+            station._ingestion.poll_once()
+        station._drain_ingestion_queue()
+        for capacity in (0, -5):
+            station.resize_history(capacity)
+            assert station._history_dict["wind_speed_avg"].maxlen == 4
+        assert station.get_lag_features()["lag3_windspeed"] == 3.0, "❌ Fitur lag tetap tersedia"
+
+def test_wide_chart_range_served_from_rollups():
+    from PyQt5.QtCore import QCoreApplication
+    from cuacane_app.utils.line_parser import parse_0R0_record
+    from cuacane_app.utils.sensor_connection import SensorConnectionManager
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = dict(DEFAULT_STATION, id="a", name="a", history_capacity=32,
+                   log_path=os.path.join(tmp, "a", "realtime_log.csv"))
+        manager = SensorConnectionManager(source=CloudSource(lambda: ""), stations=[cfg])
+        try:
+            station = manager.current_station
+            t0 = 1753765200
+            for i in range(12 * 60):   # 1 jam, tiap 5 detik
+                record = parse_0R0_record(LINE.format(dir=100, speed=1.0 + i % 3), ts=t0 + 5 * i)
+                station._persist_record(record)
+                station._apply_record(record)
+
+            # 1 jam (720 sampel) > kapasitas history (32) → tier rollup 1 menit
+            manager.setChartParameter("wind_speed_avg")
+            manager.setChartRange(720, 800)
+            items = manager.historyRangeModel.items
+            assert len(items) == 60 and items[0]["sample"] == t0 // 60
+            assert all(abs(item["value"] - 2.0) < 1e-6 for item in items[:-1])
+
+            # Jendela dalam kapasitas tetap dari history di memori (LTTB)
+            manager.setChartRange(16, 800)
+            assert len(manager.historyRangeModel.items) == 16
+        finally:
+            manager.shutdown()
+
+def test_backfill_larger_than_queue_reaches_history():
+    from PyQt5.QtCore import QCoreApplication
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        n = 1000   # > kapasitas queue live (256)
+        items = [(f"2025-07-29 {12 + i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+                  LINE.format(dir=i % 360, speed=1.0 + i % 5)) for i in range(1, n + 1)]
+        cfg = dict(DEFAULT_STATION, id="a", name="a", log_path=os.path.join(tmp, "a", "realtime_log.csv"))
+        station = StationState(cfg, models={}, source=CloudSource(lambda: "", lambda start, end: iter(items)))
+        worker = station._ingestion
+        worker._last_logged_ts = datetime(2025, 7, 29, 12, 0, 0)
+
+        assert worker.run_backfill(now=datetime(2025, 7, 29, 13, 0, 0)) == n
+        app.processEvents()
+        station._drain_ingestion_queue()
+
+        assert worker.dropped_records == 0
+        assert len(station._history_dict["wind_dir_avg"]) == n
+        assert station._history_dict["wind_dir_avg"].timestamps()[-1] == int(datetime(2025, 7, 29, 12, 16, 40).timestamp())
+        assert station.latest_data["wind_dir_avg"] == n % 360
+        assert len(station.store) == n
+        station.stop()
+
+if __name__ == "__main__":
+    test_load_station_configs()
+    test_no_config_gives_default_station()
+    test_stations_keep_separate_state()
+    test_history_signals_per_drain()
+    test_buffer_ready_notifies_only_on_change()
+    test_history_capacity_clamped()
+    test_wide_chart_range_served_from_rollups()
+    test_backfill_larger_than_queue_reaches_history()
+    print("✅ Semua test multi-stasiun berhasil!")
@@ -0,0 +1,262 @@
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cuacane_app.utils.backfill import read_last_logged_timestamp
+from cuacane_app.utils.line_parser import FIELDS, NUMERIC_FIELDS, parse_many, timestamp_to_epoch
+from cuacane_app.utils.sensor_record import DIRECTION_FIELDS, format_epoch
+
+CHUNK_BYTES = 4 * 1024 * 1024
+REORDER_WINDOW = 3600  # detik; baris yang terlambat lebih dari ini dibuang
+STAT_KEYS = ("lines", "rows", "written", "no_timestamp", "malformed", "bad_values", "late", "duplicates")
+
+
+def split_archive_line(line):
+    """
+    "<timestamp><pemisah>0R0,..." → (epoch, raw). Pemisah boleh spasi, koma, titik koma,
+    atau tab. Line tanpa timestamp yang valid → (None, raw).
+    """
+    idx = line.find("0R0")
+    if idx < 0:
+        return None, line
+    prefix = line[:idx].strip(" ,;\t\r\n")
+    raw = line[idx:]
+    if len(prefix) < 16:
+        return None, raw
+    try:
+        return timestamp_to_epoch(prefix), raw
+    except ValueError:
+        return None, raw
+
+def chunk_ranges(path, chunk_bytes=CHUNK_BYTES):
+    """Bagi file menjadi range byte (start, end) yang selalu berakhir di batas baris."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            end = min(size, start + chunk_bytes)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            yield start, end
+            start = end
+
+def format_log_rows(columns):
+    """Kolom → baris CSV siap tulis (format sama dengan append_to_log, diakhiri CRLF)."""
+    series = []
+    for name in NUMERIC_FIELDS:
+        values = columns[name].tolist()
+        if name in DIRECTION_FIELDS:
+            series.append(["" if v != v else str(int(v)) for v in values])
+        else:
+            series.append(["" if v != v else str(v) for v in values])
+
+    # Format tanggal per menit, detik ditambahkan langsung
+    minutes = {}
+    stamps = []
+    for epoch in columns["epoch"].tolist():
+        base = epoch - epoch % 60
+        prefix = minutes.get(base)
+        if prefix is None:
+            prefix = minutes[base] = format_epoch(base)[:-2]
+        stamps.append(f"{prefix}{epoch % 60:02d}")
+    return [",".join(row) + "\r\n" for row in zip(stamps, *series)]
+
+def parse_chunk(path, start, end):
+    """Parse satu range byte (dijalankan di proses worker). Return (kolom, statistik)."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8", errors="replace")
+
+    stats = dict.fromkeys(STAT_KEYS, 0)
+    epochs = []
+    raws = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        stats["lines"] += 1
+        epoch, raw = split_archive_line(line)
+        if epoch is None:
+            stats["no_timestamp"] += 1
+            continue
+        epochs.append(epoch)
+        raws.append(raw)
+
+    columns = parse_many(raws)
+    columns["epoch"] = np.array(epochs, dtype=np.int64)
+    valid = columns.pop("valid")
+    bad_values = columns.pop("bad_values")
+    stats["malformed"] = int((~valid).sum())
+    stats["bad_values"] = int(bad_values[valid].sum())
+    columns = {name: col[valid] for name, col in columns.items()}
+    # Format CSV ikut dikerjakan di worker supaya proses utama cukup menulis
+    columns["csv"] = np.array(format_log_rows(columns), dtype=object)
+    return columns, stats
+
+
+class CsvLogSink:
+    """Tulis kolom hasil parse ke CSV dengan format yang sama seperti realtime_log.csv."""
+
+    def __init__(self, path):
+        self.path = path
+        self.last_epoch = None
+        last_ts = read_last_logged_timestamp(path)
+        if last_ts is not None:
+            self.last_epoch = int(last_ts.timestamp())
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", newline="", buffering=1024 * 1024)
+        if new_file:
+            csv.writer(self._file).writerow(FIELDS)
+
+    def write(self, columns):
+        epochs = columns["epoch"]
+        if self.last_epoch is not None:
+            # Jangan tulis ulang periode yang sudah ada di log
+            keep = epochs > self.last_epoch
+            columns = {name: col[keep] for name, col in columns.items()}
+            epochs = columns["epoch"]
+        if not len(epochs):
+            return 0
+
+        rows = columns["csv"].tolist() if "csv" in columns else format_log_rows(columns)
+        self._file.write("".join(rows))
+        self.last_epoch = int(epochs[-1])
+        return len(epochs)
+
+    def close(self):
+        self._file.close()
+
+
+class _ReorderBuffer:
+    """
+    Gabungkan hasil chunk menjadi aliran berurutan waktu dengan memori terbatas:
+    baris ditahan sampai lebih tua dari (epoch terbesar - window).
+    """
+
+    def __init__(self, window, stats):
+        self.window = window
+        self.stats = stats
+        self.pending = None
+        self.max_epoch = None
+        self.last_emitted = None
+
+    def push(self, columns):
+        if len(columns["epoch"]):
+            if self.pending is None:
+                self.pending = columns
+            else:
+                self.pending = {name: np.concatenate((self.pending[name], columns[name]))
+                                for name in columns}
+            chunk_max = int(columns["epoch"].max())
+            self.max_epoch = chunk_max if self.max_epoch is None else max(self.max_epoch, chunk_max)
+        return self._emit(self.max_epoch - self.window if self.max_epoch is not None else None)
+
+    def flush(self):
+        return self._emit(None)
+
+    def _emit(self, watermark):
+        if self.pending is None:
+            return None
+        order = np.argsort(self.pending["epoch"], kind="stable")
+        pending = {name: col[order] for name, col in self.pending.items()}
+        epochs = pending["epoch"]
+        cut = len(epochs) if watermark is None else int(np.searchsorted(epochs, watermark, side="right"))
+
+        ready = {name: col[:cut] for name, col in pending.items()}
+        self.pending = {name: col[cut:] for name, col in pending.items()}
+        if not len(self.pending["epoch"]):
+            self.pending = None
+
+        epochs = ready["epoch"]
+        keep = np.ones(len(epochs), dtype=bool)
+        if len(epochs):
+            keep[1:] = epochs[1:] != epochs[:-1]
+            self.stats["duplicates"] += int((~keep).sum())
+            if self.last_emitted is not None:
+                late = epochs <= self.last_emitted
+                self.stats["late"] += int((late & keep).sum())
+                keep &= ~late
+        ready = {name: col[keep] for name, col in ready.items()}
+        if not len(ready["epoch"]):
+            return None
+        self.last_emitted = int(ready["epoch"][-1])
+        return ready
+
+
+def parse_archive(paths, sink=None, workers=None, chunk_bytes=CHUNK_BYTES, reorder_window=REORDER_WINDOW):
+    """
+    Parse file arsip raw 0R0 secara paralel per chunk (ProcessPool, workers=0 → di proses ini),
+    gabungkan berurutan waktu, dan kirim ke sink (mis. CsvLogSink). Return statistik.
+    """
+    stats = dict.fromkeys(STAT_KEYS, 0)
+    reorder = _ReorderBuffer(reorder_window, stats)
+
+    def deliver(ready):
+        if ready is None:
+            return
+        stats["rows"] += len(ready["epoch"])
+        if sink is not None:
+            stats["written"] += sink.write(ready)
+
+    def consume(result):
+        columns, chunk_stats = result
+        for key, value in chunk_stats.items():
+            stats[key] += value
+        deliver(reorder.push(columns))
+
+    t0 = time.perf_counter()
+    tasks = ((path, start, end) for path in paths for start, end in chunk_ranges(path, chunk_bytes))
+    if workers == 0:
+        for task in tasks:
+            consume(parse_chunk(*task))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            max_inflight = 2 * workers
+            inflight = []
+            for task in tasks:
+                inflight.append(pool.submit(parse_chunk, *task))
+                # Hasil diambil berurutan file; jumlah chunk di memori dibatasi
+                if len(inflight) >= max_inflight:
+                    consume(inflight.pop(0).result())
+            for future in inflight:
+                consume(future.result())
+
+    deliver(reorder.flush())
+
+    elapsed = time.perf_counter() - t0
+    stats["elapsed"] = elapsed
+    stats["lines_per_s"] = stats["lines"] / elapsed if elapsed > 0 else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse arsip raw 0R0 menjadi realtime_log.csv")
+    parser.add_argument("paths", nargs="+", help="file arsip (satu line '<timestamp> 0R0,...' per baris)")
+    parser.add_argument("--output", default="cuacane_app/data_logs/realtime_log.csv")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses (0 = tanpa pool)")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_BYTES / (1024 * 1024))
+    parser.add_argument("--reorder-window", type=int, default=REORDER_WINDOW, help="detik")
+    args = parser.parse_args()
+
+    sink = CsvLogSink(args.output)
+    try:
+        stats = parse_archive(args.paths, sink=sink, workers=args.workers,
+                              chunk_bytes=int(args.chunk_mb * 1024 * 1024),
+                              reorder_window=args.reorder_window)
+    finally:
+        sink.close()
+
+    print(f"[📊] {stats['lines']} line dalam {stats['elapsed']:.2f} s ({stats['lines_per_s']:.0f} line/s)")
+    print(f"[✅] {stats['rows']} record diproses, {stats['written']} baru ditulis → {args.output}")
+    print(f"[⚠️] Ditolak: tanpa timestamp={stats['no_timestamp']}, rusak={stats['malformed']}, "
+          f"terlambat={stats['late']}, duplikat={stats['duplicates']}, nilai invalid={stats['bad_values']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+from datetime import datetime, timedelta
+from itertools import islice
+
+import numpy as np
+
+from cuacane_app.utils.line_parser import parse_many
+
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M")
+GAP_THRESHOLD = timedelta(seconds=60)
+MAX_BACKFILL_WINDOW = timedelta(days=7)
+BACKFILL_BATCH = 500   # baris per halaman backfill yang di-parse & ditulis sekaligus
+
+
+def parse_log_timestamp(value):
+    value = (value or "").strip()
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+def read_last_log_line(log_path, block_size=4096):
+    """Baca baris terakhir file log dengan seek dari akhir file (tanpa membaca seluruh file)."""
+    if not os.path.exists(log_path):
+        return None
+
+    with open(log_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = tail.splitlines()
+            # Baris pertama blok bisa terpotong, kecuali sudah di awal file
+            complete = lines if pos == 0 else lines[1:]
+            for line in reversed(complete):
+                if line.strip():
+                    return line.decode("utf-8", errors="replace")
+    return None
+
+def read_last_logged_timestamp(log_path):
+    line = read_last_log_line(log_path)
+    if not line:
+        return None
+    return parse_log_timestamp(line.split(",", 1)[0])
+
+def find_gap(last_ts, now=None, threshold=GAP_THRESHOLD, max_window=MAX_BACKFILL_WINDOW):
+    """Kembalikan (start, end) window yang hilang, atau None jika tidak ada gap."""
+    if last_ts is None:
+        return None
+    now = now or datetime.now()
+    if now - last_ts <= threshold:
+        return None
+    return max(last_ts, now - max_window), now
+
+def iter_backfill_batches(items, last_ts=None, batch_size=BACKFILL_BATCH):
+    """
+    Parse item backfill (timestamp, raw) per halaman batch_size dengan parse_many:
+    tiap halaman diurutkan, duplikat timestamp dan yang sudah tercatat (<= last_ts)
+    dibuang. Yield (kolom, raw terakhir) per halaman; kolom berisi "epoch" naik & unik
+    dan hanya line valid. Memori dibatasi satu halaman, berapa pun panjang gap-nya.
+    """
+    items = iter(items)
+    while True:
+        page = list(islice(items, batch_size))
+        if not page:
+            return
+        parsed = []
+        for ts_str, raw in page:
+            ts = parse_log_timestamp(ts_str)
+            if ts is None or not raw or (last_ts is not None and ts <= last_ts):
+                continue
+            parsed.append((ts, raw))
+        parsed.sort(key=lambda x: x[0])
+        # Duplikat timestamp: yang pertama dipakai
+        unique = [item for i, item in enumerate(parsed) if i == 0 or item[0] != parsed[i - 1][0]]
+        if not unique:
+            continue
+
+        raws = [raw for _, raw in unique]
+        columns = parse_many(raws)
+        columns["epoch"] = np.array([int(ts.timestamp()) for ts, _ in unique], dtype=np.int64)
+        valid = columns.pop("valid")
+        columns.pop("bad_values")
+        if not valid.any():
+            continue
+        columns = {name: col[valid] for name, col in columns.items()}
+        last = int(np.flatnonzero(valid)[-1])
+        last_ts = unique[last][0]
+        yield columns, raws[last]
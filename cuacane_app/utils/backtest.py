@@ -0,0 +1,255 @@
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+from cuacane_app.utils.backfill import parse_log_timestamp
+from cuacane_app.utils.forecast_store import MATCH_TOLERANCE, wind_errors
+from cuacane_app.utils.line_parser import timestamp_to_epoch
+from cuacane_app.utils.log_archive import iter_log_range
+from cuacane_app.utils.multi_predictor import FEATURE_ORDER, HORIZONS, ModelRegistry, forward
+from cuacane_app.utils.replay import StageTimer
+
+HORIZON_SECONDS = {"15m": 15 * 60, "1h": 60 * 60, "3h": 3 * 60 * 60, "6h": 6 * 60 * 60}
+BATCH_SIZE = 8192
+# Baris pertama yang punya lag lengkap (get_lag_features butuh ≥ 4 sampel angin)
+MIN_HISTORY = 4
+INPUT_FIELDS = ("temp_air", "humidity", "pressure", "rain_duration", "rain_intensity",
+                "wind_speed_avg", "wind_dir_avg")
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# === Data history → kolom NumPy ===
+def load_history(log_path, archive_path=None, start=None, end=None):
+    """
+    Log (+ arsip harian) dalam [start, end) → dict kolom NumPy urut waktu: epoch, hour,
+    month, weekday, dan INPUT_FIELDS (kosong/tidak valid → 0.0 seperti data.get(k, 0.0)).
+    """
+    epochs, calendar, values = [], [], []
+    for ts, record in iter_log_range(log_path, archive_path, start, end):
+        epochs.append(timestamp_to_epoch(record["datetime"]))
+        calendar.append((ts.hour, ts.month, ts.weekday()))
+        values.append([_to_float(record.get(k)) for k in INPUT_FIELDS])
+
+    epochs = np.asarray(epochs, dtype=np.int64)
+    order = np.argsort(epochs, kind="stable")
+    calendar = np.asarray(calendar, dtype=np.int64).reshape(-1, 3)[order]
+    values = np.asarray(values, dtype=np.float64).reshape(-1, len(INPUT_FIELDS))[order]
+    history = {"epoch": epochs[order], "hour": calendar[:, 0], "month": calendar[:, 1], "weekday": calendar[:, 2]}
+    history.update((k, values[:, i]) for i, k in enumerate(INPUT_FIELDS))
+    return history
+
+
+def _shift(x, k):
+    # x[i - k] di posisi i (k sampel sebelumnya); posisi awal yang belum punya lag → 0.0
+    out = np.zeros_like(x)
+    out[k:] = x[:-k]
+    return out
+
+
+def build_feature_table(history):
+    """
+    Semua calon fitur untuk setiap baris sekaligus, identik dengan _build_full_input +
+    get_lag_features saat baris itu adalah data terbaru: lag2/lag3 = 2/3 sampel sebelumnya.
+    """
+    hour, month = history["hour"], history["month"]
+    rad = np.radians(history["wind_dir_avg"])
+    sin_dir, cos_dir = np.sin(rad), np.cos(rad)
+    return {
+        "air_temp": history["temp_air"],
+        "relative_humid": history["humidity"],
+        "air_pressure": history["pressure"] / 1013.25,  # konversi dari hPa ke atm
+        "rain_duration": history["rain_duration"],
+        "rain_intensity": history["rain_intensity"],
+        "hour": hour.astype(np.float64),
+        "month": month.astype(np.float64),
+        "weekday": history["weekday"].astype(np.float64),
+        "sin_hour": np.sin(2 * np.pi * hour / 24),
+        "cos_hour": np.cos(2 * np.pi * hour / 24),
+        "sin_month": np.sin(2 * np.pi * month / 12),
+        "cos_month": np.cos(2 * np.pi * month / 12),
+        "prev_windspeed": history["wind_speed_avg"],
+        "prev_sin_dir": sin_dir,
+        "prev_cos_dir": cos_dir,
+        "lag2_windspeed": _shift(history["wind_speed_avg"], 2),
+        "lag3_windspeed": _shift(history["wind_speed_avg"], 3),
+        "lag2_sin_dir": _shift(sin_dir, 2),
+        "lag3_cos_dir": _shift(cos_dir, 3),
+    }
+
+
+def feature_matrix(table, horizon, rows=slice(None)):
+    """Matriks (n, fitur) float32 sesuai FEATURE_ORDER[horizon]."""
+    return np.column_stack([table[k][rows] for k in FEATURE_ORDER[horizon]]).astype(np.float32)
+
+
+# === Inferensi batch ===
+def predict_batch(m, X, batch_size=BATCH_SIZE):
+    """(speed, direction) untuk semua baris X, per potongan batch_size (jalur sama dengan predict_from_data)."""
+    engine = m.get("engine")
+    outputs = []
+    for i in range(0, len(X), batch_size):
+        chunk = X[i:i + batch_size]
+        if engine is not None:
+            outputs.append(engine(chunk))
+        else:
+            scaled = m["scaler_X"].transform(chunk)
+            outputs.append(m["scaler_y"].inverse_transform(forward(m["model"], scaled)))
+    out = np.concatenate(outputs) if outputs else np.zeros((0, 3))
+    direction = np.degrees(np.arctan2(out[:, 1], out[:, 2])) % 360
+    return out[:, 0].astype(np.float64), direction.astype(np.float64)
+
+
+def match_observations(epochs, targets, tolerance=MATCH_TOLERANCE):
+    """Index observasi terdekat untuk tiap epoch target (±tolerance), -1 jika tidak ada."""
+    if not len(epochs):
+        return np.full(len(targets), -1, dtype=np.int64)
+    right = np.clip(np.searchsorted(epochs, targets), 0, len(epochs) - 1)
+    left = np.clip(right - 1, 0, len(epochs) - 1)
+    pick = np.where(np.abs(epochs[left] - targets) <= np.abs(epochs[right] - targets), left, right)
+    return np.where(np.abs(epochs[pick] - targets) <= tolerance, pick, -1)
+
+
+# === Metrik ===
+def error_summary(speed_err, dir_err, vec_err):
+    n = len(speed_err)
+    if not n:
+        return {"n": 0, "mae": math.nan, "rmse": math.nan, "bias": math.nan, "dirError": math.nan, "vectorRmse": math.nan}
+    return {
+        "n": n,
+        "mae": float(np.mean(np.abs(speed_err))),
+        "rmse": float(np.sqrt(np.mean(speed_err ** 2))),
+        "bias": float(np.mean(speed_err)),
+        "dirError": float(np.mean(np.abs(dir_err))),
+        "vectorRmse": float(np.sqrt(np.mean(vec_err ** 2))),
+    }
+
+
+def hourly_summary(hours, speed_err, dir_err, vec_err):
+    """Metrik per jam terbit (0–23) dengan bincount; jam tanpa data dilewati."""
+    n = np.bincount(hours, minlength=24)
+    abs_e = np.bincount(hours, np.abs(speed_err), minlength=24)
+    sq_e = np.bincount(hours, speed_err ** 2, minlength=24)
+    abs_dir = np.bincount(hours, np.abs(dir_err), minlength=24)
+    sq_vec = np.bincount(hours, vec_err ** 2, minlength=24)
+    return [
+        {
+            "hour": hour, "n": int(n[hour]),
+            "mae": float(abs_e[hour] / n[hour]),
+            "rmse": float(math.sqrt(sq_e[hour] / n[hour])),
+            "dirError": float(abs_dir[hour] / n[hour]),
+            "vectorRmse": float(math.sqrt(sq_vec[hour] / n[hour])),
+        }
+        for hour in range(24) if n[hour]
+    ]
+
+
+def run_backtest(log_path, archive_path=None, start=None, end=None, horizons=HORIZONS, models=None,
+                 tolerance=MATCH_TOLERANCE, batch_size=BATCH_SIZE, timer=None):
+    """
+    Backtest semua horizon atas history log: tiap baris (dengan lag lengkap) diperlakukan
+    sebagai saat predictNow, lalu dibandingkan dengan observasi terdekat di issued + horizon.
+    Return ({horizon: hasil}, StageTimer). Baseline persistence = observasi saat terbit.
+    """
+    timer = timer or StageTimer()
+    models = ModelRegistry() if models is None else models
+    with timer.stage("load"):
+        history = load_history(log_path, archive_path, start, end)
+    with timer.stage("features"):
+        table = build_feature_table(history)
+
+    epochs = history["epoch"]
+    rows = slice(MIN_HISTORY - 1, None)
+    issued = epochs[rows]
+    obs_speed, obs_dir = history["wind_speed_avg"], history["wind_dir_avg"]
+    results = {}
+    for h in horizons:
+        with timer.stage("match"):
+            idx = match_observations(epochs, issued + HORIZON_SECONDS[h], tolerance)
+            hit = idx >= 0
+        with timer.stage("features"):
+            X = feature_matrix(table, h, rows)[hit]
+        m = models[h]
+        t0 = time.perf_counter()
+        with timer.stage(f"predict_{h}"):
+            speed, direction = predict_batch(m, X, batch_size)
+        seconds = time.perf_counter() - t0
+
+        with timer.stage("metrics"):
+            target = idx[hit]
+            errors = wind_errors(speed, direction, obs_speed[target], obs_dir[target])
+            persistence = wind_errors(obs_speed[rows][hit], obs_dir[rows][hit], obs_speed[target], obs_dir[target])
+            summary = error_summary(*errors)
+            baseline = error_summary(*persistence)
+            results[h] = dict(
+                summary,
+                horizon=h,
+                missed=int(np.count_nonzero(~hit)),
+                persistenceMae=baseline["mae"],
+                persistenceVectorRmse=baseline["vectorRmse"],
+                skill=1.0 - summary["vectorRmse"] / baseline["vectorRmse"] if baseline["vectorRmse"] else math.nan,
+                rowsPerSecond=len(X) / seconds if seconds > 0 else math.inf,
+                hourly=hourly_summary(history["hour"][rows][hit], *errors),
+            )
+    return results, timer
+
+
+def format_report(results, hourly=False):
+    lines = [f"{'horizon':8s} {'n':>8s} {'miss':>7s} {'MAE':>7s} {'RMSE':>7s} {'bias':>7s} "
+             f"{'arah°':>7s} {'vRMSE':>7s} {'persist':>7s} {'skill':>7s} {'baris/s':>12s}"]
+    for h, r in results.items():
+        lines.append(f"{h:8s} {r['n']:8d} {r['missed']:7d} {r['mae']:7.3f} {r['rmse']:7.3f} {r['bias']:7.3f} "
+                     f"{r['dirError']:7.1f} {r['vectorRmse']:7.3f} {r['persistenceVectorRmse']:7.3f} "
+                     f"{r['skill']:7.3f} {r['rowsPerSecond']:12.0f}")
+    if hourly:
+        for h, r in results.items():
+            lines.append(f"\n[🕒] {h} per jam terbit")
+            lines.append(f"{'jam':>4s} {'n':>7s} {'MAE':>7s} {'RMSE':>7s} {'arah°':>7s} {'vRMSE':>7s}")
+            for row in r["hourly"]:
+                lines.append(f"{row['hour']:4d} {row['n']:7d} {row['mae']:7.3f} {row['rmse']:7.3f} "
+                             f"{row['dirError']:7.1f} {row['vectorRmse']:7.3f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest model prediksi angin atas history log Cuacane")
+    parser.add_argument("--log", default="cuacane_app/data_logs/realtime_log.csv")
+    parser.add_argument("--archive", default=None, help="folder arsip partisi harian (index.json)")
+    parser.add_argument("--start", default=None, help="awal rentang, 'YYYY-MM-DD HH:MM:SS'")
+    parser.add_argument("--end", default=None, help="akhir rentang (eksklusif), 'YYYY-MM-DD HH:MM:SS'")
+    parser.add_argument("--horizons", default=",".join(HORIZONS), help="mis. 15m,1h")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--tolerance", type=int, default=MATCH_TOLERANCE, help="detik, pencocokan observasi")
+    parser.add_argument("--hourly", action="store_true", help="tampilkan rincian per jam")
+    parser.add_argument("--json", default=None, help="simpan hasil lengkap ke file JSON ini")
+    args = parser.parse_args()
+
+    start = parse_log_timestamp(args.start).timestamp() if args.start else None
+    end = parse_log_timestamp(args.end).timestamp() if args.end else None
+
+    t_start = time.perf_counter()
+    results, timer = run_backtest(
+        args.log, archive_path=args.archive, start=start, end=end,
+        horizons=[h.strip() for h in args.horizons.split(",") if h.strip()],
+        tolerance=args.tolerance, batch_size=args.batch_size,
+    )
+    wall = time.perf_counter() - t_start
+    print(f"\n[📊] Backtest {len(results)} horizon")
+    print(format_report(results, hourly=args.hourly))
+    print()
+    print(timer.report(wall))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[💾] Hasil disimpan ke {args.json}")
+
+if __name__ == "__main__":
+    main()
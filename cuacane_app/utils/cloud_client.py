@@ -0,0 +1,111 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+CLOUD_BASE_URL = "https://cuacane-cloud-api.onrender.com"
+
+
+class CloudClient:
+    """
+    Client HTTP untuk cloud relay dengan koneksi keep-alive (session + pool).
+    Memakai ETag/If-None-Match dan cursor `seq` sehingga data yang belum berubah
+    cukup dibalas 304 tanpa body.
+    """
+
+    def __init__(self, base_url=CLOUD_BASE_URL, timeout=5, pool_maxsize=2):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+
+        self._etag = None
+        self._seq = None
+        self._last_raw = None
+        self.stats = {"requests": 0, "not_modified": 0, "bytes": 0}
+
+    def fetch_latest_raw(self):
+        """
+        Ambil raw line terbaru. Jika server membalas 304, raw terakhir dikembalikan lagi
+        (ingestion worker yang memutuskan apakah data sama perlu dicatat).
+        Mengembalikan None jika request gagal.
+        """
+        headers = {}
+        params = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._seq is not None:
+            params["since"] = self._seq
+
+        try:
+            r = self.session.get(f"{self.base_url}/latest_raw", headers=headers,
+                                 params=params, timeout=self.timeout)
+        except Exception as e:
+            print(f"[⛔] Gagal ambil data dari cloud: {e}")
+            return None
+
+        self.stats["requests"] += 1
+        self.stats["bytes"] += len(r.content)
+
+        if r.status_code == 304:
+            self.stats["not_modified"] += 1
+            return self._last_raw if self._last_raw is not None else ""
+
+        try:
+            r.raise_for_status()
+            data = r.json()
+        except Exception as e:
+            print(f"[⛔] Respons cloud tidak valid: {e}")
+            return None
+
+        self._etag = r.headers.get("ETag", self._etag)
+        if data.get("seq") is not None:
+            self._seq = data["seq"]
+        self._last_raw = data.get("raw", "")
+        return self._last_raw
+
+    def fetch_raw_range(self, start, end, page_size=500):
+        """
+        Ambil raw line historis dalam window [start, end] per halaman (untuk backfill).
+        Generator (timestamp, raw); exception dilempar ke pemanggil agar bisa di-retry.
+        """
+        cursor = None
+        while True:
+            params = {
+                "start": start.strftime("%Y-%m-%d %H:%M:%S"),
+                "end": end.strftime("%Y-%m-%d %H:%M:%S"),
+                "limit": page_size,
+            }
+            if cursor is not None:
+                params["cursor"] = cursor
+
+            r = self.session.get(f"{self.base_url}/raw_range", params=params, timeout=self.timeout)
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(r.content)
+            if r.status_code == 404:
+                print("[⚠️] Endpoint backfill /raw_range tidak tersedia di cloud.")
+                return
+            r.raise_for_status()
+            data = r.json()
+
+            for item in data.get("items", []):
+                yield item.get("timestamp"), item.get("raw")
+
+            cursor = data.get("next_cursor")
+            if cursor is None:
+                return
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+
+def get_default_client():
+    """Client bersama untuk jalur lama get_latest_raw_from_cloud; sumber ingestion memakai client sendiri."""
+    global _default_client
+    if _default_client is None:
+        _default_client = CloudClient()
+    return _default_client
@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        stub = self.server.stub
+        with stub._lock:
+            stub.connections += 1
+        # Simulasi biaya handshake TLS/RTT untuk setiap koneksi baru
+        if stub.handshake_delay:
+            time.sleep(stub.handshake_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        stub = self.server.stub
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        with stub._lock:
+            stub.requests += 1
+            seq = stub.seq
+            etag = stub.etag
+            body = stub.body
+
+        if url.path == "/raw_range":
+            self._send(200, stub.range_page(query))
+            return
+        if url.path != "/latest_raw":
+            self._send(404, b'{"error": "not found"}')
+            return
+
+        since = query.get("since", [None])[0]
+        if self.headers.get("If-None-Match") == etag or (since is not None and int(since) >= seq):
+            self._send(304, b"", etag=etag)
+            return
+
+        self._send(200, body, etag=etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and status != 304:
+            self.wfile.write(body)
+
+
+class CloudStubServer:
+    """
+    Server lokal pengganti cuacane-cloud-api untuk test & benchmark offline.
+    Mendukung endpoint /latest_raw dengan ETag, If-None-Match, dan cursor `since`,
+    serta /raw_range berhalaman untuk backfill.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, handshake_delay=0.0, padding=0):
+        self.handshake_delay = handshake_delay
+        self.padding = padding
+        self.connections = 0
+        self.requests = 0
+        self.seq = 0
+        self.etag = None
+        self.body = b""
+        self.history = []
+        self._lock = threading.Lock()
+
+        self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+        self.push_line("")
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def push_line(self, raw_line, timestamp=None):
+        """Simulasikan pengukuran baru dari stasiun."""
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            self.seq += 1
+            if raw_line:
+                self.history.append((timestamp, raw_line))
+            payload = {
+                "raw": raw_line,
+                "seq": self.seq,
+                "timestamp": timestamp,
+            }
+            if self.padding:
+                payload["meta"] = "x" * self.padding
+            self.body = json.dumps(payload).encode()
+            self.etag = f'"{self.seq}"'
+
+    def range_page(self, query):
+        start = query.get("start", [""])[0]
+        end = query.get("end", ["9999"])[0]
+        limit = int(query.get("limit", ["500"])[0])
+        cursor = int(query.get("cursor", ["0"])[0])
+
+        with self._lock:
+            matches = [(ts, raw) for ts, raw in self.history if start <= ts <= end]
+        page = matches[cursor:cursor + limit]
+        next_cursor = cursor + limit if cursor + limit < len(matches) else None
+        return json.dumps({
+            "items": [{"timestamp": ts, "raw": raw} for ts, raw in page],
+            "next_cursor": next_cursor,
+        }).encode()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
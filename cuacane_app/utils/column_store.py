@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from cuacane_app.utils.sensor_record import NUMERIC_FIELDS
+
+META_FILE = "meta.json"
+INITIAL_CAPACITY = 1 << 16
+DEFAULT_DTYPE = "float32"
+
+
+class ColumnStore:
+    """
+    Time-series kolom di disk: satu file memmap per field (dtype tetap) + kolom epoch
+    (int64, detik, naik terus). Append amortized O(1), slicing waktu O(log n) dengan
+    binary search, dan hasil baca berupa view NumPy tanpa copy.
+    """
+
+    def __init__(self, path, fields=None, dtype=DEFAULT_DTYPE, initial_capacity=INITIAL_CAPACITY):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.fields = meta["fields"]
+            self.dtype = np.dtype(meta["dtype"])
+            self._capacity = meta["capacity"]
+            self._length = meta["length"]
+        else:
+            self.fields = list(fields or NUMERIC_FIELDS)
+            self.dtype = np.dtype(dtype)
+            self._capacity = initial_capacity
+            self._length = 0
+
+        self._index = {name: i for i, name in enumerate(self.fields)}
+        self._map_files()
+        self._recover_length()
+        self._meta_length = None
+        self._write_meta()
+
+    # === File & metadata ===
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _map_files(self):
+        self._epoch = self._map(self._file("epoch"), np.int64)
+        self._columns = [self._map(self._file(name), self.dtype) for name in self.fields]
+
+    def _map(self, path, dtype):
+        size = self._capacity * np.dtype(dtype).itemsize
+        if not os.path.exists(path) or os.path.getsize(path) < size:
+            with open(path, "ab") as f:
+                f.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=(self._capacity,))
+
+    def _recover_length(self):
+        # Baris yang sudah ditulis setelah meta terakhir (mis. app mati mendadak) punya epoch != 0
+        n = self._length
+        while n < self._capacity and self._epoch[n] != 0:
+            n += 1
+        self._length = n
+
+    def _write_meta(self):
+        meta = {"fields": self.fields, "dtype": self.dtype.str, "capacity": self._capacity, "length": self._length}
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+        self._meta_length = self._length
+
+    def _grow(self, needed):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        self.flush(sync=True)
+        # View lama tetap valid (memmap lama), tapi tidak melihat data baru setelah grow
+        self._capacity = capacity
+        self._map_files()
+        self._write_meta()
+
+    # === Tulis ===
+    def append(self, epoch, values):
+        """Tambah satu baris. values: mapping field → nilai (SensorRecord/dict). False jika epoch tidak naik."""
+        if self._length and epoch <= self._epoch[self._length - 1]:
+            return False
+        if self._length >= self._capacity:
+            self._grow(self._length + 1)
+
+        i = self._length
+        get = values.get
+        for name, column in zip(self.fields, self._columns):
+            value = get(name)
+            column[i] = np.nan if value is None else value
+        self._epoch[i] = epoch
+        self._length = i + 1
+        return True
+
+    def append_record(self, record):
+        """Seperti append(), langsung dari SensorRecord (NaN untuk field kosong)."""
+        epoch = int(record.ts)
+        if self._length and epoch <= self._epoch[self._length - 1]:
+            return False
+        if self._length >= self._capacity:
+            self._grow(self._length + 1)
+
+        i = self._length
+        for name, column in zip(self.fields, self._columns):
+            column[i] = record.get_value(name)
+        self._epoch[i] = epoch
+        self._length = i + 1
+        return True
+
+    def append_columns(self, columns):
+        """Tambah banyak baris sekaligus dari kolom NumPy (harus berisi "epoch", urut naik)."""
+        epochs = np.asarray(columns["epoch"], dtype=np.int64)
+        if self._length:
+            keep = epochs > self._epoch[self._length - 1]
+            epochs = epochs[keep]
+        else:
+            keep = slice(None)
+        n = len(epochs)
+        if not n:
+            return 0
+        if np.any(np.diff(epochs) <= 0):
+            raise ValueError("epoch harus naik dan unik")
+        if self._length + n > self._capacity:
+            self._grow(self._length + n)
+
+        lo, hi = self._length, self._length + n
+        for name, column in zip(self.fields, self._columns):
+            if name in columns:
+                column[lo:hi] = np.asarray(columns[name])[keep]
+            else:
+                column[lo:hi] = np.nan
+        self._epoch[lo:hi] = epochs
+        self._length = hi
+        return n
+
+    def flush(self, sync=False):
+        """Simpan panjang data ke meta.json; sync=True juga msync memmap ke disk."""
+        if sync:
+            self._epoch.flush()
+            for column in self._columns:
+                column.flush()
+        if self._meta_length != self._length:
+            self._write_meta()
+
+    def close(self):
+        self.flush(sync=True)
+
+    # === Baca ===
+    def __len__(self):
+        return self._length
+
+    @property
+    def epochs(self):
+        return self._epoch[:self._length]
+
+    def column(self, name):
+        return self._columns[self._index[name]][:self._length]
+
+    def range_slice(self, start=None, end=None):
+        """Index [lo, hi) untuk start <= epoch < end (binary search)."""
+        epochs = self.epochs
+        lo = 0 if start is None else int(np.searchsorted(epochs, start, side="left"))
+        hi = self._length if end is None else int(np.searchsorted(epochs, end, side="left"))
+        return lo, max(lo, hi)
+
+    def window(self, start=None, end=None, fields=None):
+        """View (tanpa copy) semua/sebagian field untuk rentang waktu [start, end)."""
+        lo, hi = self.range_slice(start, end)
+        out = {"epoch": self._epoch[lo:hi]}
+        for name in fields or self.fields:
+            out[name] = self._columns[self._index[name]][lo:hi]
+        return out
+
+    def last_epoch(self):
+        return int(self._epoch[self._length - 1]) if self._length else None
+
+
+def build_from_log(log_path, store_path, batch_size=10000):
+    """Isi ColumnStore dari realtime_log.csv yang sudah ada (hanya baris yang lebih baru)."""
+    from cuacane_app.utils.replay import iter_log_rows
+
+    store = ColumnStore(store_path)
+    added = 0
+    batch = {"epoch": []}
+    batch.update({name: [] for name in store.fields})
+
+    def push():
+        nonlocal added
+        if not batch["epoch"]:
+            return
+        columns = {name: np.array(values, dtype=np.float64) for name, values in batch.items() if name != "epoch"}
+        columns["epoch"] = np.array(batch["epoch"], dtype=np.int64)
+        order = np.argsort(columns["epoch"], kind="stable")
+        columns = {name: col[order] for name, col in columns.items()}
+        unique = np.ones(len(order), dtype=bool)
+        unique[1:] = np.diff(columns["epoch"]) > 0
+        added += store.append_columns({name: col[unique] for name, col in columns.items()})
+        for values in batch.values():
+            values.clear()
+
+    for ts, row in iter_log_rows(log_path):
+        batch["epoch"].append(int(ts.timestamp()))
+        for name in store.fields:
+            try:
+                batch[name].append(float(row.get(name) or "nan"))
+            except ValueError:
+                batch[name].append(np.nan)
+        if len(batch["epoch"]) >= batch_size:
+            push()
+    push()
+    store.close()
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bangun ColumnStore dari realtime_log.csv")
+    parser.add_argument("--log", default="cuacane_app/data_logs/realtime_log.csv")
+    parser.add_argument("--store", default="cuacane_app/data_logs/store")
+    args = parser.parse_args()
+
+    added = build_from_log(args.log, args.store)
+    print(f"[✅] {added} baris ditambahkan ke {args.store}")
+
+if __name__ == "__main__":
+    main()
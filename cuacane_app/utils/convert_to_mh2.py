@@ -2,12 +2,19 @@ import csv
 from datetime import datetime
 import os
 
+import numpy as np
+
+from cuacane_app.utils.data_logger import flush_all_loggers
+
 def batch_convert(input_path: str, output_path: str):
     """
     Mengubah file realtime_log.csv menjadi format .MH2
     Format output mengikuti struktur yang dibutuhkan oleh PC-COSYMA
     """
 
+    # Pastikan baris yang masih di buffer logger ikut terbaca
+    flush_all_loggers()
+
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Input file tidak ditemukan: {input_path}")
 
@@ -18,6 +25,9 @@ def batch_convert(input_path: str, output_path: str):
     if not rows:
         raise ValueError("File log kosong")
 
+    _write_mh2_rows(rows, output_path)
+
+def _write_mh2_rows(rows, output_path):
     with open(output_path, 'w') as out_file:
         out_file.write("TIME,DIR,SPEED,TEMP,HUM,PRES\n")  # Header file MH2
 
@@ -35,3 +45,54 @@ def batch_convert(input_path: str, output_path: str):
 
             except Exception as e:
                 print(f"[!] Lewatkan baris: {e}")
+
+def convert_log_range(input_path: str, output_path: str, start=None, end=None, archive_path=None):
+    """
+    Seperti batch_convert untuk rentang [start, end) (epoch detik) yang bisa melewati
+    batas partisi harian: chunk yang relevan dari arsip (archive_path) + log aktif.
+    """
+    from cuacane_app.utils.log_archive import iter_log_range
+
+    flush_all_loggers()
+    if archive_path is None:
+        archive_path = os.path.join(os.path.dirname(input_path), "archive")
+
+    rows = [record for _, record in iter_log_range(input_path, archive_path, start, end)]
+    if not rows:
+        raise ValueError("Tidak ada data pada rentang waktu tersebut")
+    _write_mh2_rows(rows, output_path)
+    return len(rows)
+
+def convert_store_window(store, output_path: str, start=None, end=None):
+    """
+    Seperti batch_convert, tetapi membaca langsung dari ColumnStore (objek atau path)
+    dan hanya rentang waktu [start, end) (epoch detik) yang dibutuhkan.
+    """
+    from cuacane_app.utils.column_store import ColumnStore
+
+    if isinstance(store, str):
+        store = ColumnStore(store)
+
+    fields = ["wind_dir_avg", "wind_speed_avg", "temp_air", "humidity", "pressure"]
+    window = store.window(start, end, fields=fields)
+    if not len(window["epoch"]):
+        raise ValueError("Tidak ada data pada rentang waktu tersebut")
+
+    # Baris dengan nilai kosong dilewati, sama seperti batch_convert
+    complete = np.ones(len(window["epoch"]), dtype=bool)
+    for name in fields:
+        complete &= np.isfinite(window[name])
+    skipped = int((~complete).sum())
+    if skipped:
+        print(f"[!] Lewatkan {skipped} baris dengan nilai kosong")
+
+    epochs = window["epoch"][complete].tolist()
+    columns = [window[name][complete].astype(np.float64).tolist() for name in fields]
+
+    with open(output_path, 'w') as out_file:
+        out_file.write("TIME,DIR,SPEED,TEMP,HUM,PRES\n")  # Header file MH2
+        for epoch, direction, speed, temp, humidity, pressure in zip(epochs, *columns):
+            hour = datetime.fromtimestamp(epoch).strftime("%H:%M")
+            pressure = pressure * 1000  # dari B ke Pa
+            out_file.write(f"{hour},{direction:.1f},{speed:.2f},{temp:.1f},{humidity:.1f},{pressure:.0f}\n")
+    return len(epochs)
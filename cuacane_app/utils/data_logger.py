@@ -0,0 +1,271 @@
+import atexit
+import csv
+import io
+import os
+import threading
+import time
+
+from cuacane_app.utils.backfill import read_last_log_line
+from cuacane_app.utils.log_archive import LogArchive
+from cuacane_app.utils.sensor_record import SensorRecord
+
+FLUSH_INTERVAL = 2.0   # detik
+FSYNC_INTERVAL = 30.0  # detik; None = tidak pernah fsync
+
+
+PENDING_PREFIX = "pending-"
+
+
+def _csv_value(value):
+    return "" if value is None else str(value)
+
+def _row_day(row):
+    """Tanggal (YYYY-MM-DD) dari kolom datetime record/baris log."""
+    value = row.get("datetime") or row.get("timestamp")
+    return str(value)[:10] if value else None
+
+
+class DataLogger:
+    """
+    Logger CSV append-only: handle file tetap terbuka, baris terakhir disimpan di memori
+    untuk cek duplikat, flush/fsync dikumpulkan per interval. Saat dibuka, baris terakhir
+    dipulihkan dengan seek dari akhir file (tanpa membaca seluruh log).
+
+    Jika archive_dir diisi, file log hanya memuat satu hari: saat record hari berikutnya
+    datang, file lama dipindah dan dikompres ke LogArchive (partisi harian + index.json).
+    """
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, fsync_interval=FSYNC_INTERVAL, archive_dir=None):
+        self.path = path
+        self.archive_dir = archive_dir
+        self._archive = None
+        self._day = None
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._inode = None
+        self._writers = {}
+        self._last_row = None
+        self._has_header = False
+        self._pending = False
+        self._flush_next = True
+        self._last_flush = 0.0
+        self._last_fsync = 0.0
+
+    # === Buka / pulihkan ===
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._last_row = None
+        self._has_header = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        if self._has_header:
+            self._last_row = self._recover_last_row()
+        if self._last_row is not None:
+            self._day = _row_day(self._last_row) or self._day
+        if self.archive_dir:
+            self._archive_pending()
+
+        self._file = open(self.path, mode="a", newline="")
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._writers = {}
+        # Record pertama setelah buka langsung di-flush
+        self._flush_next = True
+
+    def _recover_last_row(self):
+        with open(self.path, newline="") as f:
+            header_line = f.readline()
+        last_line = read_last_log_line(self.path)
+        if not last_line or last_line.strip() == header_line.strip():
+            return None
+        rows = list(csv.DictReader(io.StringIO(header_line + last_line + "\n")))
+        return rows[-1] if rows else None
+
+    # === Partisi harian ===
+    def _get_archive(self):
+        if self._archive is None:
+            self._archive = LogArchive(self.archive_dir)
+        return self._archive
+
+    def _archive_pending(self):
+        # Partisi yang sudah dipindah tapi belum selesai dikompres (mis. app mati saat rotasi)
+        if not os.path.isdir(self.archive_dir):
+            return
+        for name in sorted(os.listdir(self.archive_dir)):
+            if name.startswith(PENDING_PREFIX) and name.endswith(".csv"):
+                self._compress(os.path.join(self.archive_dir, name))
+
+    def _compress(self, pending_path):
+        try:
+            rows = self._get_archive().add_log_file(pending_path)
+            print(f"[🗜️] Partisi log diarsipkan: {rows} baris → {self.archive_dir}")
+        except (OSError, ValueError) as e:
+            print(f"[⚠️] Gagal mengarsipkan partisi log {pending_path}: {e}")
+
+    def _rotate(self):
+        """Tutup partisi hari ini, pindahkan ke archive_dir, lalu kompres."""
+        if self._file is not None:
+            self._file.flush()
+            self._fsync()
+            self._pending = False
+            self._close_file()
+        if not os.path.exists(self.path):
+            return
+        os.makedirs(self.archive_dir, exist_ok=True)
+        pending = os.path.join(self.archive_dir, f"{PENDING_PREFIX}{self._day}.csv")
+        n = 1
+        while os.path.exists(pending):
+            pending = os.path.join(self.archive_dir, f"{PENDING_PREFIX}{self._day}.{n}.csv")
+            n += 1
+        os.replace(self.path, pending)
+        self._compress(pending)
+
+    def _ensure_open(self):
+        if self._file is None:
+            self._open()
+            return
+        # File dihapus/dirotasi dari luar → buka ulang di path yang sama
+        try:
+            moved = os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            self._close_file()
+            self._open()
+
+    # === Tulis ===
+    def append(self, data):
+        """Tulis satu record (dict atau SensorRecord). Return False jika identik dengan baris terakhir."""
+        with self._lock:
+            written = self._write_row(data)
+            if written:
+                self._flush_if_due(time.monotonic())
+        if written:
+            print("[✅] Data berhasil ditulis ke log.")
+        return written
+
+    def extend(self, records):
+        """Tulis banyak record (mis. satu halaman backfill) dengan satu lock & satu cek flush. Return jumlah baris."""
+        with self._lock:
+            written = sum(1 for data in records if self._write_row(data))
+            if written:
+                self._flush_if_due(time.monotonic())
+        return written
+
+    def _write_row(self, data):
+        # Dipanggil dengan _lock dipegang
+        if isinstance(data, SensorRecord):
+            data = data.to_dict()
+        self._ensure_open()
+        day = _row_day(data)
+        if self.archive_dir and day and self._day and day > self._day:
+            self._rotate()
+            self._ensure_open()
+
+        # Cek apakah data identik dengan baris terakhir
+        last_row = self._last_row
+        if last_row is not None and all(
+            _csv_value(last_row.get(k)) == _csv_value(v) for k, v in data.items()
+        ):
+            print("[⚠️] Data identik, tidak ditulis ulang.")
+            return False
+
+        fieldnames = tuple(data.keys())
+        writer = self._writers.get(fieldnames)
+        if writer is None:
+            writer = self._writers[fieldnames] = csv.DictWriter(self._file, fieldnames=fieldnames)
+        if not self._has_header:
+            writer.writeheader()
+            self._has_header = True
+
+        writer.writerow(data)
+        self._last_row = {k: _csv_value(v) for k, v in data.items()}
+        self._pending = True
+        self.rows_written += 1
+        if day and (self._day is None or day > self._day):
+            self._day = day
+        return True
+
+    def _flush_if_due(self, now):
+        if not self._pending:
+            return
+        if self._flush_next or now - self._last_flush >= self.flush_interval:
+            self._flush_locked(now, fsync=None)
+
+    def _flush_locked(self, now, fsync):
+        self._file.flush()
+        self._pending = False
+        self._flush_next = False
+        self._last_flush = now
+        if fsync is None:
+            fsync = self.fsync_interval is not None and now - self._last_fsync >= self.fsync_interval
+        if fsync:
+            self._fsync()
+            self._last_fsync = now
+
+    def _fsync(self):
+        try:
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            # mis. /dev/null atau filesystem yang tidak mendukung fsync
+            print(f"[⚠️] fsync log gagal: {e}")
+
+    def flush_if_due(self):
+        """Dipanggil berkala supaya baris tidak tertahan di buffer lebih lama dari flush_interval."""
+        with self._lock:
+            if self._file is not None:
+                self._flush_if_due(time.monotonic())
+
+    def flush(self, fsync=None):
+        """Flush buffer sekarang. fsync=None → fsync hanya jika fsync_interval sudah lewat."""
+        with self._lock:
+            if self._file is not None and (self._pending or fsync):
+                self._flush_locked(time.monotonic(), fsync)
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+        self._writers = {}
+
+    def close(self):
+        with self._lock:
+            if self._file is not None and self._pending:
+                self._file.flush()
+                self._fsync()
+            self._pending = False
+            self._close_file()
+
+
+_loggers = {}
+_loggers_lock = threading.Lock()
+
+
+def get_logger(path, archive_dir=None):
+    """Satu DataLogger per file log (dipakai bersama worker & pemanggil lain)."""
+    key = os.path.abspath(path)
+    with _loggers_lock:
+        logger = _loggers.get(key)
+        if logger is None:
+            logger = _loggers[key] = DataLogger(path, archive_dir=archive_dir)
+        elif archive_dir and not logger.archive_dir:
+            logger.archive_dir = archive_dir
+        return logger
+
+def flush_all_loggers(fsync=None):
+    """Tulis semua buffer log ke disk, mis. sebelum log dibaca converter."""
+    with _loggers_lock:
+        loggers = list(_loggers.values())
+    for logger in loggers:
+        logger.flush(fsync=fsync)
+
+def close_all_loggers():
+    with _loggers_lock:
+        loggers = list(_loggers.values())
+    for logger in loggers:
+        logger.close()
+
+atexit.register(close_all_loggers)
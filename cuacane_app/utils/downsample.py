@@ -0,0 +1,185 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+METHODS = ("lttb", "minmax")
+CACHE_SIZE = 32
+
+
+# === Algoritma (stateless) ===
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: index titik yang dipertahankan (termasuk titik
+    pertama & terakhir) supaya bentuk kurva tetap terlihat dengan n_out titik.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 0)], dtype=np.int64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 bucket di tengah
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        nlo, nhi = hi, edges[k + 2] if k + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        # Luas (×2) segitiga A – kandidat – rata-rata bucket berikutnya
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[k + 1] = a
+    return out
+
+def minmax_indices(y, n_buckets):
+    """Index min & max tiap bucket (urut waktu), maksimal 2 × n_buckets titik."""
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    y = np.asarray(y)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)[:-1]
+    idx = np.arange(n)
+    # argmin/argmax per bucket lewat reduceat pada nilai lalu cocokkan posisinya
+    mins = np.minimum.reduceat(y, edges)
+    maxs = np.maximum.reduceat(y, edges)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(np.r_[edges, n]))
+    is_min = y == mins[bucket]
+    is_max = y == maxs[bucket]
+    first_min = np.minimum.reduceat(np.where(is_min, idx, n), edges)
+    first_max = np.minimum.reduceat(np.where(is_max, idx, n), edges)
+    return np.unique(np.r_[first_min, first_max])
+
+
+# === Versi inkremental untuk HistorySeries ===
+class DownsampledSeries:
+    """
+    Hasil decimation N sampel terakhir sebuah HistorySeries ke lebar grafik (piksel).
+    Bucket ditambatkan ke nomor sampel (series.appended), bukan ke posisi di jendela,
+    sehingga bucket yang sudah final tidak berubah saat jendela bergeser: update() hanya
+    menghitung bucket di ekor (yang masih terbuka) dan membuang bucket yang keluar jendela.
+    """
+
+    def __init__(self, series, window, width, method="lttb"):
+        if method not in METHODS:
+            raise ValueError(f"Metode downsampling tidak dikenal: {method}")
+        self.series = series
+        self.window = window
+        self.width = max(int(width), 4)
+        self.method = method
+        n_points = self.width if method == "lttb" else self.width // 2
+        self.bucket = max(1, math.ceil(window / n_points)) if window else None
+        self._picks = OrderedDict()   # id bucket → tuple nomor sampel terpilih
+        self._final = set()
+        self._seen = -1
+        self._last_b = None
+
+    def _range(self):
+        # Nomor sampel [first, end) yang berada di jendela saat ini
+        end = self.series.appended
+        n = len(self.series)
+        if self.window:
+            n = min(n, self.window)
+        return end - n, end
+
+    def _bucket_size(self, n):
+        if self.bucket is not None:
+            return self.bucket
+        n_points = self.width if self.method == "lttb" else self.width // 2
+        return max(1, math.ceil(n / n_points))
+
+    def update(self):
+        """Sinkronkan dengan series; return True jika hasil berubah."""
+        series = self.series
+        if series.appended == self._seen:
+            return False
+        self._seen = series.appended
+        first, end = self._range()
+        if end == first:
+            self._picks.clear()
+            self._final.clear()
+            return True
+
+        b = self._bucket_size(end - first)
+        if b != self._last_b:
+            # Tanpa window tetap, ukuran bucket ikut bertambah → hitung ulang semuanya
+            self._picks.clear()
+            self._final.clear()
+            self._last_b = b
+
+        base = series.appended - len(series)  # nomor sampel di posisi 0 series
+        ts = series.timestamps()
+        values = series.values()
+        first_bucket, last_bucket = first // b, (end - 1) // b
+
+        for k in [k for k in self._picks if k < first_bucket]:
+            del self._picks[k]
+            self._final.discard(k)
+
+        for k in range(first_bucket, last_bucket + 1):
+            if k in self._final and k != first_bucket:
+                continue
+            lo, hi = max(k * b, first), min((k + 1) * b, end)
+            closed = (k + 1) * b <= end
+            if self.method == "minmax":
+                seg = values[lo - base:hi - base]
+                picks = sorted({lo + int(seg.argmin()), lo + int(seg.argmax())})
+                final = closed
+            elif k == first_bucket:
+                picks, final = ([first] if k != last_bucket else sorted({first, end - 1})), False
+            elif k == last_bucket:
+                picks, final = [end - 1], False
+            else:
+                prev = self._picks[k - 1][-1]
+                nlo, nhi = (k + 1) * b, min((k + 2) * b, end)
+                cx = ts[nlo - base:nhi - base].mean()
+                cy = values[nlo - base:nhi - base].astype(np.float64).mean()
+                ax, ay = float(ts[prev - base]), float(values[prev - base])
+                bx = ts[lo - base:hi - base].astype(np.float64)
+                by = values[lo - base:hi - base].astype(np.float64)
+                area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+                picks = [lo + int(area.argmax())]
+                # Final jika bucket berikutnya sudah penuh (rata-ratanya tidak berubah lagi)
+                final = (k + 2) * b <= end
+            self._picks[k] = tuple(picks)
+            self._picks.move_to_end(k)
+            if final:
+                self._final.add(k)
+        return True
+
+    def samples(self):
+        """Nomor sampel terpilih, urut waktu."""
+        first, _ = self._range()
+        return [s for k in sorted(self._picks) for s in self._picks[k] if s >= first]
+
+    def points(self):
+        """(nomor sampel, epoch, nilai) array untuk titik terpilih."""
+        samples = np.asarray(self.samples(), dtype=np.int64)
+        base = self.series.appended - len(self.series)
+        pos = samples - base
+        return samples, self.series.timestamps()[pos], self.series.values()[pos]
+
+
+class DownsampleCache:
+    """Cache DownsampledSeries per (series, window, width, method), LRU kecil."""
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+
+    def get(self, series, window, width, method="lttb"):
+        key = (id(series), int(window), int(width), method)
+        entry = self._entries.get(key)
+        if entry is None or entry.series is not series:
+            entry = self._entries[key] = DownsampledSeries(series, window, width, method)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        entry.update()
+        return entry
+
+    def clear(self):
+        self._entries.clear()
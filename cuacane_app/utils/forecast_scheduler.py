@@ -0,0 +1,80 @@
+import math
+import time
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer
+
+from cuacane_app.utils.multi_predictor import HORIZONS
+
+# Jarak minimum (detik) antar prediksi otomatis per horizon
+DEFAULT_CADENCE = {"15m": 300, "1h": 900, "3h": 1800, "6h": 3600}
+COALESCE_MS = 2000   # pembacaan beruntun dalam jendela ini → satu kali penjadwalan
+SIGNATURE_FIELDS = ("temp_air", "humidity", "pressure", "rain_duration", "rain_intensity",
+                    "wind_speed_avg", "wind_dir_avg")
+SIGNATURE_QUANTUM = 1e-3
+
+
+class ForecastScheduler(QObject):
+    """
+    Prediksi otomatis yang mengikuti jalur ingestion: setiap pembacaan angin baru memicu
+    timer single-shot (burst digabung jadi satu), lalu horizon yang sudah jatuh tempo
+    (sesuai cadence) diprediksi lewat prediction_model. Horizon dilewati jika input
+    (data terbaru + 4 sampel angin terakhir) tidak berubah sejak prediksi terakhirnya.
+    """
+
+    def __init__(self, station, cadence=None, coalesce_ms=COALESCE_MS, clock=time.time):
+        super().__init__(station)
+        self.station = station
+        self.cadence = dict(DEFAULT_CADENCE, **(cadence or {}))
+        self.clock = clock
+        self._last_run = {}
+        self._last_signature = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(coalesce_ms)
+        self._timer.timeout.connect(self.run_due)
+        station.historyAppended.connect(self._on_history)
+
+    def _on_history(self, key):
+        if key == "wind_speed_avg" and not self._timer.isActive():
+            self._timer.start()
+
+    def _buffer_ready(self):
+        history = self.station._history_dict
+        return len(history["wind_speed_avg"]) >= 4 and len(history["wind_dir_avg"]) >= 4
+
+    def signature(self):
+        """Kunci input terkuantisasi: sama → prediksi akan sama, tidak perlu diulang."""
+        data = self.station.latest_data
+        history = self.station._history_dict
+        values = [data.get(k, 0.0) for k in SIGNATURE_FIELDS]
+        values += [v for _, v in history["wind_speed_avg"][-4:]]
+        values += [v for _, v in history["wind_dir_avg"][-4:]]
+        return tuple(np.round(np.asarray(values, dtype=np.float64) / SIGNATURE_QUANTUM).tolist())
+
+    def due_horizons(self, now=None):
+        now = self.clock() if now is None else now
+        return [h for h in HORIZONS if now - self._last_run.get(h, -math.inf) >= self.cadence[h]]
+
+    def run_due(self):
+        """Prediksi horizon yang jatuh tempo & inputnya berubah; return daftar horizon yang dijalankan."""
+        if not self._buffer_ready():
+            return []
+        now = self.clock()
+        due = self.due_horizons(now)
+        if not due:
+            return []
+        signature = self.signature()
+        changed = [h for h in due if self._last_signature.get(h) != signature]
+        for h in due:
+            # Yang tidak berubah dicek lagi pada cadence berikutnya
+            self._last_run[h] = now
+        if not changed:
+            return []
+        for h in changed:
+            self._last_signature[h] = signature
+        self.station.prediction_model.predict_horizons(changed, source="auto")
+        return changed
+
+    def stop(self):
+        self._timer.stop()
@@ -0,0 +1,194 @@
+import csv
+import heapq
+import io
+import math
+import os
+import threading
+from collections import deque
+
+import numpy as np
+
+from cuacane_app.utils.sensor_record import format_epoch
+
+FIELDS = ["issued", "valid", "issued_ts", "valid_ts", "horizon", "speed", "dir", "source"]
+TAIL_BYTES = 256 * 1024   # cukup untuk forecast yang belum jatuh tempo (≤ 6 jam terakhir)
+
+PENDING_LIMIT = 2000      # forecast yang menunggu verifikasi (memori terbatas)
+ROLLING_WINDOW = 200      # verifikasi terakhir per horizon untuk MAE/RMSE
+MATCH_TOLERANCE = 60      # detik: observasi terdekat harus dalam ±60 s dari valid time
+
+
+def _parse_row(row):
+    return dict(row, issued_ts=int(row["issued_ts"]), valid_ts=int(row["valid_ts"]),
+                speed=float(row["speed"]), dir=float(row["dir"]))
+
+
+class ForecastStore:
+    """
+    Log CSV append-only semua prediksi yang dipublikasikan: waktu terbit (issued) dan
+    waktu berlaku (valid = issued + horizon), nilai, dan sumbernya (manual/auto).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, horizon, forecast, source="manual"):
+        self.extend([(horizon, forecast)], source=source)
+
+    def extend(self, items, source="manual"):
+        """items: iterable (horizon, Forecast) dengan atribut speed/direction/issued/valid."""
+        rows = [
+            {
+                "issued": format_epoch(f.issued), "valid": format_epoch(f.valid),
+                "issued_ts": int(f.issued), "valid_ts": int(f.valid), "horizon": h,
+                "speed": round(float(f.speed), 3), "dir": round(float(f.direction), 1), "source": source,
+            }
+            for h, f in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, mode="a", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(rows)
+
+    def read(self):
+        """Semua baris (dict; *_ts int, speed/dir float) urut seperti ditulis."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, newline="") as f:
+            return [_parse_row(row) for row in csv.DictReader(f)]
+
+    def tail(self, max_bytes=TAIL_BYTES):
+        """Baris-baris terakhir (≤ max_bytes dari akhir file) tanpa membaca seluruh log."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - max_bytes))
+            chunk = f.read().decode("utf-8", errors="replace")
+        lines = chunk.splitlines()
+        # Baris pertama bisa terpotong (atau header jika dari awal file)
+        lines = lines[1:]
+        return [_parse_row(row) for row in csv.DictReader(io.StringIO("\n".join(lines)), fieldnames=FIELDS)]
+
+
+# === Verifikasi terhadap observasi ===
+def _nearest(series, t, tolerance):
+    """Nilai sampel series terdekat ke epoch t (±tolerance), atau None."""
+    ts = series.timestamps()
+    if not len(ts):
+        return None
+    i = int(np.searchsorted(ts, t))
+    best = None
+    for j in (i - 1, i):
+        if 0 <= j < len(ts) and abs(int(ts[j]) - t) <= tolerance:
+            if best is None or abs(int(ts[j]) - t) < abs(int(ts[best]) - t):
+                best = j
+    return None if best is None else float(series.values()[best])
+
+
+class RollingError:
+    """MAE/RMSE kecepatan, error arah & RMSE vektor atas N verifikasi terakhir (O(1) per update)."""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self._items = deque()
+        self._sums = [0.0, 0.0, 0.0, 0.0]   # |e|, e², |Δarah|, |Δvektor|²
+
+    def add(self, speed_err, dir_err, vec_err):
+        speed_err, dir_err, vec_err = float(speed_err), float(dir_err), float(vec_err)
+        item = (abs(speed_err), speed_err * speed_err, abs(dir_err), vec_err * vec_err)
+        self._items.append(item)
+        for k, v in enumerate(item):
+            self._sums[k] += v
+        if len(self._items) > self.window:
+            for k, v in enumerate(self._items.popleft()):
+                self._sums[k] -= v
+
+    def __len__(self):
+        return len(self._items)
+
+    def summary(self):
+        n = len(self._items)
+        if not n:
+            return {"n": 0, "mae": math.nan, "rmse": math.nan, "dirError": math.nan, "vectorRmse": math.nan}
+        abs_e, sq_e, abs_dir, sq_vec = (max(v, 0.0) for v in self._sums)
+        return {
+            "n": n,
+            "mae": abs_e / n,
+            "rmse": math.sqrt(sq_e / n),
+            "dirError": abs_dir / n,
+            "vectorRmse": math.sqrt(sq_vec / n),
+        }
+
+
+def wind_errors(pred_speed, pred_dir, obs_speed, obs_dir):
+    """
+    (error kecepatan, selisih arah melingkar [-180, 180), |selisih vektor angin|).
+    Berlaku untuk skalar maupun array NumPy (backtest).
+    """
+    dir_err = (pred_dir - obs_dir + 180.0) % 360.0 - 180.0
+    pr, ob = np.radians(pred_dir), np.radians(obs_dir)
+    du = pred_speed * np.sin(pr) - obs_speed * np.sin(ob)
+    dv = pred_speed * np.cos(pr) - obs_speed * np.cos(ob)
+    return pred_speed - obs_speed, dir_err, np.hypot(du, dv)
+
+
+class ForecastVerifier:
+    """
+    Antrian forecast (heap urut valid time, maks `limit`) yang dicocokkan dengan observasi
+    history terdekat begitu valid time-nya terlewati; statistik error per horizon bergulir.
+    """
+
+    def __init__(self, horizons, window=ROLLING_WINDOW, tolerance=MATCH_TOLERANCE, limit=PENDING_LIMIT):
+        self.tolerance = tolerance
+        self.limit = limit
+        self.stats = {h: RollingError(window) for h in horizons}
+        self.missed = {h: 0 for h in horizons}
+        self._pending = []
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, horizon, valid_ts, speed, direction):
+        self._seq += 1
+        heapq.heappush(self._pending, (valid_ts, self._seq, horizon, float(speed), float(direction)))
+        if len(self._pending) > self.limit:
+            # Buang yang paling lama (valid time paling awal)
+            _, _, h, _, _ = heapq.heappop(self._pending)
+            self.missed[h] = self.missed.get(h, 0) + 1
+
+    def load(self, rows, since):
+        """Pulihkan forecast dari log (ForecastStore.tail) yang valid time-nya ≥ since."""
+        for row in rows:
+            if row["valid_ts"] >= since and row["horizon"] in self.stats:
+                self.add(row["horizon"], row["valid_ts"], row["speed"], row["dir"])
+
+    def verify(self, speed_series, dir_series):
+        """Cocokkan forecast yang sudah jatuh tempo; return set horizon yang statistiknya berubah."""
+        if not len(speed_series):
+            return set()
+        latest = int(speed_series.timestamps()[-1])
+        changed = set()
+        while self._pending and self._pending[0][0] <= latest:
+            valid, _, h, speed, direction = heapq.heappop(self._pending)
+            obs_speed = _nearest(speed_series, valid, self.tolerance)
+            obs_dir = _nearest(dir_series, valid, self.tolerance)
+            if obs_speed is None or obs_dir is None:
+                # Data kosong di sekitar valid time (atau sudah keluar dari history)
+                self.missed[h] = self.missed.get(h, 0) + 1
+                continue
+            self.stats[h].add(*wind_errors(speed, direction, obs_speed, obs_dir))
+            changed.add(h)
+        return changed
+
+    def summary(self):
+        return [dict(self.stats[h].summary(), horizon=h, missed=self.missed[h]) for h in self.stats]
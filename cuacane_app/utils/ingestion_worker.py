@@ -0,0 +1,248 @@
+import queue
+import random
+import threading
+from datetime import datetime
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from cuacane_app.utils.line_parser import parse_0R0_record
+from cuacane_app.utils.backfill import find_gap, iter_backfill_batches, parse_log_timestamp
+from cuacane_app.utils.sensor_record import records_from_columns
+
+
+class IngestionWorker(QThread):
+    """
+    Thread ingestion: membaca SensorSource (cloud/TCP/serial), parsing 0R0, dan logging
+    berjalan di luar GUI thread. Record yang sudah jadi dikirim ke GUI lewat queue
+    terbatas + sinyal (queued connection). Backfill tidak lewat queue itu: tiap halaman
+    ditulis sekaligus (log_batch) dan dikirim utuh ke GUI lewat batchReady.
+    """
+    recordsReady = pyqtSignal()
+    connectionStateChanged = pyqtSignal(bool)
+    # Kolom NumPy satu halaman backfill (sudah di-log) → history di GUI thread
+    batchReady = pyqtSignal(object)
+
+    def __init__(self, source, log_record=None, interval=None, max_queue=256,
+                 backoff_base=1.0, backoff_max=60.0, jitter=0.1, same_data_timeout=180.0,
+                 read_timeout=1.0, last_logged_ts=None, flush_log=None, log_batch=None, parent=None):
+        super().__init__(parent)
+        self._source = source
+        self._log_record = log_record
+        self._log_batch = log_batch
+        self._flush_log = flush_log
+        self._last_logged_ts = last_logged_ts
+        # Backfill dicek saat start dan setiap kali koneksi pulih
+        self._needs_backfill = source.supports_backfill
+        self._interval = source.poll_interval if interval is None else interval
+        self._read_timeout = read_timeout
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._jitter = jitter
+        self._same_data_timeout = same_data_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._notify_lock = threading.Lock()
+        self._notify_pending = False
+
+        self._failures = 0
+        self._connected = None
+        self._last_raw_line = None
+        self._last_raw_timestamp = datetime.min
+        self.dropped_records = 0
+
+    # === Kontrol dari GUI thread ===
+    def stop(self, timeout_ms=3000):
+        self._stop_event.set()
+        self._wake_event.set()
+        self.wait(timeout_ms)
+
+    def wake(self):
+        """Paksa polling berikutnya segera dilakukan (reset backoff)."""
+        self._failures = 0
+        self._wake_event.set()
+
+    def drain(self):
+        """Ambil semua record yang menunggu. Dipanggil dari GUI thread, tidak pernah blocking."""
+        with self._notify_lock:
+            self._notify_pending = False
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    # === Loop utama worker ===
+    def run(self):
+        print(f"[🧵] Ingestion worker dimulai (sumber: {self._source.name}).")
+        while not self._stop_event.is_set():
+            delay = self.poll_once()
+            if delay > 0:
+                self._wake_event.wait(delay)
+                self._wake_event.clear()
+        self._source.close()
+        self._flush()
+        print("[🧵] Ingestion worker berhenti.")
+
+    def poll_once(self):
+        """Satu siklus baca. Mengembalikan jeda (detik) sebelum siklus berikutnya."""
+        try:
+            raw_lines = self._source.read(self._read_timeout)
+        except Exception as e:
+            print(f"[⛔] Gagal ambil data dari sumber {self._source.name}: {e}")
+            raw_lines = None
+
+        if raw_lines is None:
+            self._flush()
+            self._failures += 1
+            self._set_connected(False)
+            self._needs_backfill = self._source.supports_backfill
+            delay = self.backoff_delay()
+            print(f"[⏳] Retry dalam {delay:.1f} detik (gagal {self._failures}x).")
+            return delay
+
+        self._failures = 0
+        self._set_connected(True)
+
+        if self._needs_backfill:
+            self.run_backfill()
+
+        if not raw_lines and self._interval > 0:
+            print(f"[⛔] Tidak ada data diterima dari {self._source.name}.")
+        for item in raw_lines:
+            self._handle_raw_line(item)
+        # Satu flush per siklus baca (backfill/stream bisa membawa banyak record sekaligus)
+        self._flush()
+
+        if self._interval <= 0:
+            return 0.0
+        return self._interval * random.uniform(1.0 - self._jitter, 1.0 + self._jitter)
+
+    def backoff_delay(self):
+        """Exponential backoff dengan jitter (setengah delay acak) supaya retry tidak serempak."""
+        delay = min(self._backoff_max, self._backoff_base * (2 ** (self._failures - 1)))
+        return random.uniform(delay / 2.0, delay)
+
+    def run_backfill(self, now=None):
+        """Isi data yang hilang sejak timestamp terakhir di log (setelah app/jaringan mati)."""
+        self._needs_backfill = False
+        gap = find_gap(self._last_logged_ts, now=now)
+        if gap is None:
+            return 0
+
+        start, end = gap
+        print(f"[🔁] Backfill data yang hilang: {start} → {end}")
+        added = 0
+        held = last_raw = None
+        try:
+            # Halaman di-stream: parse + tulis per halaman, tanpa menampung seluruh gap
+            for columns, last_raw in iter_backfill_batches(self._source.fetch_range(start, end),
+                                                           last_ts=self._last_logged_ts):
+                self._log_columns(columns)
+                self._last_logged_ts = datetime.fromtimestamp(int(columns["epoch"][-1]))
+                added += len(columns["epoch"])
+                # Halaman ditahan satu langkah: baris terakhir keseluruhan lewat queue live
+                if held is not None:
+                    self.batchReady.emit(held)
+                held = columns
+        except Exception as e:
+            # Halaman yang sudah tertulis tetap dipakai; retry mulai dari _last_logged_ts
+            print(f"[⛔] Backfill gagal, dicoba lagi nanti: {e}")
+            self._needs_backfill = True
+
+        if held is not None:
+            if len(held["epoch"]) > 1:
+                self.batchReady.emit({name: col[:-1] for name, col in held.items()})
+            latest = records_from_columns({name: col[-1:] for name, col in held.items()})[0]
+            self._enqueue((latest, self._last_logged_ts))
+            # Polling berikutnya yang membawa raw yang sama dianggap "data masih sama"
+            self._last_raw_line = last_raw
+            self._last_raw_timestamp = datetime.now()
+        print(f"[🔁] Backfill selesai: {added} record ditambahkan.")
+        return added
+
+    def _handle_raw_line(self, item):
+        # Item bisa berupa raw line saja, atau (timestamp, raw) dari sumber yang membawa waktu sendiri
+        timestamp = None
+        if isinstance(item, tuple):
+            timestamp, raw_line = item
+        else:
+            raw_line = item
+        now = parse_log_timestamp(timestamp) if timestamp else None
+        now = now or datetime.now()
+
+        # ⏱️ Jika data sama (polling cloud), cek apakah sudah lewat 3 menit
+        if self._source.dedupe_repeats and raw_line == self._last_raw_line:
+            elapsed = (now - self._last_raw_timestamp).total_seconds()
+            if elapsed < self._same_data_timeout:
+                print(f"[🟡] Data masih sama, dilewati. Baru {int(elapsed)} detik.")
+                return
+            print("[⏱️] Data masih sama, tapi sudah 3 menit → tetap dicatat.")
+
+        self._last_raw_line = raw_line
+        self._last_raw_timestamp = now
+
+        record = parse_0R0_record(raw_line, ts=now.timestamp())
+        print(f"[🌐] Data dari {self._source.name}: {record}")
+        if record is None:
+            return
+
+        self._log(record)
+        self._last_logged_ts = now
+        self._enqueue((record, now))
+
+    def _log(self, record):
+        if self._log_record is None:
+            return
+        try:
+            self._log_record(record)
+        except Exception as e:
+            print(f"[❌] Gagal menulis log: {e}")
+
+    def _log_columns(self, columns):
+        if self._log_batch is None:
+            for record in records_from_columns(columns):
+                self._log(record)
+            return
+        try:
+            self._log_batch(columns)
+        except Exception as e:
+            print(f"[❌] Gagal menulis log backfill: {e}")
+
+    def _flush(self):
+        if self._flush_log is None:
+            return
+        try:
+            self._flush_log()
+        except Exception as e:
+            print(f"[❌] Gagal flush log: {e}")
+
+    def _enqueue(self, item):
+        # Queue penuh → buang record tertua, GUI cukup melihat data terbaru
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped_records += 1
+                except queue.Empty:
+                    pass
+
+        with self._notify_lock:
+            if self._notify_pending:
+                return
+            self._notify_pending = True
+        self.recordsReady.emit()
+
+    def _set_connected(self, connected):
+        if connected != self._connected:
+            self._connected = connected
+            self.connectionStateChanged.emit(connected)
+
+    @property
+    def is_connected(self):
+        return bool(self._connected)
@@ -1,61 +1,214 @@
+import time
 from datetime import datetime
 
-def parse_0R0_line(payload: str) -> dict:
+import numpy as np
+
+from cuacane_app.utils.sensor_record import FIELDS, NUMERIC_FIELDS, FIELD_INDEX, SensorRecord
+
+# Kode 0R0 → (field, konverter, skala). Skala None = nilai dipakai apa adanya.
+KEY_TABLE = {
+    "Dn": ("wind_dir_min", int, None),
+    "Dm": ("wind_dir_avg", int, None),
+    "Dx": ("wind_dir_max", int, None),
+    "Sn": ("wind_speed_min", float, None),
+    "Sm": ("wind_speed_avg", float, None),
+    "Sx": ("wind_speed_max", float, None),
+    "Ta": ("temp_air", float, None),
+    "Tp": ("temp_probe", float, None),
+    "Ua": ("humidity", float, None),
+    "Pa": ("pressure", float, 1000),  # bar to Pa
+    "Rc": ("rain_accum", float, None),
+    "Rd": ("rain_duration", float, None),
+    "Ri": ("rain_intensity", float, None),
+    "Th": ("heating_temp", float, None),
+    "Vs": ("voltage_supply", float, None),
+}
+
+_EMPTY_RECORD = dict.fromkeys(FIELDS)
+
+# Cache "Key=nilai" → (field/kolom, nilai terkonversi). Data sensor sangat berulang,
+# jadi sebagian besar bagian line cukup satu lookup dict. Dikosongkan bila penuh.
+PART_CACHE_SIZE = 65536
+_UNIT_CHARS = "#CPBMNsVD"
+_UNIT_SET = frozenset(_UNIT_CHARS + ",")
+_SKIP = object()
+_part_cache = {}
+_column_cache = {}
+
+_now_cache = (None, "")
+_epoch_cache = {}
+
+
+def _now_str():
+    """Waktu sekarang "%Y-%m-%d %H:%M:%S", diformat sekali per detik."""
+    global _now_cache
+    sec = int(time.time())
+    cached_sec, cached_str = _now_cache
+    if sec != cached_sec:
+        cached_str = datetime.fromtimestamp(sec).strftime("%Y-%m-%d %H:%M:%S")
+        _now_cache = (sec, cached_str)
+    return cached_str
+
+def timestamp_to_epoch(ts):
+    """"%Y-%m-%d %H:%M:%S" (waktu lokal) → epoch detik. Prefix menit di-cache untuk batch."""
+    minute = ts[:16]
+    base = _epoch_cache.get(minute)
+    if base is None:
+        if len(_epoch_cache) > 4096:
+            _epoch_cache.clear()
+        base = int(datetime.strptime(minute, "%Y-%m-%d %H:%M").timestamp())
+        _epoch_cache[minute] = base
+    return base + (int(ts[17:19]) if len(ts) >= 19 else 0)
+
+
+class _MalformedPart(ValueError):
+    pass
+
+class _InvalidValue(ValueError):
+    def __init__(self, key, value):
+        super().__init__(key, value)
+        self.key = key
+        self.value = value
+
+
+def _convert_part(part):
+    """
+    Konversi satu bagian "Key=nilai" (jalur lambat, semantik sama dengan parser lama).
+    Return (field, nilai) atau _SKIP untuk bagian yang diabaikan.
+    """
+    eq = part.find('=')
+    if eq < 0:
+        return _SKIP
+    if part.find('=', eq + 1) >= 0:
+        raise _MalformedPart("too many values to unpack (expected 2)")
+
+    key = part[:eq].strip()
+    entry = KEY_TABLE.get(key)
+    if entry is None:
+        return _SKIP
+
+    field, conv, scale = entry
+    value = part[eq + 1:].strip().rstrip(_UNIT_CHARS)
+    if not _UNIT_SET.isdisjoint(value):
+        # penanda satuan di tengah nilai: buang semuanya seperti parser lama
+        value = value.replace('#', '').replace('C', '').replace('P', '').replace('B', '') \
+                     .replace('M', '').replace('N', '').replace('s', '').replace('V', '') \
+                     .replace('D', '').replace(',', '.')
+    try:
+        number = conv(value)
+    except ValueError:
+        raise _InvalidValue(key, value)
+    return field, number * scale if scale else number
+
+def _remember(cache, part, item):
+    if len(cache) >= PART_CACHE_SIZE:
+        cache.clear()
+    cache[part] = item
+
+def parse_0R0_line(payload: str, timestamp: str = None) -> dict:
     try:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        data_parts = payload.strip().split(',')
-
-        data_dict = {
-            "datetime": now,
-            "wind_dir_avg": None,
-            "wind_dir_min": None,
-            "wind_dir_max": None,
-            "wind_speed_avg": None,
-            "wind_speed_min": None,
-            "wind_speed_max": None,
-            "temp_air": None,
-            "temp_probe": None,
-            "humidity": None,
-            "pressure": None,
-            "rain_accum": None,
-            "rain_duration": None,
-            "rain_intensity": None,
-            "heating_temp": None,
-            "voltage_supply": None,
-        }
-
-        for part in data_parts:
-            if '=' in part:
-                key, raw_value = part.split('=')
-                key = key.strip()
-                raw_value = raw_value.strip()
-                value = raw_value.replace('#', '') \
-                                 .replace('C', '').replace('P', '').replace('B', '') \
-                                 .replace('M', '').replace('N', '').replace('s', '') \
-                                 .replace('V', '').replace('D', '').replace(',', '.')
+        # timestamp dari sumber (mis. backfill cloud); default waktu penerimaan
+        now = timestamp or _now_str()
 
+        data_dict = dict(_EMPTY_RECORD)
+        data_dict["datetime"] = now
+
+        cache = _part_cache
+        for part in payload.strip().split(','):
+            hit = cache.get(part)
+            if hit is None:
                 try:
-                    match key:
-                        case 'Dn': data_dict['wind_dir_min'] = int(value)
-                        case 'Dm': data_dict['wind_dir_avg'] = int(value)
-                        case 'Dx': data_dict['wind_dir_max'] = int(value)
-                        case 'Sn': data_dict['wind_speed_min'] = float(value)
-                        case 'Sm': data_dict['wind_speed_avg'] = float(value)
-                        case 'Sx': data_dict['wind_speed_max'] = float(value)
-                        case 'Ta': data_dict['temp_air'] = float(value)
-                        case 'Tp': data_dict['temp_probe'] = float(value)
-                        case 'Ua': data_dict['humidity'] = float(value)
-                        case 'Pa': data_dict['pressure'] = float(value) * 1000  # bar to Pa
-                        case 'Rc': data_dict['rain_accum'] = float(value)
-                        case 'Rd': data_dict['rain_duration'] = float(value)
-                        case 'Ri': data_dict['rain_intensity'] = float(value)
-                        case 'Th': data_dict['heating_temp'] = float(value)
-                        case 'Vs': data_dict['voltage_supply'] = float(value)
-                except ValueError:
-                    print(f"[⚠️] Invalid number format for key {key}: {value}")
+                    hit = _convert_part(part)
+                except _InvalidValue as e:
+                    print(f"[⚠️] Invalid number format for key {e.key}: {e.value}")
+                    continue
+                _remember(cache, part, hit)
+            if hit is not _SKIP:
+                data_dict[hit[0]] = hit[1]
 
         return data_dict
     except Exception as e:
         print(f"[ERROR] Failed to parse line: {e}")
         return {}
+
+def parse_0R0_record(payload: str, ts: float = None):
+    """
+    Parse line 0R0 langsung ke SensorRecord (epoch ts, default waktu sekarang).
+    Semantik sama dengan parse_0R0_line; line rusak → None (parse_0R0_line → {}).
+    """
+    record = SensorRecord(time.time() if ts is None else ts)
+    values = record._values
+    cache = _column_cache
+    try:
+        for part in payload.strip().split(','):
+            hit = cache.get(part)
+            if hit is None:
+                try:
+                    hit = _convert_part(part)
+                except _InvalidValue as e:
+                    print(f"[⚠️] Invalid number format for key {e.key}: {e.value}")
+                    continue
+                if hit is not _SKIP:
+                    hit = (FIELD_INDEX[hit[0]], hit[1])
+                _remember(cache, part, hit)
+            if hit is not _SKIP:
+                values[hit[0]] = hit[1]
+        return record
+    except Exception as e:
+        print(f"[ERROR] Failed to parse line: {e}")
+        return None
+
+def parse_many(lines, timestamps=None):
+    """
+    Parse banyak line 0R0 sekaligus ke array kolom NumPy (NaN = field kosong/invalid).
+    Output: satu array float64 per field numerik, "epoch" (int64, detik), "valid" (line
+    punya minimal satu field), dan "bad_values" (jumlah field gagal dikonversi per line).
+    Tidak ada print per line; penolakan dihitung lewat "valid"/"bad_values".
+    """
+    n = len(lines)
+    nan = float("nan")
+    columns = [[nan] * n for _ in NUMERIC_FIELDS]
+    valid = [False] * n
+    bad_values = [0] * n
+    cache = _column_cache
+
+    for i, payload in enumerate(lines):
+        try:
+            parts = payload.strip().split(',')
+        except AttributeError:
+            continue
+        row_ok = False
+        row_bad = 0
+        try:
+            for part in parts:
+                hit = cache.get(part)
+                if hit is None:
+                    try:
+                        hit = _convert_part(part)
+                    except _InvalidValue:
+                        row_bad += 1
+                        continue
+                    if hit is not _SKIP:
+                        hit = (FIELD_INDEX[hit[0]], hit[1])
+                    _remember(cache, part, hit)
+                if hit is not _SKIP:
+                    columns[hit[0]][i] = hit[1]
+                    row_ok = True
+        except _MalformedPart:
+            # Sama seperti parse_0R0_line: line dengan "a=b=c" ditolak seluruhnya
+            for col in columns:
+                col[i] = nan
+            row_ok = False
+            row_bad = 1
+        valid[i] = row_ok
+        bad_values[i] = row_bad
+
+    out = {name: np.array(col, dtype=np.float64) for name, col in zip(NUMERIC_FIELDS, columns)}
+    if timestamps is None:
+        epoch = np.full(n, int(time.time()), dtype=np.int64)
+    else:
+        epoch = np.fromiter((timestamp_to_epoch(ts) for ts in timestamps), dtype=np.int64, count=n)
+    out["epoch"] = epoch
+    out["valid"] = np.array(valid, dtype=bool)
+    out["bad_values"] = np.array(bad_values, dtype=np.int32)
+    return out
@@ -0,0 +1,170 @@
+import bisect
+import csv
+import io
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+
+from cuacane_app.utils.backfill import parse_log_timestamp
+from cuacane_app.utils.sensor_record import FIELDS
+
+INDEX_FILE = "index.json"
+CHUNK_ROWS = 2048
+
+
+def _gzip_member(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = format gzip
+    return compressor.compress(data) + compressor.flush()
+
+
+class LogArchive:
+    """
+    Arsip dingin partisi harian realtime_log.csv. Tiap partisi = satu file .csv.gz berisi
+    beberapa gzip member (chunk) yang bisa didekompres sendiri-sendiri; index.json memetakan
+    waktu → (partisi, offset chunk) sehingga rentang waktu bisa dibaca tanpa membuka semua file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = {"partitions": []}
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+
+    @property
+    def partitions(self):
+        return self._index["partitions"]
+
+    def _write_index(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = os.path.join(self.path, INDEX_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, os.path.join(self.path, INDEX_FILE))
+
+    def last_timestamp(self):
+        if not self.partitions:
+            return None
+        return datetime.fromtimestamp(self.partitions[-1]["chunks"][-1]["end"])
+
+    # === Tulis ===
+    def add_log_file(self, csv_path, chunk_rows=CHUNK_ROWS):
+        """
+        Kompres file log (satu atau beberapa hari) menjadi partisi harian, lalu hapus file aslinya.
+        Baris dikelompokkan per tanggal; partisi yang sudah ada untuk tanggal itu ditambah chunk baru.
+        """
+        with open(csv_path, newline="") as f:
+            header_line = f.readline()
+            header = next(csv.reader([header_line]), [])
+            days = {}
+            for line in f:
+                if not line.strip():
+                    continue
+                ts = parse_log_timestamp(line.split(",", 1)[0])
+                if ts is None:
+                    continue
+                days.setdefault(ts.strftime("%Y-%m-%d"), []).append((ts.timestamp(), line))
+
+        with self._lock:
+            for day in sorted(days):
+                rows = sorted(days[day], key=lambda r: r[0])
+                self._append_partition(day, header, rows, chunk_rows)
+            self._write_index()
+        os.remove(csv_path)
+        return sum(len(rows) for rows in days.values())
+
+    def _append_partition(self, day, header, rows, chunk_rows):
+        entry = next((p for p in self.partitions if p["date"] == day), None)
+        if entry is None:
+            entry = {"date": day, "file": f"{day}.csv.gz", "header": header, "chunks": []}
+            self.partitions.append(entry)
+            self.partitions.sort(key=lambda p: p["date"])
+
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, entry["file"])
+        with open(path, "ab") as f:
+            offset = f.tell()
+            for i in range(0, len(rows), chunk_rows):
+                chunk = rows[i:i + chunk_rows]
+                member = _gzip_member("".join(line for _, line in chunk).encode("utf-8"))
+                f.write(member)
+                entry["chunks"].append({
+                    "offset": offset, "length": len(member), "rows": len(chunk),
+                    "start": chunk[0][0], "end": chunk[-1][0], "header": header,
+                })
+                offset += len(member)
+        entry["chunks"].sort(key=lambda c: c["start"])
+
+    # === Baca ===
+    def chunks_for_range(self, start=None, end=None):
+        """(partisi, chunk) yang beririsan dengan [start, end) — epoch detik, None = tak terbatas."""
+        out = []
+        for entry in self.partitions:
+            chunks = entry["chunks"]
+            if not chunks:
+                continue
+            if end is not None and chunks[0]["start"] >= end:
+                continue
+            if start is not None and max(c["end"] for c in chunks) < start:
+                continue
+            starts = [c["start"] for c in chunks]
+            hi = len(chunks) if end is None else bisect.bisect_left(starts, end)
+            for chunk in chunks[:hi]:
+                if start is None or chunk["end"] >= start:
+                    out.append((entry, chunk))
+        return out
+
+    def read_chunk(self, entry, chunk):
+        with open(os.path.join(self.path, entry["file"]), "rb") as f:
+            f.seek(chunk["offset"])
+            data = f.read(chunk["length"])
+        return zlib.decompress(data, 31).decode("utf-8")
+
+    def iter_rows(self, start=None, end=None):
+        """(datetime, record) untuk [start, end) — hanya chunk yang beririsan yang didekompres."""
+        for entry, chunk in self.chunks_for_range(start, end):
+            reader = csv.reader(io.StringIO(self.read_chunk(entry, chunk)))
+            yield from iter_csv_records(reader, chunk["header"], start, end)
+
+
+def iter_csv_records(reader, header, start=None, end=None):
+    """
+    Baris CSV log → (datetime, record), opsional disaring ke [start, end) (epoch detik).
+    Toleran terhadap header lama yang jumlah kolomnya tidak sama dengan baris data.
+    """
+    for row in reader:
+        if not row:
+            continue
+        if len(row) == len(FIELDS):
+            names = FIELDS
+        elif len(row) == len(header):
+            names = header
+        else:
+            continue
+        record = dict(zip(names, row))
+        ts = parse_log_timestamp(record.get("datetime") or record.get("timestamp"))
+        if ts is None:
+            continue
+        if start is not None or end is not None:
+            epoch = ts.timestamp()
+            if (start is not None and epoch < start) or (end is not None and epoch >= end):
+                continue
+        record["datetime"] = ts.strftime("%Y-%m-%d %H:%M:%S")
+        yield ts, record
+
+
+def iter_log_range(log_path, archive_path=None, start=None, end=None):
+    """(datetime, record) untuk [start, end): arsip dingin dulu, lalu partisi aktif (realtime_log.csv)."""
+    if archive_path and os.path.exists(os.path.join(archive_path, INDEX_FILE)):
+        yield from LogArchive(archive_path).iter_rows(start, end)
+    if not os.path.exists(log_path):
+        return
+    with open(log_path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is not None:
+            yield from iter_csv_records(reader, header, start, end)
@@ -1,15 +1,21 @@
-import torch
 import joblib
 import os
 import sys
-import torch.nn as nn
 import numpy as np
 import math
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
+from cuacane_app.utils.sensor_record import format_epoch
+from cuacane_app.utils.numpy_engine import NumpyMLP
 
 # === Fungsi builder sesuai struktur masing-masing model ===
+# torch hanya diimpor di sini (training/ekspor atau fallback .pth); runtime memakai .npz
 def make_model_15m(input_size, output_size):
+    from torch import nn
     layers = []
     hidden_size = 256
     num_layers = 2
@@ -22,6 +28,7 @@ def make_model_15m(input_size, output_size):
     return nn.Sequential(*layers)
 
 def make_model_bn(input_size, output_size, hidden_size, num_layers, dropout, activation_name='ReLU'):
+    from torch import nn
     activation = {
         'ReLU': nn.ReLU(),
         'LeakyReLU': nn.LeakyReLU(),
@@ -39,6 +46,7 @@ def make_model_bn(input_size, output_size, hidden_size, num_layers, dropout, act
     return nn.Sequential(*layers)
 
 def make_model_no_bn(input_size, output_size, hidden_size, num_layers, dropout, activation_name='ReLU'):
+    from torch import nn
     activation = {
         'ReLU': nn.ReLU(),
         'LeakyReLU': nn.LeakyReLU(),
@@ -105,81 +113,185 @@ def resource_path(relative_path):
     else:
         return Path(relative_path).resolve()
     
-def load_all_models():
-    model_dict = {}
-
-    configs = {
-        "15m": {
-            "path": "saved_models/model_15m",
-            "input_size": 11,
-            "builder": lambda inp, out: make_model_15m(inp, out)
-        },
-        "1h": {
-            "path": "saved_models/model_1h",
-            "input_size": 15,
-            "builder": lambda inp, out: make_model_bn(inp, out, hidden_size=512, num_layers=3, dropout=0.3567, activation_name='ReLU')
-        },
-        "3h": {
-            "path": "saved_models/model_3h",
-            "input_size": 17,
-            "builder": lambda inp, out: make_model_bn(inp, out, hidden_size=128, num_layers=3, dropout=0.3, activation_name='ReLU')
-        },
-        "6h": {
-            "path": "saved_models/model_6h",
-            "input_size": 17,
-            "builder": lambda inp, out: make_model_no_bn(inp, out, hidden_size=64, num_layers=3, dropout=0.2, activation_name='LeakyReLU')
-        }
+PREDICTION_CACHE_SIZE = 256
+FEATURE_QUANTUM = 1e-3       # fitur dibulatkan ke 0.001 untuk kunci cache
+CACHE_BUCKET_SECONDS = 60    # hasil cache berlaku dalam menit jam dinding yang sama
+PRED_HISTORY_LIMIT = 288     # pred_history per horizon di memori; arsip lengkap di ForecastStore
+
+# === Konfigurasi model per horizon (folder saved_models/model_<h>/) ===
+MODEL_CONFIGS = {
+    "15m": {
+        "input_size": 11,
+        "builder": lambda inp, out: make_model_15m(inp, out)
+    },
+    "1h": {
+        "input_size": 15,
+        "builder": lambda inp, out: make_model_bn(inp, out, hidden_size=512, num_layers=3, dropout=0.3567, activation_name='ReLU')
+    },
+    "3h": {
+        "input_size": 17,
+        "builder": lambda inp, out: make_model_bn(inp, out, hidden_size=128, num_layers=3, dropout=0.3, activation_name='ReLU')
+    },
+    "6h": {
+        "input_size": 17,
+        "builder": lambda inp, out: make_model_no_bn(inp, out, hidden_size=64, num_layers=3, dropout=0.2, activation_name='LeakyReLU')
     }
+}
+HORIZONS = tuple(MODEL_CONFIGS)
+
+
+def new_prediction_state():
+    """State prediksi kosong (per stasiun); bobot & scaler tidak termasuk."""
+    return {"pred_history": deque(maxlen=PRED_HISTORY_LIMIT), "chart": [], "buffer_speed": [], "buffer_dir": []}
+
+def load_torch_model(h, model_path=None):
+    """Bangun nn.Sequential horizon h dan muat bobot .pth (mode eval)."""
+    import torch
+
+    cfg = MODEL_CONFIGS[h]
+    model = cfg["builder"](cfg["input_size"], 3)
+    model_path = model_path or resource_path(f"saved_models/model_{h}/model_{h}.pth")
+    model.load_state_dict(torch.load(str(model_path), map_location="cpu"))
+    model.eval()
+    return model
+
+def load_model(h):
+    """Muat model (bundle NumPy .npz, fallback .pth via torch) dan scaler X/y satu horizon."""
+    npz_path = resource_path(f"saved_models/model_{h}/model_{h}.npz")
+    scaler_X_path = resource_path(f"saved_models/model_{h}/scaler_X_{h}.pkl")
+    scaler_y_path = resource_path(f"saved_models/model_{h}/scaler_y_{h}.pkl")
+
+    if os.path.exists(npz_path):
+        model = NumpyMLP.load(str(npz_path))
+    else:
+        print(f"[⚠️] {npz_path} belum ada, memakai torch (jalankan: python -m cuacane_app.utils.numpy_engine)")
+        model = load_torch_model(h)
 
-    for h, cfg in configs.items():
-        path = cfg["path"]
-        input_size = cfg["input_size"]
-        builder = cfg["builder"]
+    scaler_X = joblib.load(str(scaler_X_path))
+    scaler_y = joblib.load(str(scaler_y_path))
+    entry = {"model": model, "scaler_X": scaler_X, "scaler_y": scaler_y, **new_prediction_state()}
+    if isinstance(model, NumpyMLP):
+        # Pipeline satu panggilan: scaler X/y dilipat ke layer pertama/terakhir
+        entry["engine"] = model.fold_scalers(scaler_X, scaler_y)
+    return entry
 
-        model = builder(input_size, 3)
+def forward(model, X):
+    """Forward pass NumpyMLP, atau nn.Module jika bundle .npz belum diekspor."""
+    if isinstance(model, NumpyMLP):
+        return model(X)
+    import torch
 
-        model_path = resource_path(f"saved_models/model_{h}/model_{h}.pth")
-        scaler_X_path = resource_path(f"saved_models/model_{h}/scaler_X_{h}.pkl")
-        scaler_y_path = resource_path(f"saved_models/model_{h}/scaler_y_{h}.pkl")
+    with torch.no_grad():
+        return model(torch.tensor(X, dtype=torch.float32)).numpy()
 
-        model.load_state_dict(torch.load(str(model_path), map_location="cpu"))
-        model.eval()
 
-        scaler_X = joblib.load(str(scaler_X_path))
-        scaler_y = joblib.load(str(scaler_y_path))
+class ModelRegistry(dict):
+    """
+    Dict horizon → model yang baru dimuat saat pertama kali diakses (registry[h]).
+    `.get()` dan `in` tidak memicu load. prefetch() memuat sisa horizon di thread latar
+    (setelah UI tampil); durasi load per horizon dicatat di `timings`.
+    Registry hasil fork() memakai bobot & scaler yang sama dengan state prediksi sendiri.
+    """
 
-        model_dict[h] = {
-            "model": model,
-            "scaler_X": scaler_X,
-            "scaler_y": scaler_y,
-            "pred_history": [],
-            "chart": [],
-            "buffer_speed": [],
-            "buffer_dir": []
-        }
+    def __init__(self, loader=load_model, shared=None):
+        super().__init__()
+        self.loader = loader
+        self.shared = shared
+        self.timings = shared.timings if shared is not None else {}
+        self._lock = threading.Lock()
 
-    return model_dict
+    def __missing__(self, horizon):
+        if horizon not in MODEL_CONFIGS:
+            raise KeyError(horizon)
+        if self.shared is not None:
+            entry = self[horizon] = {**self.shared[horizon], **new_prediction_state()}
+            return entry
+        with self._lock:
+            # Bisa saja sudah dimuat thread prefetch selagi menunggu lock
+            if dict.__contains__(self, horizon):
+                return dict.__getitem__(self, horizon)
+            t0 = time.perf_counter()
+            entry = self.loader(horizon)
+            self.timings[horizon] = time.perf_counter() - t0
+            print(f"[⏱️] Model {horizon} dimuat dalam {self.timings[horizon] * 1000:.0f} ms")
+            self[horizon] = entry
+            return entry
+
+    @property
+    def root(self):
+        # Registry yang benar-benar memuat bobot (dict kosong bernilai False, jadi pakai `is None`)
+        return self if self.shared is None else self.shared
+
+    def fork(self):
+        return ModelRegistry(shared=self.root)
+
+    def prefetch(self, horizons=HORIZONS):
+        """Muat horizon yang belum dimuat di thread daemon; return thread-nya."""
+        thread = threading.Thread(target=self.root._prefetch, args=(tuple(horizons),), daemon=True)
+        thread.start()
+        return thread
+
+    def _prefetch(self, horizons):
+        for h in horizons:
+            try:
+                self[h]
+            except Exception as e:
+                print(f"[⚠️] Gagal memuat model {h}: {e}")
+        total = sum(self.timings.get(h, 0.0) for h in horizons)
+        print(f"[⏱️] Prefetch model selesai: {total * 1000:.0f} ms total")
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def inference_executor():
+    """Thread pool (1 worker) bersama untuk inferensi di luar GUI thread."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        return _executor
+
+
+def load_all_models():
+    """Muat semua horizon sekaligus (untuk skrip/CLI); aplikasi memakai ModelRegistry lazy."""
+    registry = ModelRegistry()
+    for h in HORIZONS:
+        registry[h]
+    return registry
+
+
+def fork_models(models_dict):
+    """Salin state prediksi (history, chart, buffer) per stasiun; bobot model & scaler dipakai bersama."""
+    if isinstance(models_dict, ModelRegistry):
+        return models_dict.fork()
+    return {h: {**m, **new_prediction_state()} for h, m in models_dict.items()}
 
 
 # === Fungsi prediksi utama ===
 def predict_from_data(models_dict, input_dict, horizon):
     m = models_dict[horizon]
-    model = m["model"]
-    scaler_X = m["scaler_X"]
-    scaler_y = m["scaler_y"]
 
     feature_order = FEATURE_ORDER[horizon]
     input_row = [input_dict.get(k, 0.0) for k in feature_order]
-    input_scaled = scaler_X.transform([input_row])
-    input_tensor = torch.tensor(input_scaled, dtype=torch.float32)
-    output = model(input_tensor).detach().numpy()
-    output_true = scaler_y.inverse_transform(output)
+    engine = m.get("engine")
+    if engine is not None:
+        output_true = engine([input_row])
+    else:
+        input_scaled = m["scaler_X"].transform([input_row])
+        output = forward(m["model"], input_scaled)
+        output_true = m["scaler_y"].inverse_transform(output)
 
     speed = output_true[0][0]
     sin_dir = output_true[0][1]
     cos_dir = output_true[0][2]
     direction = (np.degrees(np.arctan2(sin_dir, cos_dir))) % 360
-    
+
+    record_prediction(models_dict, horizon, speed, direction)
+    return speed, direction
+
+def record_prediction(models_dict, horizon, speed, direction):
+    """Catat hasil ke pred_history dan chart (4 sampel buffer terakhir + titik prediksi)."""
     now = datetime.now()
     delta = {"15m": 15, "1h": 60, "3h": 180, "6h": 360}[horizon]
     pred_time = now + timedelta(minutes=delta)
@@ -190,17 +302,72 @@ def predict_from_data(models_dict, input_dict, horizon):
 
     if len(speed_buffer) >= 4 and len(dir_buffer) >= 4:
         if math.isfinite(speed) and math.isfinite(direction):
+            # Buffer berisi (epoch, nilai) dari history; format jam hanya untuk chart QML
             models_dict[horizon]["chart"] = [
-                {"timestamp": speed_buffer[-4]["timestamp"], "speed": float(speed_buffer[-4]["value"]), "dir": float(dir_buffer[-4]["value"])},
-                {"timestamp": speed_buffer[-3]["timestamp"], "speed": float(speed_buffer[-3]["value"]), "dir": float(dir_buffer[-3]["value"])},
-                {"timestamp": speed_buffer[-2]["timestamp"], "speed": float(speed_buffer[-2]["value"]), "dir": float(dir_buffer[-2]["value"])},
-                {"timestamp": speed_buffer[-1]["timestamp"], "speed": float(speed_buffer[-1]["value"]), "dir": float(dir_buffer[-1]["value"])},
+                {"timestamp": format_epoch(ts, "%H:%M:%S"), "speed": float(s), "dir": float(d)}
+                for (ts, s), (_, d) in zip(speed_buffer[-4:], dir_buffer[-4:])
+            ] + [
                 {"timestamp": pred_time.strftime("%H:%M"), "speed": float(speed), "dir": float(direction)}
             ]
         else:
             print(f"[❌] Invalid prediction value: speed={speed}, dir={direction}")
 
-    return speed, direction
+
+def scratch_state(entry, buffer_speed, buffer_dir):
+    """
+    Salinan entry untuk satu kali prediksi di worker: bobot/scaler dipakai bersama, tapi
+    buffer, pred_history, dan chart baru sehingga state asli tidak disentuh di luar GUI thread.
+    """
+    return {**entry, **new_prediction_state(), "buffer_speed": buffer_speed, "buffer_dir": buffer_dir}
+
+def merge_prediction_state(entry, scratch):
+    """Terapkan hasil record_prediction pada scratch_state ke entry asli (di GUI thread)."""
+    entry["buffer_speed"] = scratch["buffer_speed"]
+    entry["buffer_dir"] = scratch["buffer_dir"]
+    entry["pred_history"].extend(scratch["pred_history"])
+    if scratch["chart"]:
+        entry["chart"] = scratch["chart"]
+
+
+# === Cache hasil prediksi ===
+class PredictionCache:
+    """
+    Memo (speed, dir) per (horizon, vektor fitur terkuantisasi, bucket waktu): klik atau
+    auto-refresh berulang dengan data sensor yang sama tidak menjalankan model lagi.
+    Aman dipakai dari GUI thread maupun worker inferensi.
+    """
+
+    def __init__(self, size=PREDICTION_CACHE_SIZE, quantum=FEATURE_QUANTUM, bucket_seconds=CACHE_BUCKET_SECONDS):
+        self.size = size
+        self.quantum = quantum
+        self.bucket_seconds = bucket_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, horizon, input_dict, now=None):
+        now = time.time() if now is None else now
+        row = np.array([input_dict.get(k, 0.0) for k in FEATURE_ORDER[horizon]], dtype=np.float64)
+        return horizon, tuple(np.round(row / self.quantum).tolist()), int(now // self.bucket_seconds)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
 
 # === Getter agar pred_history bisa dibaca dari QML ===
 def get_prediction_history(models_dict, horizon):
@@ -211,8 +378,8 @@ def get_prediction_history(models_dict, horizon):
 
 def get_full_series_for_chart(models_dict, horizon):
     try:
-        chart_data = models_dict[horizon].get("chart", [])
-        print(f"[📊 DEBUG CHART {horizon}] {chart_data}")
+        # .get: membaca chart tidak boleh memicu load model yang belum dipakai
+        chart_data = models_dict.get(horizon, {}).get("chart", [])
         return chart_data
     except Exception as e:
        # print(f"[⚠️] Gagal ambil data chart {horizon}: {e}")
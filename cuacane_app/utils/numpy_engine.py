@@ -0,0 +1,157 @@
+import os
+import sys
+
+import numpy as np
+
+ACTIVATIONS = ("ReLU", "LeakyReLU", "Tanh", "ELU", "Identity")
+
+
+# === Forward pass NumPy (tanpa torch) ===
+def _activate(x, name, slope):
+    if name == "ReLU":
+        return np.maximum(x, 0.0, out=x)
+    if name == "LeakyReLU":
+        return np.where(x > 0, x, x * slope)
+    if name == "Tanh":
+        return np.tanh(x, out=x)
+    if name == "ELU":
+        return np.where(x > 0, x, np.expm1(np.minimum(x, 0.0)))
+    return x
+
+
+class NumpyMLP:
+    """
+    MLP hasil ekspor: tiap layer = x @ W + b lalu aktivasi (layer terakhir linear).
+    BatchNorm sudah dilipat ke Linear sebelumnya dan Dropout dibuang (mode eval),
+    jadi forward cukup matmul float32 tanpa torch.
+    """
+
+    def __init__(self, weights, biases, activation="ReLU", negative_slope=0.01):
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Aktivasi tidak dikenal: {activation}")
+        # Disimpan (in, out) & C-contiguous supaya x @ W tidak perlu transpose
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activation = activation
+        self.negative_slope = float(negative_slope)
+
+    @property
+    def input_size(self):
+        return self.weights[0].shape[0]
+
+    @property
+    def output_size(self):
+        return self.weights[-1].shape[1]
+
+    def __call__(self, X):
+        x = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w
+            x += b
+            if i < last:
+                x = _activate(x, self.activation, self.negative_slope)
+        return x
+
+    def fold_scalers(self, scaler_X=None, scaler_y=None):
+        """
+        MLP baru dengan scaler X dilipat ke layer pertama dan inverse scaler y ke layer
+        terakhir: engine(x_mentah) == scaler_y.inverse_transform(self(scaler_X.transform(x))).
+        """
+        weights = [w.astype(np.float64) for w in self.weights]
+        biases = [b.astype(np.float64) for b in self.biases]
+        if scaler_X is not None:
+            # (x * a + c) @ W + b = x @ (a[:, None] * W) + (c @ W + b)
+            a, c = scaler_affine(scaler_X)
+            biases[0] = c @ weights[0] + biases[0]
+            weights[0] = a[:, None] * weights[0]
+        if scaler_y is not None:
+            # inverse: y_asli = (y - c) / a
+            a, c = scaler_affine(scaler_y)
+            weights[-1] = weights[-1] / a
+            biases[-1] = (biases[-1] - c) / a
+        return NumpyMLP(weights, biases, activation=self.activation, negative_slope=self.negative_slope)
+
+    # === Simpan / muat bundle .npz ===
+    def save(self, path):
+        """
+        Bundle .npz terkompresi berisi bobot float32 yang sudah dilipat. Ukurannya hanya sedikit
+        di bawah .pth (jumlah parameter sama, float32 acak sulit dikompres); penghematan
+        utama runtime adalah tidak perlu torch sama sekali.
+        """
+        arrays = {}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"W{i}"] = w
+            arrays[f"b{i}"] = b
+        np.savez_compressed(path, activation=np.array(self.activation),
+                            negative_slope=np.array(self.negative_slope, dtype=np.float32), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            n = sum(1 for key in data.files if key.startswith("W"))
+            return cls(
+                [data[f"W{i}"] for i in range(n)],
+                [data[f"b{i}"] for i in range(n)],
+                activation=str(data["activation"]),
+                negative_slope=float(data["negative_slope"]),
+            )
+
+
+def scaler_affine(scaler):
+    """(a, c) sehingga scaler.transform(x) == x * a + c (StandardScaler / MinMaxScaler)."""
+    if hasattr(scaler, "data_min_"):
+        return np.asarray(scaler.scale_, dtype=np.float64), np.asarray(scaler.min_, dtype=np.float64)
+    n = scaler.n_features_in_
+    scale = np.ones(n) if scaler.scale_ is None else np.asarray(scaler.scale_, dtype=np.float64)
+    mean = np.zeros(n) if scaler.mean_ is None else np.asarray(scaler.mean_, dtype=np.float64)
+    return 1.0 / scale, -mean / scale
+
+
+# === Ekspor dari nn.Sequential (butuh torch, hanya saat ekspor/training) ===
+def from_torch(sequential):
+    """Konversi nn.Sequential (Linear/BatchNorm1d/aktivasi/Dropout) ke NumpyMLP."""
+    from torch import nn
+
+    weights, biases = [], []
+    activation, slope = "Identity", 0.01
+    for layer in sequential:
+        if isinstance(layer, nn.Linear):
+            weights.append(layer.weight.detach().double().numpy().T.copy())
+            biases.append(layer.bias.detach().double().numpy().copy())
+        elif isinstance(layer, nn.BatchNorm1d):
+            # y = (x - mean) / sqrt(var + eps) * gamma + beta → dilipat ke W, b terakhir
+            scale = (layer.weight.detach().double() /
+                     (layer.running_var.detach().double() + layer.eps).sqrt()).numpy()
+            mean = layer.running_mean.detach().double().numpy()
+            weights[-1] = weights[-1] * scale
+            biases[-1] = (biases[-1] - mean) * scale + layer.bias.detach().double().numpy()
+        elif isinstance(layer, nn.Dropout):
+            continue
+        else:
+            name = type(layer).__name__
+            if name not in ACTIVATIONS:
+                raise ValueError(f"Layer tidak didukung untuk ekspor: {name}")
+            activation = name
+            slope = getattr(layer, "negative_slope", slope)
+    return NumpyMLP(weights, biases, activation=activation, negative_slope=slope)
+
+
+def export_all(model_dir="saved_models", horizons=None):
+    """Ekspor model_<h>.pth → model_<h>.npz untuk tiap horizon; return dict path hasil."""
+    from cuacane_app.utils.multi_predictor import MODEL_CONFIGS, load_torch_model
+
+    exported = {}
+    for h in horizons or MODEL_CONFIGS:
+        folder = os.path.join(model_dir, f"model_{h}")
+        pth_path = os.path.join(folder, f"model_{h}.pth")
+        engine = from_torch(load_torch_model(h, pth_path))
+        path = os.path.join(folder, f"model_{h}.npz")
+        engine.save(path)
+        exported[h] = path
+        print(f"[✅] {h}: {os.path.getsize(path) / 1024:.0f} KB (.pth {os.path.getsize(pth_path) / 1024:.0f} KB) → {path}")
+    return exported
+
+
+if __name__ == "__main__":
+    export_all(*sys.argv[1:2])
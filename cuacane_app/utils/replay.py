@@ -0,0 +1,234 @@
+import argparse
+import csv
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from cuacane_app.utils.backfill import parse_log_timestamp
+from cuacane_app.utils.line_parser import parse_0R0_record, timestamp_to_epoch
+from cuacane_app.utils.log_archive import iter_csv_records, iter_log_range
+from cuacane_app.utils.sensor_sources import SensorSource
+
+# Kode 0R0 → (field record, satuan) untuk menyusun ulang raw line dari log
+LINE_KEYS = [
+    ("Dn", "wind_dir_min", "D"), ("Dm", "wind_dir_avg", "D"), ("Dx", "wind_dir_max", "D"),
+    ("Sn", "wind_speed_min", "M"), ("Sm", "wind_speed_avg", "M"), ("Sx", "wind_speed_max", "M"),
+    ("Ta", "temp_air", "C"), ("Tp", "temp_probe", "C"), ("Ua", "humidity", "P"),
+    ("Pa", "pressure", "B"), ("Rc", "rain_accum", "M"), ("Rd", "rain_duration", "s"),
+    ("Ri", "rain_intensity", "M"), ("Th", "heating_temp", "C"), ("Vs", "voltage_supply", "V"),
+]
+
+
+def record_to_0R0_line(record):
+    """Susun ulang raw line 0R0 dari record log, supaya replay melewati parser yang sama."""
+    parts = ["0R0"]
+    for key, field, unit in LINE_KEYS:
+        value = record.get(field)
+        if value in (None, ""):
+            continue
+        value = float(value)
+        if field == "pressure":
+            value = value / 1000.0  # parser mengalikan 1000
+        text = str(int(round(value))) if field.startswith("wind_dir") else repr(value)
+        parts.append(f"{key}={text}{unit}")
+    return ",".join(parts)
+
+def iter_log_rows(path):
+    """
+    Baca realtime_log.csv → (datetime, record). Toleran terhadap header lama yang
+    jumlah kolomnya tidak sama dengan baris data.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield from iter_csv_records(reader, header)
+
+
+class ReplaySource(SensorSource):
+    """
+    Sumber data dari arsip log: baris historis diputar ulang lewat pipeline penuh
+    dengan kecepatan 1x, 10x, 100x, ... atau maksimum (speed=0).
+    """
+    name = "replay"
+    poll_interval = 0.0
+
+    def __init__(self, path, speed=1.0, batch_size=500, archive_path=None, start=None, end=None):
+        self.path = path
+        # Opsional: rentang waktu [start, end) (epoch detik), termasuk partisi di arsip dingin
+        self.archive_path = archive_path
+        self.start = start
+        self.end = end
+        self.speed = float(speed or 0.0)
+        self.batch_size = batch_size
+        self.finished = False
+        self.rows_sent = 0
+        self._rows = None
+        self._pending = None
+        self._t0_wall = None
+        self._t0_data = None
+
+    def open(self):
+        if self.archive_path or self.start is not None or self.end is not None:
+            self._rows = iter_log_range(self.path, self.archive_path, self.start, self.end)
+        else:
+            self._rows = iter_log_rows(self.path)
+        self._pending = None
+        self._t0_wall = None
+        self.finished = False
+
+    def read(self, timeout=1.0):
+        if self._rows is None:
+            self.open()
+
+        out = []
+        deadline = time.monotonic() + (timeout or 0.0)
+        while len(out) < self.batch_size:
+            item = self._pending or next(self._rows, None)
+            self._pending = None
+            if item is None:
+                if not self.finished:
+                    print(f"[⏹️] Replay selesai: {self.rows_sent} baris.")
+                self.finished = True
+                if not out and timeout:
+                    time.sleep(timeout)  # hindari busy loop setelah arsip habis
+                break
+
+            ts, record = item
+            if self._t0_wall is None:
+                self._t0_wall = time.monotonic()
+                self._t0_data = ts
+
+            if self.speed > 0:
+                due = self._t0_wall + (ts - self._t0_data).total_seconds() / self.speed
+                wait = due - time.monotonic()
+                if wait > 0:
+                    if out or time.monotonic() + wait > deadline:
+                        self._pending = item
+                        if not out:
+                            time.sleep(max(0.0, deadline - time.monotonic()))
+                        break
+                    time.sleep(wait)
+
+            out.append((record["datetime"], record_to_0R0_line(record)))
+            self.rows_sent += 1
+        return out
+
+
+class StageTimer:
+    """Akumulasi waktu per tahap pipeline (jumlah panggilan & total detik)."""
+
+    def __init__(self):
+        self.stats = {}
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            count, total = self.stats.get(name, (0, 0.0))
+            self.stats[name] = (count + 1, total + time.perf_counter() - t0)
+
+    def report(self, wall_time=None):
+        lines = [f"{'tahap':12s} {'n':>8s} {'total (s)':>10s} {'ms/item':>10s} {'item/s':>12s}"]
+        for name, (count, total) in self.stats.items():
+            per_item = total / count if count else 0.0
+            rate = count / total if total > 0 else float("inf")
+            lines.append(f"{name:12s} {count:8d} {total:10.3f} {per_item * 1000:10.3f} {rate:12.1f}")
+        if wall_time is not None:
+            lines.append(f"wall time: {wall_time:.3f} s")
+        return "\n".join(lines)
+
+
+def run_replay_pipeline(path, speed=0.0, limit=None, predict_every=1, simulate_every=0,
+                        Q=100000.0, H=50.0, log_output=None, models=None, timer=None,
+                        archive_path=None, start=None, end=None):
+    """
+    Jalankan replay headless: parse → history → predictNow → simulate_atmos → heatmap,
+    dengan waktu per tahap dicatat di StageTimer.
+    """
+    from cuacane_app.utils.stations import DEFAULT_STATION
+    from cuacane_app.utils.simulate_atmos import simulate_atmos
+    from cuacane_app.utils.sensor_connection import StationState, append_to_log, build_heatmap_data
+    from cuacane_app.utils.data_logger import get_logger
+
+    timer = timer or StageTimer()
+    source = ReplaySource(path, speed=speed, archive_path=archive_path, start=start, end=end)
+    config = dict(DEFAULT_STATION, id="replay", name="Replay", log_path=log_output or os.devnull,
+                  store_path=None, archive_path=None, forecast_path=None, auto_forecast=False)
+    station = StationState(config, models=models, source=source)
+    # Tanpa event loop Qt: prediksi dijalankan sinkron supaya waktunya tercatat di tahap "predict"
+    station.prediction_model.asynchronous = False
+    # models=None → registry lazy (dimuat saat prediksi pertama); dict kosong → prediksi nonaktif
+    can_predict = predict_every and (models is None or bool(models))
+
+    n = 0
+    t_start = time.perf_counter()
+    while limit is None or n < limit:
+        batch = source.read(timeout=0.0 if speed <= 0 else 1.0)
+        if not batch:
+            if source.finished:
+                break
+            continue
+        for ts_str, raw_line in batch:
+            with timer.stage("parse"):
+                record = parse_0R0_record(raw_line, ts=timestamp_to_epoch(ts_str))
+            if record is None:
+                continue
+            if log_output:
+                with timer.stage("log"):
+                    append_to_log(record, log_path=log_output)
+            with timer.stage("history"):
+                station._apply_record(record)
+            n += 1
+
+            if can_predict and n % predict_every == 0:
+                with timer.stage("predict"):
+                    station.prediction_model.predictNow()
+            if simulate_every and n % simulate_every == 0:
+                with timer.stage("simulate"):
+                    X, Y, C = simulate_atmos(station.latest_data, Q=Q, H=H, mask_upwind=True)
+                if C is not None:
+                    with timer.stage("heatmap"):
+                        C = np.where(np.isfinite(C), C, 0.0)
+                        build_heatmap_data(X, Y, C, station.lat, station.lon)
+            if limit is not None and n >= limit:
+                break
+
+    if log_output:
+        get_logger(log_output).close()
+    return n, time.perf_counter() - t_start, timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay realtime_log.csv melalui pipeline Cuacane")
+    parser.add_argument("--log", default="cuacane_app/data_logs/realtime_log.csv")
+    parser.add_argument("--speed", default="max", help="1, 10, 100, ... atau 'max'")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--predict-every", type=int, default=1, help="0 = tanpa prediksi")
+    parser.add_argument("--simulate-every", type=int, default=0, help="0 = tanpa simulasi dispersi")
+    parser.add_argument("--log-output", default=None, help="tulis ulang record ke CSV ini")
+    parser.add_argument("--archive", default=None, help="folder arsip partisi harian (index.json)")
+    parser.add_argument("--start", default=None, help="awal rentang, 'YYYY-MM-DD HH:MM:SS'")
+    parser.add_argument("--end", default=None, help="akhir rentang (eksklusif), 'YYYY-MM-DD HH:MM:SS'")
+    args = parser.parse_args()
+
+    start = parse_log_timestamp(args.start).timestamp() if args.start else None
+    end = parse_log_timestamp(args.end).timestamp() if args.end else None
+
+    speed = 0.0 if args.speed == "max" else float(args.speed)
+    models = {} if args.predict_every == 0 else None
+    n, wall, timer = run_replay_pipeline(
+        args.log, speed=speed, limit=args.limit, predict_every=args.predict_every,
+        simulate_every=args.simulate_every, log_output=args.log_output, models=models,
+        archive_path=args.archive, start=start, end=end,
+    )
+    print(f"\n[📊] Replay {n} record ({n / wall if wall else 0:.1f} record/s)")
+    print(timer.report(wall))
+
+if __name__ == "__main__":
+    main()
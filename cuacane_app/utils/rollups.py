@@ -0,0 +1,249 @@
+import os
+import threading
+
+import numpy as np
+
+from cuacane_app.utils.column_store import ColumnStore
+from cuacane_app.utils.sensor_record import NUMERIC_FIELDS, FIELD_INDEX
+
+# Nama tier → lebar bucket (detik)
+TIERS = {"1m": 60, "15m": 900, "1h": 3600}
+ROLLUP_FIELDS = (
+    [f"{name}_{stat}" for name in NUMERIC_FIELDS for stat in ("mean", "min", "max")]
+    + ["count", "wind_dir_vector_mean"]
+)
+_DIR_INDEX = FIELD_INDEX["wind_dir_avg"]
+
+
+class _TierState:
+    """Akumulator bucket yang sedang terbuka untuk satu tier."""
+
+    def __init__(self, name, width, store):
+        self.name = name
+        self.width = width
+        self.store = store
+        last = store.last_epoch()
+        # Bucket yang sudah ditulis tidak dibuka ulang
+        self.closed_until = None if last is None else last + width
+        self.bucket = None
+        self.late = 0
+        self._reset()
+
+    def _reset(self):
+        n = len(NUMERIC_FIELDS)
+        self.sums = np.zeros(n)
+        self.mins = np.full(n, np.nan)
+        self.maxs = np.full(n, np.nan)
+        self.counts = np.zeros(n, dtype=np.int64)
+        self.records = 0
+        self.sin_sum = 0.0
+        self.cos_sum = 0.0
+        self.dir_count = 0
+
+    def add(self, epoch, values):
+        bucket = epoch - epoch % self.width
+        if self.closed_until is not None and bucket < self.closed_until:
+            self.late += 1
+            return
+        if self.bucket is None:
+            self.bucket = bucket
+        elif bucket > self.bucket:
+            self.close()
+            self.bucket = bucket
+        elif bucket < self.bucket:
+            self.late += 1
+            return
+
+        mask = ~np.isnan(values)
+        self.sums += np.where(mask, values, 0.0)
+        self.counts += mask
+        self.mins = np.fmin(self.mins, values)
+        self.maxs = np.fmax(self.maxs, values)
+        self.records += 1
+
+        direction = values[_DIR_INDEX]
+        if mask[_DIR_INDEX]:
+            rad = np.radians(direction)
+            self.sin_sum += np.sin(rad)
+            self.cos_sum += np.cos(rad)
+            self.dir_count += 1
+
+    def snapshot(self):
+        """Baris rollup (dict) untuk bucket yang sedang terbuka, atau None."""
+        if self.bucket is None or not self.records:
+            return None
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self.sums / self.counts
+        means[self.counts == 0] = np.nan
+        row = {}
+        for i, name in enumerate(NUMERIC_FIELDS):
+            row[f"{name}_mean"] = means[i]
+            row[f"{name}_min"] = self.mins[i]
+            row[f"{name}_max"] = self.maxs[i]
+        row["count"] = self.records
+        row["wind_dir_vector_mean"] = (
+            float(np.degrees(np.arctan2(self.sin_sum, self.cos_sum)) % 360) if self.dir_count else np.nan
+        )
+        return row
+
+    def add_bulk(self, epochs, matrix):
+        """
+        Versi vektor dari add() untuk banyak baris terurut (mis. saat prime): bucket lengkap
+        dihitung dengan reduceat dan langsung ditulis, bucket terakhir tetap terbuka.
+        """
+        if self.bucket is not None:
+            for epoch, values in zip(epochs.tolist(), matrix):
+                self.add(epoch, values)
+            return
+        buckets = epochs - epochs % self.width
+        if self.closed_until is not None:
+            keep = buckets >= self.closed_until
+            self.late += int((~keep).sum())
+            epochs, matrix, buckets = epochs[keep], matrix[keep], buckets[keep]
+        if not len(epochs):
+            return
+
+        starts = np.flatnonzero(np.r_[True, np.diff(buckets) > 0])
+        last = starts[-1]
+        if len(starts) > 1:
+            full = starts[:-1]
+            m = matrix[:last]
+            valid = ~np.isnan(m)
+            counts = np.add.reduceat(valid, full, axis=0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = np.add.reduceat(np.where(valid, m, 0.0), full, axis=0) / counts
+            means[counts == 0] = np.nan
+            with np.errstate(invalid="ignore"):
+                mins = np.fmin.reduceat(m, full, axis=0)
+                maxs = np.fmax.reduceat(m, full, axis=0)
+
+            rad = np.radians(m[:, _DIR_INDEX])
+            dir_valid = valid[:, _DIR_INDEX]
+            sin_sum = np.add.reduceat(np.where(dir_valid, np.sin(rad), 0.0), full)
+            cos_sum = np.add.reduceat(np.where(dir_valid, np.cos(rad), 0.0), full)
+            dir_count = np.add.reduceat(dir_valid, full)
+            vector_mean = np.degrees(np.arctan2(sin_sum, cos_sum)) % 360
+            vector_mean[dir_count == 0] = np.nan
+
+            columns = {"epoch": buckets[full], "count": np.diff(np.r_[full, last]),
+                       "wind_dir_vector_mean": vector_mean}
+            for i, name in enumerate(NUMERIC_FIELDS):
+                columns[f"{name}_mean"] = means[:, i]
+                columns[f"{name}_min"] = mins[:, i]
+                columns[f"{name}_max"] = maxs[:, i]
+            self.store.append_columns(columns)
+            self.closed_until = int(buckets[last])
+
+        for epoch, values in zip(epochs[last:].tolist(), matrix[last:]):
+            self.add(epoch, values)
+
+    def close(self):
+        row = self.snapshot()
+        if row is not None:
+            self.store.append(self.bucket, row)
+            self.closed_until = self.bucket + self.width
+        self.bucket = None
+        self._reset()
+
+
+class RollupEngine:
+    """
+    Rollup bertingkat (1 menit / 15 menit / 1 jam) yang diperbarui setiap record masuk:
+    mean, min, max, count, dan rata-rata vektor arah angin. O(1) per record; bucket yang
+    sudah tertutup disimpan ke ColumnStore per tier di samping log mentah.
+    Ditulis dari thread worker, dibaca GUI lewat series() (di bawah lock yang sama).
+    """
+
+    def __init__(self, path, tiers=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.tiers = {
+            name: _TierState(name, width, ColumnStore(os.path.join(path, name), fields=ROLLUP_FIELDS, dtype="float64"))
+            for name, width in (tiers or TIERS).items()
+        }
+
+    def add_record(self, record):
+        self.add(int(record.ts), np.asarray(record._values, dtype=np.float64))
+
+    def add(self, epoch, values):
+        with self._lock:
+            for tier in self.tiers.values():
+                tier.add(epoch, values)
+
+    def add_columns(self, columns):
+        """Banyak record terurut sekaligus dari kolom NumPy (mis. halaman backfill)."""
+        epochs = np.asarray(columns["epoch"], dtype=np.int64)
+        if not len(epochs):
+            return
+        matrix = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in NUMERIC_FIELDS])
+        with self._lock:
+            for tier in self.tiers.values():
+                tier.add_bulk(epochs, matrix)
+
+    def prime_from(self, store):
+        """
+        Setelah restart: putar ulang data mentah dari ColumnStore sejak bucket terakhir
+        yang tersimpan, supaya bucket yang terbuka saat app mati tidak hilang.
+        """
+        starts = [tier.closed_until for tier in self.tiers.values()]
+        start = None if any(s is None for s in starts) else min(starts)
+        window = store.window(start)
+        epochs = np.asarray(window["epoch"])
+        if not len(epochs):
+            return 0
+        matrix = np.column_stack([np.asarray(window[name], dtype=np.float64) for name in NUMERIC_FIELDS])
+        with self._lock:
+            for tier in self.tiers.values():
+                tier.add_bulk(epochs, matrix)
+        return len(epochs)
+
+    def flush(self, sync=False):
+        with self._lock:
+            for tier in self.tiers.values():
+                tier.store.flush(sync=sync)
+
+    def close(self):
+        # Bucket terbuka tidak ditulis (belum lengkap); dipulihkan lewat prime_from saat start
+        with self._lock:
+            for tier in self.tiers.values():
+                tier.store.close()
+
+    # === Query ===
+    def query(self, tier, start=None, end=None, fields=None, include_open=False):
+        """Baris rollup tier untuk [start, end) (view ColumnStore), opsional plus bucket terbuka."""
+        state = self.tiers[tier]
+        window = state.store.window(start, end, fields=fields)
+        if not include_open:
+            return window
+        row = state.snapshot()
+        if row is None or (start is not None and state.bucket < start) or (end is not None and state.bucket >= end):
+            return window
+        out = {"epoch": np.append(window["epoch"], state.bucket)}
+        for name in fields or ROLLUP_FIELDS:
+            out[name] = np.append(window[name], row[name])
+        return out
+
+    def pick_tier(self, start, end, max_points=500):
+        """Tier paling halus yang jumlah bucket-nya untuk [start, end) tidak lebih dari max_points."""
+        by_width = sorted(self.tiers.values(), key=lambda t: t.width)
+        for tier in by_width:
+            if (end - start) / tier.width <= max_points:
+                return tier.name
+        return by_width[-1].name
+
+    def series(self, field, start, end, max_points=500):
+        """
+        Satu field untuk grafik rentang panjang [start, end): tier dipilih lewat pick_tier,
+        termasuk bucket yang masih terbuka. Return (nomor bucket, epoch, nilai) berupa copy,
+        format sama dengan DownsampledSeries.points(); bucket tanpa nilai dilewati.
+        """
+        # Rata-rata arah angin memakai rata-rata vektor, bukan rata-rata derajat
+        column = "wind_dir_vector_mean" if field == "wind_dir_avg" else f"{field}_mean"
+        with self._lock:
+            name = self.pick_tier(start, end, max_points)
+            window = self.query(name, start, end, fields=[column], include_open=True)
+            epochs = np.array(window["epoch"], dtype=np.int64)
+            values = np.array(window[column], dtype=np.float64)
+        keep = ~np.isnan(values)
+        epochs, values = epochs[keep], values[keep]
+        return epochs // self.tiers[name].width, epochs, values
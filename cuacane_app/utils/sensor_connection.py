@@ -1,128 +1,494 @@
 from datetime import datetime, timedelta
-from collections import deque
-import csv
+from collections import namedtuple
+from functools import partial
 import os
+import time
 import numpy as np
 import json
-import requests
-from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty, pyqtSlot, QTimer, QVariant
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty, pyqtSlot, QTimer, QVariant, Qt
 from PyQt5.QtWidgets import QApplication
 from cuacane_app.utils.simulate_atmos import simulate_atmos
-from cuacane_app.utils.multi_predictor import load_all_models, predict_from_data, get_full_series_for_chart
-from cuacane_app.utils.line_parser import parse_0R0_line
+from cuacane_app.utils.ingestion_worker import IngestionWorker
+from cuacane_app.utils.cloud_client import get_default_client
+from cuacane_app.utils.sensor_sources import make_source
+from cuacane_app.utils.multi_predictor import (
+    ModelRegistry, PredictionCache, FEATURE_ORDER, fork_models, inference_executor,
+    predict_from_data, record_prediction, scratch_state, merge_prediction_state,
+)
+from cuacane_app.utils.sensor_record import SensorRecord, HistorySeries, format_clock, py_floats, records_from_columns
+from cuacane_app.utils.backfill import read_last_logged_timestamp
+from cuacane_app.utils.data_logger import get_logger
+from cuacane_app.utils.log_archive import LogArchive
+from cuacane_app.views.settings_manager import MIN_HISTORY_CAPACITY, load_history_capacity
+from cuacane_app.views.chart_models import HistoryListModel, ItemListModel, DownsampledListModel
+from cuacane_app.utils.downsample import DownsampleCache
+from cuacane_app.utils.column_store import ColumnStore
+from cuacane_app.utils.rollups import RollupEngine
+from cuacane_app.utils.stations import load_station_configs, DEFAULT_STATION
+from cuacane_app.utils.forecast_store import ForecastStore, ForecastVerifier, MATCH_TOLERANCE
+from cuacane_app.utils.forecast_scheduler import ForecastScheduler
+
+LOG_PATH = DEFAULT_STATION["log_path"]
+HISTORY_FIELDS = ("temp_air", "humidity", "pressure", "rain_intensity", "rain_accum", "wind_speed_avg", "wind_dir_avg")
+# Jumlah titik terakhir yang digambar di grafik dashboard (tanpa downsampling)
+CHART_POINTS = 15
+# Lebar grafik (piksel) bawaan untuk downsampling jendela panjang
+CHART_WIDTH = 800
+# Interval sampel sensor (detik); jendela grafik dinyatakan dalam jumlah sampel
+SAMPLE_SECONDS = 5
+HORIZONS = ("15m", "1h", "3h", "6h")
+# Satu hasil prediksi: issued/valid dalam epoch detik
+Forecast = namedtuple("Forecast", "speed direction expiry issued valid")
+HORIZON_DELTAS = {
+    "15m": timedelta(minutes=15),
+    "1h": timedelta(hours=1),
+    "3h": timedelta(hours=3),
+    "6h": timedelta(hours=6)
+}
 
 def get_latest_raw_from_cloud():
-    try:
-        r = requests.get("https://cuacane-cloud-api.onrender.com/latest_raw", timeout=5)
-        data = r.json()
-        raw_line = data.get("raw", "")
-        return raw_line
-    except Exception as e:
-        print(f"[⛔] Gagal ambil data dari cloud: {e}")
-        return None
+    # Session keep-alive + ETag: data yang belum berubah cukup dibalas 304
+    return get_default_client().fetch_latest_raw()
+
+def build_heatmap_data(X, Y, C, origin_lat, origin_lon, limit=100000):
+    """Translasi grid konsentrasi (meter, relatif sumber) ke titik [lat, lon, C] untuk heatmap."""
+    heatmap_data = []
+    for i in range(C.shape[0]):
+        for j in range(C.shape[1]):
+            val = float(C[i, j])
+            if val <= 0:
+                continue
+            lat = origin_lat + float(Y[i, j]) / 110540.0
+            lon = origin_lon + float(X[i, j]) / 111320.0
+            heatmap_data.append([lat, lon, val])
+
+    heatmap_data.sort(key=lambda x: x[2], reverse=True)
+    return heatmap_data[:limit]
+
+
+class StationState(QObject):
+    """State satu stasiun: data terbaru, history, log, worker ingestion, dan model prediksi."""
+    dataChanged = pyqtSignal()
+    historyAppended = pyqtSignal(str)
+    connectionChanged = pyqtSignal()
+
+    def __init__(self, config, manager=None, models=None, source=None):
+        super().__init__(manager)
+        self.config = config
+        self.station_id = config["id"]
+        self.name = config["name"]
+        self.lat = config["lat"]
+        self.lon = config["lon"]
+        self.log_path = config["log_path"]
+        self.manager = manager
+        self.latest_data = SensorRecord()
+        self.connected = True
+
+        # History data: ring buffer (epoch, nilai) per field, kapasitas dari pengaturan
+        capacity = config.get("history_capacity") or load_history_capacity()
+        self._history_dict = {key: HistorySeries(maxlen=capacity) for key in HISTORY_FIELDS}
+
+        self.prediction_model = MultiHorizonPredictionModel(sensor_manager=self, models=models)
+        # Semua prediksi (manual & otomatis) dicatat dengan waktu terbit & berlaku
+        forecast_path = config.get("forecast_path", os.path.join(os.path.dirname(self.log_path), "forecasts.csv"))
+        self.prediction_model.store = ForecastStore(forecast_path) if forecast_path else None
+        if self.prediction_model.store is not None:
+            # Forecast yang belum jatuh tempo dipulihkan dari ekor log
+            self.prediction_model.verifier.load(self.prediction_model.store.tail(), since=time.time() - MATCH_TOLERANCE)
+        # Prediksi otomatis mengikuti pembacaan baru (cadence per horizon, detik)
+        self.scheduler = None
+        if config.get("auto_forecast", True):
+            self.scheduler = ForecastScheduler(self, cadence=config.get("forecast_cadence"))
+
+        # Worker untuk polling, parsing, dan logging data sensor (di luar GUI thread)
+        if source is None:
+            source = make_source(config.get("source", "cloud"))
+        # Log CSV (partisi harian, hari lama dikompres ke archive/) + store kolom (memmap)
+        # di samping log, kecuali archive_path/store_path=None
+        self.archive_path = config.get("archive_path", os.path.join(os.path.dirname(self.log_path), "archive"))
+        self.logger = get_logger(self.log_path, archive_dir=self.archive_path)
+        store_path = config.get("store_path", os.path.join(os.path.dirname(self.log_path), "store"))
+        self.store = ColumnStore(store_path) if store_path else None
+        # Rollup 1m/15m/1h ikut diperbarui per record (grafik dashboard rentang > kapasitas history);
+        # bucket yang belum selesai dipulihkan dari store
+        self.rollups = None
+        if self.store is not None:
+            rollup_path = config.get("rollup_path", os.path.join(os.path.dirname(store_path), "rollups"))
+            self.rollups = RollupEngine(rollup_path)
+            self.rollups.prime_from(self.store)
+        self._ingestion = IngestionWorker(
+            source, self._persist_record, flush_log=self._flush_persisted,
+            log_batch=self._persist_batch, last_logged_ts=self._last_logged_timestamp(),
+        )
+        self._ingestion.recordsReady.connect(self._drain_ingestion_queue, Qt.QueuedConnection)
+        self._ingestion.batchReady.connect(self._apply_batch, Qt.QueuedConnection)
+        self._ingestion.connectionStateChanged.connect(self._on_connection_state, Qt.QueuedConnection)
+
+    def _last_logged_timestamp(self):
+        # Partisi aktif bisa kosong tepat setelah rotasi → lihat arsip
+        ts = read_last_logged_timestamp(self.log_path)
+        if ts is None and self.archive_path and os.path.exists(self.archive_path):
+            ts = LogArchive(self.archive_path).last_timestamp()
+        return ts
+
+    @property
+    def ui_attached(self):
+        return getattr(self.manager, "main_window", None) is not None
+
+    def start(self):
+        self._ingestion.start()
+
+    def stop(self):
+        self._ingestion.stop()
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        if self.store is not None:
+            self.store.close()
+        if self.rollups is not None:
+            self.rollups.close()
+
+    def wake(self):
+        self._ingestion.wake()
+
+    def _persist_record(self, record):
+        # Dipanggil dari thread worker
+        if self.logger.append(record) and self.store is not None:
+            if self.store.append_record(record):
+                self.rollups.add_record(record)
+
+    def _persist_batch(self, columns):
+        # Dipanggil dari thread worker: satu halaman backfill ke log, store, dan rollup
+        self.logger.extend(records_from_columns(columns))
+        if self.store is not None:
+            n = self.store.append_columns(columns)
+            if n:
+                # append_columns hanya menambah ekor yang lebih baru dari isi store
+                self.rollups.add_columns({name: col[-n:] for name, col in columns.items()})
+
+    def _flush_persisted(self):
+        self.logger.flush()
+        if self.store is not None:
+            self.store.flush()
+            self.rollups.flush()
+
+    def _on_connection_state(self, connected):
+        if connected != self.connected:
+            self.connected = connected
+            self.connectionChanged.emit()
+
+    def _drain_ingestion_queue(self):
+        records = self._ingestion.drain()
+        changed = set()
+        for record, _ in records:
+            changed.update(self._apply_record(record))
+        if records:
+            self.dataChanged.emit()
+        for key in HISTORY_FIELDS:
+            if key in changed:
+                self.historyAppended.emit(key)
+        if "wind_speed_avg" in changed:
+            self.prediction_model.verify()
+
+    def _apply_batch(self, columns):
+        """Satu halaman backfill (sudah di-log worker) → history sekaligus, tanpa lewat queue live."""
+        epochs = columns["epoch"]
+        changed = []
+        for key, series in self._history_dict.items():
+            values = columns[key]
+            keep = ~np.isnan(values)
+            if keep.any():
+                series.extend(epochs[keep], values[keep])
+                changed.append(key)
+        self._update_buffer_ready()
+        for key in HISTORY_FIELDS:
+            if key in changed:
+                self.historyAppended.emit(key)
+
+    def _update_buffer_ready(self):
+        if self.ui_attached:
+            speed_hist = self._history_dict["wind_speed_avg"]
+            dir_hist = self._history_dict["wind_dir_avg"]
+            self.prediction_model.set_buffer_ready(len(speed_hist) >= 4 and len(dir_hist) >= 4)
+
+    def _apply_record(self, record):
+        # Update state dari record yang sudah di-parse & di-log oleh worker.
+        # Return field history yang bertambah.
+        self.latest_data.merge(record)
+
+        appended = []
+        for key, series in self._history_dict.items():
+            value = record.get_value(key)
+            if value == value:
+                series.append(record.ts, value)
+                appended.append(key)
+
+        self._update_buffer_ready()
+        return appended
+
+    def resize_history(self, capacity):
+        # Nilai dari QML tidak dipercaya begitu saja: minimal cukup untuk fitur lag
+        capacity = max(MIN_HISTORY_CAPACITY, int(capacity))
+        for series in self._history_dict.values():
+            series.resize(capacity)
+
+    def get_lag_features(self):
+        try:
+            speed_hist = self._history_dict["wind_speed_avg"]
+            dir_hist = self._history_dict["wind_dir_avg"]
+
+          #  print(f"[DEBUG] wind_speed_avg buffer: {len(speed_hist)}")
+           # print(f"[DEBUG] wind_dir_avg buffer: {len(dir_hist)}")
+
+            # Pastikan cukup data
+            if len(speed_hist) < 4 or len(dir_hist) < 4:
+                if self.ui_attached:
+                    self.prediction_model.set_buffer_ready(False)
+                raise ValueError("Insufficient history")
+            
+            if self.ui_attached:
+                self.prediction_model.set_buffer_ready(True)
+
+            lag2_windspeed = float(speed_hist[-3][1])
+            lag3_windspeed = float(speed_hist[-4][1])
+
+            lag2_dir_deg = float(dir_hist[-3][1])
+            lag3_dir_deg = float(dir_hist[-4][1])
+
+            lag2_sin_dir = np.sin(np.radians(lag2_dir_deg))
+            lag3_cos_dir = np.cos(np.radians(lag3_dir_deg))
+
+            return {
+                "lag2_windspeed": lag2_windspeed,
+                "lag3_windspeed": lag3_windspeed,
+                "lag2_sin_dir": lag2_sin_dir,
+                "lag3_cos_dir": lag3_cos_dir
+            }
+        except Exception as e:
+           # print(f"[⚠️] Gagal ambil lag: {e}")
+            return {
+                "lag2_windspeed": 0.0,
+                "lag3_windspeed": 0.0,
+                "lag2_sin_dir": 0.0,
+                "lag3_cos_dir": 0.0
+            }
+
+
 
 class SensorConnectionManager(QObject):
     connectionStatusChanged = pyqtSignal()
+    # latestDataChanged hanya saat data baru masuk; jam 1 Hz lewat clockChanged
     latestDataChanged = pyqtSignal()
+    clockChanged = pyqtSignal()
+    dispersionStateChanged = pyqtSignal()
+    historyAppended = pyqtSignal(str)
     simulationFailed = pyqtSignal(str)
+    currentStationChanged = pyqtSignal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, source=None, stations=None):
         super().__init__(parent)
-        self.latest_data = {}
-        self.windPredictionModel = MultiHorizonPredictionModel(sensor_manager=self)
         self._disperse_timer = QTimer()
         self._disperse_timer.timeout.connect(self._run_dispersion_loop)
         self._disperse_Q = None
         self._disperse_H = None
         self._disperse_running = False
-        self._last_raw_line = None
-        self._last_raw_timestamp = datetime.min
-
-
-        # Timer untuk ping dan baca data sensor
-        self.timer = QTimer()
-        self.timer.timeout.connect(self._read_from_cloud)
-        self.timer.start(5000)
+        self._latest_qml = None
+        # Model list QML: grafik dashboard (N titik terakhir field terpilih) + history penuh per field
+        self._chart_key = "temp_air"
+        self._chart_model = HistoryListModel(window=CHART_POINTS, parent=self)
+        self._history_models = {}
+        # Jendela panjang: history diperkecil (LTTB) ke lebar grafik, cache per (series, jendela, lebar)
+        self._chart_window = CHART_POINTS
+        self._chart_width = CHART_WIDTH
+        self._downsample = DownsampleCache()
+        self._range_model = DownsampledListModel(parent=self)
 
         # Timer untuk update datetime setiap detik
         self.datetime_timer = QTimer()
         self.datetime_timer.timeout.connect(self._emit_datetime)
         self.datetime_timer.start(1000)
 
-        # History data
-        self._history_dict = {
-            "temp_air": deque(maxlen=30),
-            "humidity": deque(maxlen=30),
-            "pressure": deque(maxlen=30),
-            "rain_intensity": deque(maxlen=30),
-            "rain_accum": deque(maxlen=30),
-            "wind_speed_avg": deque(maxlen=30),
-            "wind_dir_avg": deque(maxlen=30),
-        }
+        # Stasiun: masing-masing punya worker, history, log, dan state prediksi sendiri.
+        # Bobot model & scaler dipakai bersama dan baru dimuat saat horizon dipakai/prefetch.
+        configs = stations or load_station_configs()
+        self.models = ModelRegistry()
+        self.stations = {}
+        for i, cfg in enumerate(configs):
+            station = StationState(cfg, self, models=fork_models(self.models),
+                                   source=source if i == 0 else None)
+            station.dataChanged.connect(partial(self._on_station_data, station.station_id))
+            station.historyAppended.connect(partial(self._on_station_history, station.station_id))
+            station.connectionChanged.connect(partial(self._on_station_connection, station.station_id))
+            self.stations[station.station_id] = station
+        self._current_id = configs[0]["id"]
+        self._chart_model.set_series(self._history_dict[self._chart_key])
+
+        for station in self.stations.values():
+            station.start()
+
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    # === Stasiun aktif (yang ditampilkan di dashboard) ===
+    @property
+    def current_station(self):
+        return self.stations[self._current_id]
+
+    @property
+    def latest_data(self):
+        return self.current_station.latest_data
+
+    @property
+    def _history_dict(self):
+        return self.current_station._history_dict
+
+    @property
+    def windPredictionModel(self):
+        return self.current_station.prediction_model
+
+    @pyqtProperty(QVariant, constant=True)
+    def stationList(self):
+        return [{"id": st.station_id, "name": st.name} for st in self.stations.values()]
+
+    @pyqtProperty(str, notify=currentStationChanged)
+    def currentStation(self):
+        return self._current_id
 
-    @pyqtProperty(bool, notify=connectionStatusChanged)
-    def is_connected(self):
-        return True  # karena kamu selalu polling dari cloud, dianggap selalu "terhubung"
+    @pyqtSlot(str)
+    def setCurrentStation(self, station_id):
+        if station_id not in self.stations or station_id == self._current_id:
+            return
+        print(f"[📡] Stasiun aktif diubah ke: {station_id}")
+        self._current_id = station_id
+        self.currentStationChanged.emit()
+        self.connectionStatusChanged.emit()
+        self._latest_qml = None
+        self.latestDataChanged.emit()
+        self._emit_all_history()
+        self.windPredictionModel.predictionChanged.emit()
+        self.windPredictionModel.bufferReadyChanged.emit()
 
+    def _on_station_data(self, station_id):
+        if station_id == self._current_id:
+            self._latest_qml = None
+            self.latestDataChanged.emit()
 
-    @pyqtProperty(QVariant, notify=latestDataChanged)
-    def latest_data_qml(self):
-        current = dict(self.latest_data)
-        current["datetime"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return current
+    def _on_station_history(self, station_id, key):
+        if station_id == self._current_id:
+            if key == self._chart_key:
+                self._chart_model.sync()
+                self._refresh_range_model()
+            if key in self._history_models:
+                self._history_models[key].sync()
+            self.historyAppended.emit(key)
+
+    def _emit_all_history(self):
+        # Sumber berganti (stasiun/kapasitas) → model list di-reset, lalu semua sinyal history
+        self._chart_model.set_series(self._history_dict[self._chart_key])
+        self._downsample.clear()
+        self._refresh_range_model()
+        for key, model in self._history_models.items():
+            model.set_series(self._history_dict[key])
+        for key in HISTORY_FIELDS:
+            self.historyAppended.emit(key)
 
-    def _read_from_cloud(self):
-        raw_line = get_latest_raw_from_cloud()
+    @pyqtProperty(QObject, constant=True)
+    def historyChartModel(self):
+        return self._chart_model
 
-        now = datetime.now()
+    @pyqtSlot(str)
+    def setChartParameter(self, key):
+        if key in self._history_dict and key != self._chart_key:
+            self._chart_key = key
+            self._chart_model.set_series(self._history_dict[key])
+            self._refresh_range_model()
 
-        # ⛔ Jika tidak ada data sama sekali
-        if not raw_line:
-            print("[⛔] Tidak ada data diterima dari cloud.")
+    @pyqtProperty(QObject, constant=True)
+    def historyRangeModel(self):
+        return self._range_model
+
+    @pyqtSlot(int, int)
+    def setChartRange(self, window, width):
+        """Jendela grafik dashboard (jumlah sampel) & lebar plot (piksel) untuk downsampling."""
+        self._chart_window = max(CHART_POINTS, window)
+        self._chart_width = max(16, width or CHART_WIDTH)
+        self._refresh_range_model()
+
+    def _refresh_range_model(self):
+        if self._chart_window <= CHART_POINTS:
+            return
+        series = self._history_dict[self._chart_key]
+        rollups = self.current_station.rollups
+        if rollups is not None and self._chart_window > series.maxlen:
+            # Jendela lebih panjang dari ring buffer di memori → tier rollup 1m/15m/1h di disk
+            end = (int(series.timestamps()[-1]) if len(series) else int(time.time())) + 1
+            start = end - self._chart_window * SAMPLE_SECONDS
+            self._range_model.set_points(*rollups.series(self._chart_key, start, end, self._chart_width))
             return
+        entry = self._downsample.get(series, self._chart_window, self._chart_width)
+        self._range_model.set_points(*entry.points())
+
+    @pyqtSlot(str, int, int, result=QVariant)
+    def downsampledHistory(self, key, window, width):
+        """History satu field untuk `window` sampel terakhir, diperkecil ke `width` titik (LTTB)."""
+        series = self._history_dict.get(key)
+        if series is None:
+            return []
+        samples, epochs, values = self._downsample.get(series, window, width).points()
+        return [
+            {"sample": sample, "value": value, "timestamp": label}
+            for sample, value, label in zip(samples.tolist(), py_floats(values), format_clock(epochs))
+        ]
 
-        # ⏱️ Jika data sama, cek apakah sudah lewat 3 menit
-        if raw_line == self._last_raw_line:
-            elapsed = (now - self._last_raw_timestamp).total_seconds()
-            if elapsed < 180:
-                print(f"[🟡] Data masih sama, dilewati. Baru {int(elapsed)} detik.")
-                return
-            else:
-                print("[⏱️] Data masih sama, tapi sudah 3 menit → tetap dicatat.")
+    @pyqtSlot(str, result=QObject)
+    def historyModel(self, key):
+        """Model list history penuh untuk satu field (dibuat saat pertama diminta)."""
+        model = self._history_models.get(key)
+        if model is None and key in self._history_dict:
+            model = self._history_models[key] = HistoryListModel(self._history_dict[key], parent=self)
+        return model
 
-        # ✅ Simpan raw terbaru dan timestamp-nya
-        self._last_raw_line = raw_line
-        self._last_raw_timestamp = now
+    def _on_station_connection(self, station_id):
+        if station_id == self._current_id:
+            self.connectionStatusChanged.emit()
 
-        # Parsing dan update UI
-        parsed = parse_0R0_line(raw_line)
-        print(f"[🌐] Data dari cloud: {parsed}")
+    @pyqtProperty(bool, notify=connectionStatusChanged)
+    def is_connected(self):
+        return self.current_station.connected
 
-        if parsed and any(v is not None for v in parsed.values()):
-            append_to_log(parsed)
-            for key, value in parsed.items():
-                if value is not None:
-                    self.latest_data[key] = value
-            self.latestDataChanged.emit()
+    @pyqtSlot(result=str)
+    def connect(self):
+        self.current_station.wake()
+        return "Connecting..."
+
+    @pyqtSlot(int)
+    def setHistoryCapacity(self, capacity):
+        # Ubah panjang ring buffer history semua stasiun (data terbaru dipertahankan)
+        for station in self.stations.values():
+            station.resize_history(capacity)
+        self._emit_all_history()
+
+    def prefetch_models(self):
+        """Muat model semua horizon di thread latar (dipanggil setelah window tampil)."""
+        return self.models.prefetch()
 
-            now_str = now.strftime("%H:%M:%S")
-            for key in self._history_dict:
-                if key in parsed and parsed[key] is not None:
-                    self._history_dict[key].append({
-                        "value": parsed[key],
-                        "timestamp": now_str
-                    })
+    def shutdown(self):
+        for station in self.stations.values():
+            station.stop()
 
-            speed_hist = list(self._history_dict["wind_speed_avg"])
-            dir_hist = list(self._history_dict["wind_dir_avg"])
-            buffer_ready_now = len(speed_hist) >= 4 and len(dir_hist) >= 4
-            if hasattr(self, "main_window") and self.main_window:
-                self.windPredictionModel._buffer_ready = buffer_ready_now
-                self.windPredictionModel.predictionChanged.emit()
+    @pyqtProperty(QVariant, notify=latestDataChanged)
+    def latest_data_qml(self):
+        # Dibangun sekali per data baru (datetime = waktu record)
+        if self._latest_qml is None:
+            self._latest_qml = dict(self.latest_data)
+        return self._latest_qml
 
+    @pyqtProperty(str, notify=clockChanged)
+    def currentDateTime(self):
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     def _emit_datetime(self):
-        self.latestDataChanged.emit()
+        self.clockChanged.emit()
             
     @pyqtSlot(float, float)
     def startDispersionLoop(self, Q_value: float, H_value: float):
@@ -150,6 +516,7 @@ class SensorConnectionManager(QObject):
         self._run_dispersion_loop()
         self._disperse_timer.start(10000)
         self._disperse_running = True
+        self.dispersionStateChanged.emit()
 
 
     @pyqtSlot()
@@ -160,6 +527,7 @@ class SensorConnectionManager(QObject):
         print("[⏹️] Menghentikan loop simulasi dispersi...")
         self._disperse_timer.stop()
         self._disperse_running = False
+        self.dispersionStateChanged.emit()
 
     def _run_dispersion_loop(self):
         try:
@@ -198,21 +566,9 @@ class SensorConnectionManager(QObject):
                 return
 
 
-            sensor_lat = -6.8877831363571
-            sensor_lon = 107.60727549580955
-
-            heatmap_data = []
-            for i in range(C.shape[0]):
-                for j in range(C.shape[1]):
-                    val = float(C[i, j])
-                    if val <= 0:
-                        continue
-                    lat = sensor_lat + float(Y[i, j]) / 110540.0
-                    lon = sensor_lon + float(X[i, j]) / 111320.0
-                    heatmap_data.append([lat, lon, val])
-
-            heatmap_data.sort(key=lambda x: x[2], reverse=True)
-            heatmap_data = heatmap_data[:100000]
+            # Plume berasal dari lokasi stasiun aktif
+            station = self.current_station
+            heatmap_data = build_heatmap_data(X, Y, C, station.lat, station.lon)
 
             json_data = json.dumps(heatmap_data)
             qml_root = self.main_window.maps_qml.rootObject()
@@ -224,7 +580,7 @@ class SensorConnectionManager(QObject):
         except Exception as e:
             print(f"[❌] Error loop simulasi dispersi: {e}")
 
-    @pyqtProperty(bool, notify=latestDataChanged)
+    @pyqtProperty(bool, notify=dispersionStateChanged)
     def isDispersionRunning(self):
         return self._disperse_running
 
@@ -245,235 +601,236 @@ class SensorConnectionManager(QObject):
             print(f"[❌] Gagal hapus heatmap: {e}")
 
     def get_lag_features(self):
-        try:
-            speed_hist = list(self._history_dict["wind_speed_avg"])
-            dir_hist = list(self._history_dict["wind_dir_avg"])
-
-          #  print(f"[DEBUG] wind_speed_avg buffer: {len(speed_hist)}")
-           # print(f"[DEBUG] wind_dir_avg buffer: {len(dir_hist)}")
-
-            # Pastikan cukup data
-            if len(speed_hist) < 4 or len(dir_hist) < 4:
-                if hasattr(self, "main_window") and self.main_window:
-                    self.windPredictionModel._buffer_ready = False
-                    self.windPredictionModel.predictionChanged.emit()
-                raise ValueError("Insufficient history")
-            
-            if hasattr(self, "main_window") and self.main_window:
-                self.windPredictionModel._buffer_ready = True
-                self.windPredictionModel.predictionChanged.emit()
-
-            lag2_windspeed = float(speed_hist[-3]["value"])
-            lag3_windspeed = float(speed_hist[-4]["value"])
-
-            lag2_dir_deg = float(dir_hist[-3]["value"])
-            lag3_dir_deg = float(dir_hist[-4]["value"])
-
-            lag2_sin_dir = np.sin(np.radians(lag2_dir_deg))
-            lag3_cos_dir = np.cos(np.radians(lag3_dir_deg))
-
-            return {
-                "lag2_windspeed": lag2_windspeed,
-                "lag3_windspeed": lag3_windspeed,
-                "lag2_sin_dir": lag2_sin_dir,
-                "lag3_cos_dir": lag3_cos_dir
-            }
-        except Exception as e:
-           # print(f"[⚠️] Gagal ambil lag: {e}")
-            return {
-                "lag2_windspeed": 0.0,
-                "lag3_windspeed": 0.0,
-                "lag2_sin_dir": 0.0,
-                "lag3_cos_dir": 0.0
-            }
+        return self.current_station.get_lag_features()
 
-
-    @pyqtProperty(QVariant, notify=latestDataChanged)
-    def history_temp_air(self):
-        return list(self._history_dict["temp_air"])
-
-    @pyqtProperty(QVariant, notify=latestDataChanged)
-    def history_humidity(self):
-        return list(self._history_dict["humidity"])
-
-    @pyqtProperty(QVariant, notify=latestDataChanged)
-    def history_pressure(self):
-        return list(self._history_dict["pressure"])
-
-    @pyqtProperty(QVariant, notify=latestDataChanged)
-    def history_rain_intensity(self):
-        return list(self._history_dict["rain_intensity"])
-
-    @pyqtProperty(QVariant, notify=latestDataChanged)
-    def history_rain_accum(self):
-        return list(self._history_dict["rain_accum"])
-
-    @pyqtProperty(QVariant, notify=latestDataChanged)
-    def history_wind_speed_avg(self):
-        return list(self._history_dict["wind_speed_avg"])
-
-    @pyqtProperty(QVariant, notify=latestDataChanged)
-    def history_wind_dir_avg(self):
-        return list(self._history_dict["wind_dir_avg"])
-    
-    @pyqtProperty(QObject, constant=True)
+    @pyqtProperty(QObject, notify=currentStationChanged)
     def predictionModel(self):
         return self.windPredictionModel
 
 
-def append_to_log(data):
-    log_path = "cuacane_app/data_logs/realtime_log.csv"
-    os.makedirs(os.path.dirname(log_path), exist_ok=True)
-
-    # Cek apakah file sudah ada
-    file_exists = os.path.exists(log_path)
-
-    # Jika file belum ada, buat dengan header
-    if not file_exists:
-        with open(log_path, mode='w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=data.keys())
-            writer.writeheader()
-
-    # Cek apakah data identik dengan baris terakhir
-    if file_exists:
-        with open(log_path, mode='r', newline='') as file:
-            reader = list(csv.DictReader(file))
-            if reader:
-                last_row = reader[-1]
-                # Bandingkan semua field
-                if all(str(last_row.get(k, "")) == str(data.get(k, "")) for k in data.keys()):
-                    print("[⚠️] Data identik, tidak ditulis ulang.")
-                    return
-
-    # Tulis data jika tidak duplikat
-    with open(log_path, mode='a', newline='') as file:
-        writer = csv.DictWriter(file, fieldnames=data.keys())
-        writer.writerow(data)
-        print("[✅] Data berhasil ditulis ke log.")
-    
+def append_to_log(data, log_path=LOG_PATH):
+    # Logger per file: handle tetap terbuka & baris terakhir di memori (tanpa baca ulang log)
+    return get_logger(log_path).append(data)
 
 
 class MultiHorizonPredictionModel(QObject):
     predictionChanged = pyqtSignal()
     predictionExpiryChanged = pyqtSignal()
+    verificationChanged = pyqtSignal()
+    busyChanged = pyqtSignal()
+    bufferReadyChanged = pyqtSignal()
+    # Dari worker inferensi → GUI thread (QueuedConnection): (sumber, Future)
+    _inferenceDone = pyqtSignal(str, object)
 
-    def __init__(self, sensor_manager, use_dummy_model=False):
+    def __init__(self, sensor_manager, use_dummy_model=False, models=None):
         super().__init__()
-        self.models = load_all_models()
         self.sensor_manager = sensor_manager
         self._selected_horizon = "15m"
 
         self._latest_speed = 0.0
         self._latest_direction = 0.0
         self._prediction_expiry = "No Prediction Yet"
-        self._history = deque(maxlen=20)
         self._buffer_ready = False
+        # Hasil terakhir per horizon: (speed, dir, expiry)
+        self._results = {}
+        # Model list QML: riwayat prediksi & grafik per horizon, diperbarui inkremental
+        self._history_model = ItemListModel(["timestamp", "speed", "dir", "horizon"], maxlen=20, parent=self)
+        self._chart_models = {h: ItemListModel(["timestamp", "speed", "dir"], parent=self) for h in HORIZONS}
 
         if use_dummy_model:
             self.models = {}  # akan diset manual di test
+        elif models is not None:
+            self.models = models
         else:
-            self.models = load_all_models()
-        
-        
+            self.models = ModelRegistry()
+
+        # Inferensi model asli jalan di thread pool; model dummy/test & replay headless tetap sinkron
+        self.asynchronous = isinstance(self.models, ModelRegistry)
+        self._cache = PredictionCache()
+        self._pending = 0
+        self._busy = False
+        # Log semua prediksi (issued/valid); diisi StationState
+        self.store = None
+        # Forecast menunggu dicocokkan dengan observasi pada valid time-nya
+        self.verifier = ForecastVerifier(HORIZONS)
+        self._inferenceDone.connect(self._on_inference_done, Qt.QueuedConnection)
 
     @pyqtSlot(str)
     def setHorizon(self, h):
         print(f"[⚙️] Horizon diubah ke: {h}")
         self._selected_horizon = h
+        # Hasil prediksi horizon ini (mis. dari predictAll) langsung ditampilkan tanpa prediksi ulang
+        result = self._results.get(h)
+        if result is not None:
+            self._latest_speed, self._latest_direction, self._prediction_expiry = result.speed, result.direction, result.expiry
+            self.predictionChanged.emit()
+            self.predictionExpiryChanged.emit()
+
+    def _build_full_input(self, data, lag):
+        """Semua calon fitur (dipakai bersama semua horizon) dari data terbaru + lag."""
+        now = datetime.now()
+        hour, month, weekday = now.hour, now.month, now.weekday()
+        return {
+            "air_temp": data.get("temp_air", 0.0),
+            "relative_humid": data.get("humidity", 0.0),
+            "air_pressure": data.get("pressure", 0.0) / 1013.25,  # konversi dari hPa ke atm
+            "rain_duration": data.get("rain_duration", 0.0),
+            "rain_intensity": data.get("rain_intensity", 0.0),
+            "hour": hour,
+            "month": month,
+            "weekday": weekday,
+            "sin_hour": np.sin(2 * np.pi * hour / 24),
+            "cos_hour": np.cos(2 * np.pi * hour / 24),
+            "sin_month": np.sin(2 * np.pi * month / 12),
+            "cos_month": np.cos(2 * np.pi * month / 12),
+            "prev_windspeed": data.get("wind_speed_avg", 0.0),
+            "prev_sin_dir": np.sin(np.radians(data.get("wind_dir_avg", 0.0))),
+            "prev_cos_dir": np.cos(np.radians(data.get("wind_dir_avg", 0.0))),
+            **lag
+        }
+
+    def _prepare_inputs(self):
+        """(data, lag, buffer speed, buffer dir) dibaca di GUI thread, atau None jika history belum cukup."""
+        lag = self.sensor_manager.get_lag_features()
+        if all(v == 0.0 for v in lag.values()):
+           # print("[⛔] Prediksi dibatalkan: data history belum cukup untuk lag.")
+            self._prediction_expiry = "❌ Prediction Failed: buffer data not ready"
+            self.predictionExpiryChanged.emit()
+            return None
+
+        # === Buffer 4 sampel terakhir untuk chart prediksi ===
+        hist_speed = self.sensor_manager._history_dict["wind_speed_avg"][-4:]
+        hist_dir = self.sensor_manager._history_dict["wind_dir_avg"][-4:]
+        if len(hist_speed) < 4 or len(hist_dir) < 4:
+            #print("[⛔] Buffer dari history_dict belum cukup")
+            return None
+        return dict(self.sensor_manager.latest_data), lag, hist_speed, hist_dir
+
+    def _predict_horizon(self, h, full_input, hist_speed, hist_dir, issued):
+        """(Forecast, scratch state) satu horizon; buffer/chart ditulis ke salinan, bukan self.models."""
+        # Hanya ambil fitur yang dibutuhkan sesuai horizon
+        filtered_input = {k: full_input.get(k, 0.0) for k in FEATURE_ORDER[h]}
+        scratch = {h: scratch_state(self.models[h], hist_speed, hist_dir)}
+        key = self._cache.key(h, filtered_input)
+        cached = self._cache.get(key)
+        if cached is None:
+            speed, direction = predict_from_data(scratch, filtered_input, h)
+            self._cache.put(key, (speed, direction))
+        else:
+            # Fitur sama dalam bucket waktu yang sama → tanpa menjalankan model
+            speed, direction = cached
+            record_prediction(scratch, h, speed, direction)
+        # Waktu validitas prediksi sesuai horizon
+        valid = issued + HORIZON_DELTAS.get(h, timedelta(minutes=15)).total_seconds()
+        expiry = datetime.fromtimestamp(valid).strftime("Valid Till %H:%M WIB")
+        return Forecast(speed, direction, expiry, issued, valid), scratch[h]
+
+    def _infer(self, horizons, issued, data, lag, hist_speed, hist_dir):
+        """
+        Bangun fitur sekali lalu prediksi tiap horizon; tidak menyentuh objek QML maupun state
+        self.models (aman di worker). Return ({horizon: Forecast}, {horizon: scratch state}).
+        """
+        full_input = self._build_full_input(data, lag)
+        outputs = {h: self._predict_horizon(h, full_input, hist_speed, hist_dir, issued) for h in horizons}
+        return {h: out[0] for h, out in outputs.items()}, {h: out[1] for h, out in outputs.items()}
+
+    def _publish(self, results, states, source="manual"):
+        """
+        Terapkan hasil {horizon: Forecast} dan state buffer/chart-nya sekaligus (GUI thread),
+        simpan ke forecast store, lalu emit sekali ke QML.
+        """
+        stamp = datetime.now().strftime("%H:%M")
+        for h, forecast in results.items():
+            merge_prediction_state(self.models[h], states[h])
+            entry = {"timestamp": stamp, "speed": forecast.speed, "dir": forecast.direction, "horizon": h}
+            self._history_model.append(entry)
+            self._chart_models[h].set_items(self.models[h].get("chart", []))
+        self._results.update(results)
+        selected = self._results.get(self._selected_horizon)
+        if selected is not None:
+            self._latest_speed, self._latest_direction, self._prediction_expiry = selected.speed, selected.direction, selected.expiry
+        for h, forecast in results.items():
+            self.verifier.add(h, forecast.valid, forecast.speed, forecast.direction)
+        if self.store is not None:
+            try:
+                self.store.extend(results.items(), source=source)
+            except OSError as e:
+                print(f"[⚠️] Gagal menyimpan prediksi: {e}")
+        self.predictionChanged.emit()
+        self.predictionExpiryChanged.emit()
+        for h, forecast in results.items():
+            print(f"[✅] Prediksi {h}: {forecast.speed:.2f} m/s, {forecast.direction:.1f}°")
+
+    def _run(self, horizons, source="manual"):
+        inputs = self._prepare_inputs()
+        if inputs is None:
+            return
+        # Waktu terbit = saat input diambil (bukan saat worker selesai)
+        issued = time.time()
+        if not self.asynchronous:
+            self._publish(*self._infer(horizons, issued, *inputs), source=source)
+            return
+        # Satu worker (FIFO) → hasil tiba berurutan dan semuanya dipublikasikan
+        self._pending += 1
+        self._set_busy(True)
+        future = inference_executor().submit(self._infer, horizons, issued, *inputs)
+        future.add_done_callback(lambda f: self._inferenceDone.emit(source, f))
+
+    def _on_inference_done(self, source, future):
+        self._pending -= 1
+        self._set_busy(self._pending > 0)
+        try:
+            self._publish(*future.result(), source=source)
+        except Exception as e:
+            print(f"[❌] Gagal prediksi: {e}")
+            self._latest_speed = 0.0
+            self._latest_direction = 0.0
+
+    def _set_busy(self, busy):
+        if busy != self._busy:
+            self._busy = busy
+            self.busyChanged.emit()
 
     @pyqtSlot()
     def predictNow(self):
         try:
             print(f"[🔮] Melakukan prediksi untuk horizon {self._selected_horizon}...")
-            lag = self.sensor_manager.get_lag_features()
-            if all(v == 0.0 for v in lag.values()):
-               # print("[⛔] Prediksi dibatalkan: data history belum cukup untuk lag.")
-                self._prediction_expiry = "❌ Prediction Failed: buffer data not ready"
-                self.predictionExpiryChanged.emit()
-                return
-
-            data = dict(self.sensor_manager.latest_data)
-
-            # Fitur waktu
-            hour = datetime.now().hour
-            month = datetime.now().month
-            weekday = datetime.now().weekday()
-            sin_hour = np.sin(2 * np.pi * hour / 24)
-            cos_hour = np.cos(2 * np.pi * hour / 24)
-            sin_month = np.sin(2 * np.pi * month / 12)
-            cos_month = np.cos(2 * np.pi * month / 12)
-
-            # Semua calon fitur lengkap
-            full_input = {
-                "air_temp": data.get("temp_air", 0.0),
-                "relative_humid": data.get("humidity", 0.0),
-                "air_pressure": data.get("pressure", 0.0) / 1013.25,  # konversi dari hPa ke atm
-                "rain_duration": data.get("rain_duration", 0.0),
-                "rain_intensity": data.get("rain_intensity", 0.0),
-                "hour": hour,
-                "month": month,
-                "weekday": weekday,
-                "sin_hour": sin_hour,
-                "cos_hour": cos_hour,
-                "sin_month": sin_month,
-                "cos_month": cos_month,
-                "prev_windspeed": data.get("wind_speed_avg", 0.0),
-                "prev_sin_dir": np.sin(np.radians(data.get("wind_dir_avg", 0.0))),
-                "prev_cos_dir": np.cos(np.radians(data.get("wind_dir_avg", 0.0))),
-                **lag
-            }
-
-            # Hanya ambil fitur yang dibutuhkan sesuai horizon
-            from cuacane_app.utils.multi_predictor import FEATURE_ORDER
-            feature_keys = FEATURE_ORDER[self._selected_horizon]
-            filtered_input = {k: full_input.get(k, 0.0) for k in feature_keys}
-
-            # === Tambahkan buffer ke model sebelum prediksi ===
-            hist_speed = list(self.sensor_manager._history_dict["wind_speed_avg"])[-4:]
-            hist_dir = list(self.sensor_manager._history_dict["wind_dir_avg"])[-4:]
-
-            if len(hist_speed) < 4 or len(hist_dir) < 4:
-                #print("[⛔] Buffer dari history_dict belum cukup")
-                return
-
-            self.models[self._selected_horizon]["buffer_speed"] = hist_speed
-            self.models[self._selected_horizon]["buffer_dir"] = hist_dir
-
-         #   print(f"[✅] Buffer dimasukkan ke model {self._selected_horizon}:")
-          #  print("  speed_buffer =", self.models[self._selected_horizon]["buffer_speed"])
-           # print("  dir_buffer   =", self.models[self._selected_horizon]["buffer_dir"])
-
+            self._run((self._selected_horizon,))
 
-            speed, direction = predict_from_data(self.models, filtered_input, self._selected_horizon)
-
-            self._latest_speed = speed
-            self._latest_direction = direction
-            # Sesuaikan waktu validitas prediksi berdasarkan horizon
-            horizon_to_delta = {
-                "15m": timedelta(minutes=15),
-                "1h": timedelta(hours=1),
-                "3h": timedelta(hours=3),
-                "6h": timedelta(hours=6)
-            }
-            delta = horizon_to_delta.get(self._selected_horizon, timedelta(minutes=15))
-            self._prediction_expiry = (datetime.now() + delta).strftime("Valid Till %H:%M WIB")
+        except Exception as e:
+            print(f"[❌] Gagal prediksi: {e}")
+            self._latest_speed = 0.0
+            self._latest_direction = 0.0
 
+    def verify(self):
+        """Cocokkan forecast yang sudah jatuh tempo dengan history angin (dipanggil saat data baru masuk)."""
+        history = self.sensor_manager._history_dict
+        changed = self.verifier.verify(history["wind_speed_avg"], history["wind_dir_avg"])
+        if changed:
+            self.verificationChanged.emit()
+        return changed
 
-            self._history.append({
-                "timestamp": datetime.now().strftime("%H:%M"),
-                "speed": speed,
-                "dir": direction,
-                "horizon": self._selected_horizon
-            })
+    def predict_horizons(self, horizons, source="auto"):
+        """Prediksi horizon tertentu (dipakai ForecastScheduler)."""
+        try:
+            self._run(tuple(horizons), source)
+        except Exception as e:
+            print(f"[❌] Gagal prediksi {', '.join(horizons)}: {e}")
 
-            print(f"[✅] Prediksi: {speed:.2f} m/s, {direction:.1f}°")
-            self.predictionChanged.emit()
-            self.predictionExpiryChanged.emit()
+    @pyqtSlot()
+    def predictAll(self):
+        """Prediksi 15m/1h/3h/6h dengan satu kali bangun fitur; hasil dipublikasikan bersamaan."""
+        try:
+            print("[🔮] Melakukan prediksi untuk semua horizon...")
+            # Semua horizon dihitung dulu; QML baru diberi tahu setelah semuanya berhasil
+            self._run(HORIZONS)
 
         except Exception as e:
-            print(f"[❌] Gagal prediksi: {e}")
-            self._latest_speed = 0.0
-            self._latest_direction = 0.0
+            print(f"[❌] Gagal prediksi semua horizon: {e}")
+
+    @pyqtProperty(bool, notify=busyChanged)
+    def busy(self):
+        return self._busy
 
     @pyqtProperty(float, notify=predictionChanged)
     def predictionSpeed(self):
@@ -488,28 +845,51 @@ class MultiHorizonPredictionModel(QObject):
         return self._prediction_expiry
 
     @pyqtProperty(QVariant, notify=predictionChanged)
-    def predictionHistory(self):
-        return list(self._history)
-    
-    @pyqtProperty(bool, notify=predictionChanged)
+    def forecastAll(self):
+        forecasts = []
+        for h in HORIZONS:
+            if h in self._results:
+                f = self._results[h]
+                forecasts.append({"horizon": h, "speed": float(f.speed), "dir": float(f.direction), "expiry": f.expiry})
+        return forecasts
+
+    @pyqtProperty(QVariant, notify=verificationChanged)
+    def verification(self):
+        # NaN → None supaya QML bisa menampilkan "-"
+        return [
+            {k: (None if isinstance(v, float) and v != v else v) for k, v in row.items()}
+            for row in self.verifier.summary()
+        ]
+
+    def set_buffer_ready(self, ready):
+        # Hanya notifikasi saat status berubah, bukan tiap data masuk
+        if ready != self._buffer_ready:
+            self._buffer_ready = ready
+            self.bufferReadyChanged.emit()
+
+    @pyqtProperty(bool, notify=bufferReadyChanged)
     def bufferReady(self):
         return self._buffer_ready
     
-    @pyqtProperty(QVariant, notify=predictionChanged)
-    def chart15m(self):
-        return get_full_series_for_chart(self.models, "15m")
+    @pyqtProperty(QObject, constant=True)
+    def predictionHistoryModel(self):
+        return self._history_model
 
-    @pyqtProperty(QVariant, notify=predictionChanged)
-    def chart1h(self):
-        return get_full_series_for_chart(self.models, "1h")
+    @pyqtProperty(QObject, constant=True)
+    def chart15mModel(self):
+        return self._chart_models["15m"]
 
-    @pyqtProperty(QVariant, notify=predictionChanged)
-    def chart3h(self):
-        return get_full_series_for_chart(self.models, "3h")
+    @pyqtProperty(QObject, constant=True)
+    def chart1hModel(self):
+        return self._chart_models["1h"]
 
-    @pyqtProperty(QVariant, notify=predictionChanged)
-    def chart6h(self):
-        return get_full_series_for_chart(self.models, "6h")
+    @pyqtProperty(QObject, constant=True)
+    def chart3hModel(self):
+        return self._chart_models["3h"]
+
+    @pyqtProperty(QObject, constant=True)
+    def chart6hModel(self):
+        return self._chart_models["6h"]
 
 
 
@@ -0,0 +1,224 @@
+import time
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+
+import numpy as np
+
+# Urutan kolom record hasil parse (juga urutan kolom di realtime_log.csv)
+FIELDS = [
+    "datetime",
+    "wind_dir_avg", "wind_dir_min", "wind_dir_max",
+    "wind_speed_avg", "wind_speed_min", "wind_speed_max",
+    "temp_air", "temp_probe", "humidity", "pressure",
+    "rain_accum", "rain_duration", "rain_intensity",
+    "heating_temp", "voltage_supply",
+]
+NUMERIC_FIELDS = FIELDS[1:]
+# Arah angin dikirim sensor sebagai bilangan bulat
+DIRECTION_FIELDS = frozenset(("wind_dir_avg", "wind_dir_min", "wind_dir_max"))
+
+FIELD_INDEX = {name: i for i, name in enumerate(NUMERIC_FIELDS)}
+_NAN = float("nan")
+_EMPTY_VALUES = array("d", [_NAN] * len(NUMERIC_FIELDS))
+
+
+def format_epoch(ts, fmt="%Y-%m-%d %H:%M:%S"):
+    return datetime.fromtimestamp(ts).strftime(fmt)
+
+
+class SensorRecord(Mapping):
+    """
+    Satu pembacaan sensor: epoch (detik) + nilai numerik di array('d') (NaN = kosong).
+    Bisa dibaca seperti dict (hanya field yang ada); to_dict() untuk format lama/log.
+    """
+    __slots__ = ("ts", "_values")
+
+    def __init__(self, ts=None, values=None):
+        self.ts = ts
+        self._values = values if values is not None else _EMPTY_VALUES[:]
+
+    @classmethod
+    def from_dict(cls, data, ts=None):
+        from cuacane_app.utils.line_parser import timestamp_to_epoch
+
+        if ts is None and data.get("datetime"):
+            ts = timestamp_to_epoch(data["datetime"])
+        record = cls(ts)
+        values = record._values
+        for name, i in FIELD_INDEX.items():
+            value = data.get(name)
+            if value is not None:
+                values[i] = float(value)
+        return record
+
+    # === Akses nilai ===
+    def get_value(self, field):
+        """Nilai float mentah (NaN jika kosong), tanpa konversi tipe."""
+        return self._values[FIELD_INDEX[field]]
+
+    @property
+    def datetime(self):
+        return format_epoch(self.ts) if self.ts is not None else None
+
+    def __getitem__(self, key):
+        if key == "datetime":
+            if self.ts is None:
+                raise KeyError(key)
+            return self.datetime
+        value = self._values[FIELD_INDEX[key]]
+        if value != value:
+            raise KeyError(key)
+        return int(value) if key in DIRECTION_FIELDS else value
+
+    def __iter__(self):
+        if self.ts is not None:
+            yield "datetime"
+        for name, value in zip(NUMERIC_FIELDS, self._values):
+            if value == value:
+                yield name
+
+    def __len__(self):
+        return (self.ts is not None) + sum(1 for v in self._values if v == v)
+
+    def to_dict(self):
+        """Dict lengkap seperti output parse_0R0_line (None untuk field kosong)."""
+        out = {"datetime": self.datetime}
+        for name, value in zip(NUMERIC_FIELDS, self._values):
+            if value != value:
+                out[name] = None
+            else:
+                out[name] = int(value) if name in DIRECTION_FIELDS else value
+        return out
+
+    def merge(self, other):
+        """Timpa dengan nilai yang ada di record lain (field kosong tidak menghapus nilai lama)."""
+        values = self._values
+        for i, value in enumerate(other._values):
+            if value == value:
+                values[i] = value
+        if other.ts is not None:
+            self.ts = other.ts
+
+    def __repr__(self):
+        return f"SensorRecord({dict(self)})"
+
+
+class HistorySeries:
+    """
+    History satu field sebagai ring buffer NumPy berukuran tetap: epoch int64 + nilai float32.
+    Tiap sampel ditulis dua kali (i dan i + maxlen) sehingga N sampel terakhir selalu berupa
+    slice kontigu → timestamps()/values()/window() mengembalikan view tanpa copy, append O(1).
+    """
+    __slots__ = ("maxlen", "_ts", "_values", "_head", "_count", "appended")
+
+    def __init__(self, maxlen):
+        self.maxlen = int(maxlen)
+        if self.maxlen < 1:
+            raise ValueError(f"Kapasitas history harus > 0, bukan {maxlen}")
+        self._ts = np.zeros(2 * self.maxlen, dtype=np.int64)
+        self._values = np.full(2 * self.maxlen, np.nan, dtype=np.float32)
+        self._head = 0
+        self._count = 0
+        # Total sampel yang pernah masuk (untuk model QML yang update inkremental)
+        self.appended = 0
+
+    def append(self, ts, value):
+        i = self._head
+        j = i + self.maxlen
+        self._ts[i] = self._ts[j] = ts
+        self._values[i] = self._values[j] = value
+        self._head = i + 1 if i + 1 < self.maxlen else 0
+        if self._count < self.maxlen:
+            self._count += 1
+        self.appended += 1
+
+    def extend(self, ts, values):
+        """Tambah banyak sampel terurut sekaligus (mis. backfill); hanya maxlen terakhir yang disimpan."""
+        n = len(ts)
+        if not n:
+            return
+        k = min(n, self.maxlen)
+        idx = (self._head + np.arange(k)) % self.maxlen
+        self._ts[idx] = self._ts[idx + self.maxlen] = np.asarray(ts)[-k:]
+        self._values[idx] = self._values[idx + self.maxlen] = np.asarray(values)[-k:]
+        self._head = (self._head + k) % self.maxlen
+        self._count = min(self._count + k, self.maxlen)
+        self.appended += n
+
+    def resize(self, maxlen):
+        """Ubah kapasitas (mis. dari pengaturan), sampel terbaru dipertahankan."""
+        if int(maxlen) < 1:
+            raise ValueError(f"Kapasitas history harus > 0, bukan {maxlen}")
+        ts, values = self.timestamps()[-maxlen:].copy(), self.values()[-maxlen:].copy()
+        appended = self.appended
+        self.__init__(maxlen)
+        self.appended = appended
+        n = len(ts)
+        self._ts[:n] = self._ts[self.maxlen:self.maxlen + n] = ts
+        self._values[:n] = self._values[self.maxlen:self.maxlen + n] = values
+        self._count = n
+        self._head = n % self.maxlen
+
+    def __len__(self):
+        return self._count
+
+    def _span(self):
+        end = self._head + self.maxlen
+        return end - self._count, end
+
+    def __getitem__(self, i):
+        n = self._count
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("history index out of range")
+        i += self._span()[0]
+        return int(self._ts[i]), py_floats(self._values[i:i + 1])[0]
+
+    def __iter__(self):
+        return zip(self.timestamps().tolist(), py_floats(self.values()))
+
+    def timestamps(self):
+        lo, hi = self._span()
+        return self._ts[lo:hi]
+
+    def values(self):
+        lo, hi = self._span()
+        return self._values[lo:hi]
+
+    def window(self, start=None, end=None):
+        """View (epoch, nilai) untuk start <= epoch < end, dengan binary search."""
+        ts = self.timestamps()
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="left"))
+        hi = max(lo, hi)
+        return ts[lo:hi], self.values()[lo:hi]
+
+    def to_qml(self, start=None, end=None):
+        ts, values = self.window(start, end)
+        return [{"value": value, "timestamp": label} for value, label in zip(py_floats(values), format_clock(ts))]
+
+
+def records_from_columns(columns):
+    """Kolom NumPy (hasil parse_many + "epoch") → list SensorRecord per baris."""
+    matrix = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in NUMERIC_FIELDS])
+    return [SensorRecord(ts, array("d", row)) for ts, row in zip(columns["epoch"].tolist(), matrix.tolist())]
+
+
+def py_floats(values):
+    # float32 → float Python dengan representasi terpendek (25.3, bukan 25.299999237...)
+    return [float(v) for v in values.astype(str)]
+
+def format_clock(epochs):
+    """Label "HH:MM:SS" (waktu lokal) untuk array epoch, tanpa strftime per elemen."""
+    if not len(epochs):
+        return []
+    first, last = int(epochs[0]), int(epochs[-1])
+    offset = time.localtime(last).tm_gmtoff
+    if time.localtime(first).tm_gmtoff != offset:
+        return [format_epoch(ts, "%H:%M:%S") for ts in epochs.tolist()]
+    seconds = (np.asarray(epochs, dtype=np.int64) + offset) % 86400
+    return [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seconds.tolist()]
@@ -0,0 +1,240 @@
+import socket
+from abc import ABC, abstractmethod
+from urllib.parse import urlparse, parse_qs
+
+try:
+    import serial  # pyserial, opsional: hanya dibutuhkan untuk koneksi serial langsung
+except ImportError:
+    serial = None
+
+LINE_PREFIX = b"0R0"
+
+
+class SensorSource(ABC):
+    """
+    Antarmuka sumber data untuk IngestionWorker.
+    read() mengembalikan list raw line 0R0 baru ([] jika belum ada), atau None jika
+    sumber gagal/terputus (worker akan backoff lalu mencoba lagi).
+    Subclass tanpa read() gagal saat dibuat, bukan di thread worker.
+    """
+    name = "source"
+    poll_interval = 5.0          # 0 → streaming, read() menunggu data sampai timeout
+    dedupe_repeats = False       # True → raw yang sama berulang dianggap "data masih sama"
+    supports_backfill = False
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    @abstractmethod
+    def read(self, timeout=1.0):
+        """List raw line baru, [] jika belum ada, None jika sumber gagal."""
+
+    def fetch_range(self, start, end):
+        # Default: sumber tanpa dukungan rentang tidak punya data backfill
+        return iter(())
+
+
+class CloudSource(SensorSource):
+    """Polling /latest_raw di cloud relay (default)."""
+    name = "cloud"
+    poll_interval = 5.0
+    dedupe_repeats = True
+
+    def __init__(self, fetch_latest, fetch_range=None, poll_interval=5.0, close=None):
+        self._fetch_latest = fetch_latest
+        self._fetch_range = fetch_range
+        self._close = close
+        self.poll_interval = poll_interval
+        self.supports_backfill = fetch_range is not None
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+
+    def read(self, timeout=None):
+        raw_line = self._fetch_latest()
+        if raw_line is None:
+            return None
+        return [raw_line] if raw_line else []
+
+    def fetch_range(self, start, end):
+        if self._fetch_range is None:
+            return super().fetch_range(start, end)
+        return self._fetch_range(start, end)
+
+
+class LineFramer:
+    """
+    Framing stream byte WXT520 menjadi line 0R0.
+    Sampah di antara frame dibuang dan parser resync ke prefix "0R0" berikutnya.
+    """
+
+    def __init__(self, max_line=512, prefix=LINE_PREFIX):
+        self.max_line = max_line
+        self.prefix = prefix
+        self._buf = bytearray()
+        self.lines = 0
+        self.garbage_bytes = 0
+
+    def feed(self, data):
+        self._buf += data
+        out = []
+        while True:
+            end = self._find_line_end()
+            if end < 0:
+                break
+            frame = bytes(self._buf[:end])
+            del self._buf[:end + 1]
+            line = self._extract(frame)
+            if line:
+                out.append(line)
+
+        # Tidak ada terminator terlalu lama → resync ke prefix terakhir
+        if len(self._buf) > self.max_line:
+            idx = self._buf.rfind(self.prefix)
+            cut = idx if idx > 0 else len(self._buf)
+            self.garbage_bytes += cut
+            del self._buf[:cut]
+        return out
+
+    def _find_line_end(self):
+        ends = [i for i in (self._buf.find(b"\n"), self._buf.find(b"\r")) if i >= 0]
+        return min(ends) if ends else -1
+
+    def _extract(self, frame):
+        if not frame.strip():
+            return None
+        idx = frame.rfind(self.prefix)
+        if idx < 0:
+            self.garbage_bytes += len(frame)
+            return None
+        self.garbage_bytes += idx
+        try:
+            line = frame[idx:].decode("ascii").strip()
+        except UnicodeDecodeError:
+            self.garbage_bytes += len(frame) - idx
+            return None
+        self.lines += 1
+        return line
+
+
+class StreamSource(SensorSource):
+    """Basis untuk sumber streaming (TCP/serial) pada cadence native sensor."""
+    poll_interval = 0.0
+
+    def __init__(self):
+        self.framer = LineFramer()
+        self._connected = False
+
+    def read(self, timeout=1.0):
+        if not self._connected:
+            self.open()
+            self._connected = True
+        try:
+            data = self._recv(timeout)
+        except (socket.timeout, TimeoutError):
+            return []
+        except OSError as e:
+            print(f"[⛔] Stream {self.name} terputus: {e}")
+            self.close()
+            return None
+        if data is None:
+            print(f"[⛔] Stream {self.name} ditutup oleh perangkat.")
+            self.close()
+            return None
+        return self.framer.feed(data)
+
+    @abstractmethod
+    def _recv(self, timeout):
+        """Byte mentah dari perangkat, None jika koneksi ditutup."""
+
+
+class TcpSource(StreamSource):
+    """Stream 0R0 dari serial-to-ethernet converter / TCP server."""
+    name = "tcp"
+
+    def __init__(self, host, port, connect_timeout=5.0):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self._sock = None
+
+    def open(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        print(f"[🔌] Terhubung ke sensor TCP {self.host}:{self.port}")
+
+    def close(self):
+        self._connected = False
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _recv(self, timeout):
+        self._sock.settimeout(timeout)
+        data = self._sock.recv(4096)
+        return data or None
+
+
+class SerialSource(StreamSource):
+    """Stream 0R0 langsung dari port serial WXT520 (butuh pyserial)."""
+    name = "serial"
+
+    def __init__(self, port, baudrate=19200):
+        super().__init__()
+        self.port = port
+        self.baudrate = baudrate
+        self._ser = None
+
+    def open(self):
+        if serial is None:
+            raise RuntimeError("pyserial belum terpasang (pip install pyserial)")
+        self._ser = serial.Serial(self.port, self.baudrate, timeout=1.0)
+        print(f"[🔌] Terhubung ke sensor serial {self.port} @ {self.baudrate}")
+
+    def close(self):
+        self._connected = False
+        if self._ser is not None:
+            try:
+                self._ser.close()
+            except Exception:
+                pass
+            self._ser = None
+
+    def _recv(self, timeout):
+        self._ser.timeout = timeout
+        return self._ser.read(self._ser.in_waiting or 1)
+
+
+def make_source(spec="cloud"):
+    """
+    Buat sumber data dari string konfigurasi:
+      cloud | https://relay-lain | tcp://host:port | serial:///dev/ttyUSB0?baudrate=19200 | serial://COM3
+      replay://cuacane_app/data_logs/realtime_log.csv?speed=10 (speed=max untuk secepatnya)
+    """
+    from cuacane_app.utils.cloud_client import CloudClient
+
+    spec = (spec or "cloud").strip()
+    url = urlparse(spec)
+    query = parse_qs(url.query)
+    if spec == "cloud" or url.scheme in ("http", "https"):
+        # Client sendiri per sumber: ETag/cursor dan Session tidak dibagi antar stasiun (thread worker)
+        client = CloudClient() if spec == "cloud" else CloudClient(base_url=spec)
+        return CloudSource(client.fetch_latest_raw, client.fetch_raw_range, close=client.close)
+    if url.scheme == "tcp":
+        return TcpSource(url.hostname, url.port)
+    if url.scheme == "serial":
+        port = url.netloc + url.path
+        baudrate = int(query.get("baudrate", ["19200"])[0])
+        return SerialSource(port, baudrate=baudrate)
+    if url.scheme == "replay":
+        from cuacane_app.utils.replay import ReplaySource
+        speed = query.get("speed", ["1"])[0]
+        return ReplaySource(url.netloc + url.path, speed=0.0 if speed == "max" else float(speed))
+    raise ValueError(f"Sumber data tidak dikenal: {spec}")
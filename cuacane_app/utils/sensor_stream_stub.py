@@ -0,0 +1,68 @@
+import os
+import socket
+import threading
+import time
+
+
+class TcpSensorStub:
+    """
+    Pengganti WXT520 di jaringan untuk test: server TCP yang mengirim chunk byte
+    (line 0R0, boleh berisi sampah/terpotong) ke client yang terhubung.
+    """
+
+    def __init__(self, chunks, interval=0.0, host="127.0.0.1", port=0, close_after=True):
+        self.chunks = list(chunks)
+        self.interval = interval
+        self.close_after = close_after
+        self.clients = 0
+        self._server = socket.create_server((host, port))
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def address(self):
+        return self._server.getsockname()[:2]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._server.close()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.clients += 1
+            with conn:
+                for chunk in self.chunks:
+                    if self._stop.is_set():
+                        return
+                    conn.sendall(chunk)
+                    if self.interval:
+                        time.sleep(self.interval)
+                if not self.close_after:
+                    self._stop.wait()
+
+
+class PtySensorStub:
+    """Pengganti port serial: pasangan pseudo-terminal, sisi slave dibuka oleh SerialSource."""
+
+    def __init__(self):
+        import tty
+        self.master_fd, slave_fd = os.openpty()
+        tty.setraw(slave_fd)
+        self.port = os.ttyname(slave_fd)
+        self._slave_fd = slave_fd
+
+    def write(self, data):
+        os.write(self.master_fd, data)
+
+    def close(self):
+        os.close(self.master_fd)
+        os.close(self._slave_fd)
@@ -0,0 +1,51 @@
+import json
+import os
+
+STATIONS_PATH = "cuacane_app/stations.json"
+LOG_DIR = "cuacane_app/data_logs"
+
+# Stasiun bawaan (satu mast, perilaku lama aplikasi)
+DEFAULT_STATION = {
+    "id": "default",
+    "name": "WXT520",
+    "lat": -6.8877831363571,
+    "lon": 107.60727549580955,
+    "source": "cloud",
+    "log_path": os.path.join(LOG_DIR, "realtime_log.csv"),
+}
+
+
+def load_station_configs(path=None):
+    """
+    Baca daftar stasiun dari JSON (CUACANE_STATIONS atau cuacane_app/stations.json).
+    Tanpa file konfigurasi → satu stasiun bawaan.
+    """
+    path = path or os.environ.get("CUACANE_STATIONS", STATIONS_PATH)
+    default = dict(DEFAULT_STATION, source=os.environ.get("CUACANE_SOURCE", "cloud"))
+    if not path or not os.path.exists(path):
+        return [default]
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    entries = raw.get("stations", []) if isinstance(raw, dict) else raw
+
+    configs = []
+    seen = set()
+    for entry in entries:
+        station_id = str(entry.get("id", "")).strip()
+        if not station_id or station_id in seen:
+            print(f"[⚠️] Konfigurasi stasiun dilewati (id kosong/duplikat): {entry}")
+            continue
+        seen.add(station_id)
+
+        cfg = dict(default)
+        cfg.update(entry)
+        cfg["id"] = station_id
+        cfg["name"] = entry.get("name", station_id)
+        cfg["lat"] = float(cfg["lat"])
+        cfg["lon"] = float(cfg["lon"])
+        if "log_path" not in entry and station_id != DEFAULT_STATION["id"]:
+            cfg["log_path"] = os.path.join(LOG_DIR, station_id, "realtime_log.csv")
+        configs.append(cfg)
+
+    return configs or [default]
@@ -0,0 +1,319 @@
+import math
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal, pyqtProperty
+
+from cuacane_app.utils.sensor_record import format_clock, py_floats
+
+HEAD_LOOKAHEAD = 4  # item baru di depan yang masih ditoleransi sebelum model di-reset
+
+
+class HistoryListModel(QAbstractTableModel):
+    """
+    Model list untuk history satu field (HistorySeries), opsional hanya N sampel terakhir.
+    (QAbstractTableModel karena VXYModelMapper butuh >1 kolom; Repeater QML memakai baris.)
+    sync() hanya mengirim rowsRemoved (sampel tergusur) dan rowsInserted (sampel baru),
+    sehingga delegate/VXYModelMapper di QML tidak membangun ulang seluruh grafik.
+    Kolom 0 = nomor sampel (x), kolom 1 = nilai (y) untuk VXYModelMapper.
+    """
+    SampleRole = Qt.UserRole + 1
+    ValueRole = Qt.UserRole + 2
+    EpochRole = Qt.UserRole + 3
+    TimestampRole = Qt.UserRole + 4
+
+    rangeChanged = pyqtSignal()
+
+    def __init__(self, series=None, window=0, parent=None):
+        super().__init__(parent)
+        self._series = series
+        self._window = window
+        self._first = 0  # nomor sampel (series.appended) baris 0
+        self._rows = 0
+        self._reset_state()
+
+    def _target(self):
+        # (nomor sampel pertama, jumlah baris) yang seharusnya tampil sekarang
+        if self._series is None:
+            return 0, 0
+        n = len(self._series)
+        rows = min(n, self._window) if self._window else n
+        return self._series.appended - rows, rows
+
+    def _reset_state(self):
+        self._first, self._rows = self._target()
+
+    def set_series(self, series):
+        """Ganti sumber (mis. stasiun aktif/field berubah/resize) → reset model."""
+        self.beginResetModel()
+        self._series = series
+        self._reset_state()
+        self.endResetModel()
+        self.rangeChanged.emit()
+
+    def set_window(self, window):
+        self._window = window
+        self.set_series(self._series)
+
+    def sync(self):
+        """Sesuaikan baris dengan isi series: hapus yang tergusur di depan, sisipkan yang baru di belakang."""
+        if self._series is None:
+            return
+        first, rows = self._target()
+        if first == self._first and rows == self._rows:
+            return
+        if first < self._first or first >= self._first + self._rows:
+            # Tidak ada baris yang tetap (atau series mundur) → reset
+            self.set_series(self._series)
+            return
+
+        removed = first - self._first
+        if removed:
+            self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+            self._first = first
+            self._rows -= removed
+            self.endRemoveRows()
+        if rows > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, rows - 1)
+            self._rows = rows
+            self.endInsertRows()
+        self.rangeChanged.emit()
+
+    # === QAbstractTableModel ===
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def roleNames(self):
+        return {
+            self.SampleRole: b"sample",
+            self.ValueRole: b"value",
+            self.EpochRole: b"epoch",
+            self.TimestampRole: b"timestamp",
+        }
+
+    def _pos(self, row):
+        # Posisi di series untuk baris ini (sampel tertua di series = appended - len)
+        return self._first + row - (self._series.appended - len(self._series))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < self._rows:
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            role = self.SampleRole if index.column() == 0 else self.ValueRole
+        if role == self.SampleRole:
+            return self._first + row
+        pos = self._pos(row)
+        if not 0 <= pos < len(self._series):
+            return None
+        epoch, value = self._series[pos]
+        if role == self.ValueRole:
+            return value
+        if role == self.EpochRole:
+            return epoch
+        if role == self.TimestampRole:
+            return format_clock(self._series.timestamps()[pos:pos + 1])[0]
+        return None
+
+    # === Rentang untuk sumbu grafik ===
+    def _window_values(self):
+        if not self._rows:
+            return None
+        lo = self._pos(0)
+        return self._series.values()[lo:lo + self._rows]
+
+    @pyqtProperty(int, notify=rangeChanged)
+    def count(self):
+        return self._rows
+
+    @pyqtProperty(int, notify=rangeChanged)
+    def firstSample(self):
+        return self._first
+
+    @pyqtProperty(int, notify=rangeChanged)
+    def lastSample(self):
+        return self._first + self._rows - 1
+
+    @pyqtProperty(float, notify=rangeChanged)
+    def minValue(self):
+        values = self._window_values()
+        return float(values.min()) if values is not None else math.nan
+
+    @pyqtProperty(float, notify=rangeChanged)
+    def maxValue(self):
+        values = self._window_values()
+        return float(values.max()) if values is not None else math.nan
+
+
+class ItemListModel(QAbstractTableModel):
+    """
+    Model list untuk item dict (grafik & riwayat prediksi). set_items() membandingkan
+    dengan isi lama: jika hanya ada item baru di belakang dan/atau item lama hilang di
+    depan, yang dikirim cukup rowsRemoved/rowsInserted; selain itu model di-reset.
+    Kolom 0 = nomor sampel (tetap selama item masih ada, seperti HistoryListModel),
+    kolom berikutnya = field sesuai urutan `fields`.
+    """
+    countChanged = pyqtSignal()
+
+    def __init__(self, fields, maxlen=None, parent=None):
+        super().__init__(parent)
+        self.fields = list(fields)
+        self.maxlen = maxlen
+        self._items = []
+        self._first = 0  # nomor sampel baris 0; ikut bergeser saat item di depan dibuang/disisipkan
+        self._roles = {Qt.UserRole + 1 + i: name for i, name in enumerate(self.fields)}
+        if "sample" not in self.fields:
+            self._roles[Qt.UserRole + 1 + len(self.fields)] = "sample"
+
+    @property
+    def items(self):
+        return list(self._items)
+
+    def append(self, item):
+        """Tambah satu item di belakang; item terdepan dibuang jika melebihi maxlen."""
+        if self.maxlen is not None and len(self._items) >= self.maxlen:
+            self._remove_front(len(self._items) - self.maxlen + 1)
+        n = len(self._items)
+        self.beginInsertRows(QModelIndex(), n, n)
+        self._items.append(dict(item))
+        self.endInsertRows()
+        self.countChanged.emit()
+
+    def _remove_front(self, k):
+        if k <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, k - 1)
+        del self._items[:k]
+        self._first += k
+        self.endRemoveRows()
+
+    def set_items(self, items):
+        items = [dict(item) for item in items]
+        if self.maxlen is not None:
+            items = items[-self.maxlen:]
+        old = self._items
+        # Cari bagian yang sama: items[head:head+same] == old[shift:shift+same].
+        # head = item baru di depan (mis. bucket pertama downsampling yang bergeser)
+        shift = head = None
+        for j in range(min(len(items), HEAD_LOOKAHEAD)):
+            shift = next((k for k, item in enumerate(old) if item == items[j]), None)
+            if shift is not None:
+                head = j
+                break
+        same = 0
+        if shift is not None:
+            limit = min(len(old) - shift, len(items) - head)
+            while same < limit and old[shift + same] == items[head + same]:
+                same += 1
+
+        if not old:
+            if items:
+                self.beginInsertRows(QModelIndex(), 0, len(items) - 1)
+                self._items = items
+                self.endInsertRows()
+        elif not same:
+            self.beginResetModel()
+            self._items = items
+            self.endResetModel()
+        else:
+            self._remove_front(shift)
+            if len(self._items) > same:
+                # Ekor lama yang berubah (mis. bucket terbuka) diganti
+                self.beginRemoveRows(QModelIndex(), same, len(self._items) - 1)
+                del self._items[same:]
+                self.endRemoveRows()
+            if head:
+                self.beginInsertRows(QModelIndex(), 0, head - 1)
+                self._items[:0] = items[:head]
+                self._first -= head
+                self.endInsertRows()
+            if len(items) > len(self._items):
+                n = len(self._items)
+                self.beginInsertRows(QModelIndex(), n, len(items) - 1)
+                self._items.extend(items[n:])
+                self.endInsertRows()
+        self.countChanged.emit()
+
+    # === QAbstractTableModel ===
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.fields) + 1
+
+    def roleNames(self):
+        return {role: name.encode() for role, name in self._roles.items()}
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        item = self._items[index.row()]
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return self._first + index.row()
+            return item.get(self.fields[index.column() - 1])
+        name = self._roles.get(role)
+        if name == "sample":
+            return item.get("sample", self._first + index.row())
+        return item.get(name) if name is not None else None
+
+    @pyqtProperty(int, notify=countChanged)
+    def count(self):
+        return len(self._items)
+
+    @pyqtProperty(int, notify=countChanged)
+    def firstSample(self):
+        return self._first
+
+    @pyqtProperty(int, notify=countChanged)
+    def lastSample(self):
+        return self._first + len(self._items) - 1
+
+
+class DownsampledListModel(ItemListModel):
+    """
+    Titik hasil downsampling (LTTB/min-max) untuk grafik history jendela panjang.
+    Antarmukanya sama dengan HistoryListModel (kolom 0 = nomor sampel, 1 = nilai;
+    role sample/value/timestamp; properti rentang) sehingga QML bisa bertukar model.
+    """
+    rangeChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(["sample", "value", "timestamp"], parent=parent)
+        self._min = math.nan
+        self._max = math.nan
+
+    def set_points(self, samples, epochs, values):
+        """Isi dari DownsampledSeries.points(); hanya baris yang berubah yang dikirim ke QML."""
+        self.set_items(
+            {"sample": sample, "value": value, "timestamp": label}
+            for sample, value, label in zip(samples.tolist(), py_floats(values), format_clock(epochs))
+        )
+        self._min = float(values.min()) if len(values) else math.nan
+        self._max = float(values.max()) if len(values) else math.nan
+        self.rangeChanged.emit()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid() and 0 <= index.row() < len(self._items):
+            return self._items[index.row()]["sample" if index.column() == 0 else "value"]
+        return super().data(index, role)
+
+    @pyqtProperty(int, notify=rangeChanged)
+    def firstSample(self):
+        return self._items[0]["sample"] if self._items else 0
+
+    @pyqtProperty(int, notify=rangeChanged)
+    def lastSample(self):
+        return self._items[-1]["sample"] if self._items else 0
+
+    @pyqtProperty(float, notify=rangeChanged)
+    def minValue(self):
+        return self._min
+
+    @pyqtProperty(float, notify=rangeChanged)
+    def maxValue(self):
+        return self._max
@@ -1,9 +1,21 @@
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty, QSettings, pyqtSlot
 
+# Kapasitas ring buffer history per field (sampel); 17280 × 5 detik = 24 jam
+DEFAULT_HISTORY_CAPACITY = 17280
+# Minimal 4 sampel: fitur lag prediksi butuh 4 nilai terakhir
+MIN_HISTORY_CAPACITY = 4
+
+
+def load_history_capacity():
+    """Baca kapasitas history dari QSettings tanpa membuat SettingsManager."""
+    settings = QSettings("CuacaneApp", "UserPreferences")
+    return max(MIN_HISTORY_CAPACITY, settings.value("historyCapacity", DEFAULT_HISTORY_CAPACITY, type=int))
+
 class SettingsManager(QObject):
     darkModeChanged = pyqtSignal()
     languageIndexChanged = pyqtSignal()
     uiScaleChanged = pyqtSignal()
+    historyCapacityChanged = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -11,6 +23,7 @@ class SettingsManager(QObject):
         self._dark_mode = self.settings.value("darkMode", False, type=bool)
         self._language_index = self.settings.value("languageIndex", 0, type=int)
         self._ui_scale = self.settings.value("uiScale", 1.0, type=float)  # ✅ Tambahan
+        self._history_capacity = load_history_capacity()
 
     @pyqtProperty(bool, notify=darkModeChanged)
     def darkMode(self):
@@ -45,3 +58,16 @@ class SettingsManager(QObject):
             self._ui_scale = scale
             self.settings.setValue("uiScale", scale)
             self.uiScaleChanged.emit()
+
+    # ✅ Panjang history (sampel per field)
+    @pyqtProperty(int, notify=historyCapacityChanged)
+    def historyCapacity(self):
+        return self._history_capacity
+
+    @pyqtSlot(int)
+    def setHistoryCapacity(self, capacity):
+        capacity = max(MIN_HISTORY_CAPACITY, capacity)
+        if self._history_capacity != capacity:
+            self._history_capacity = capacity
+            self.settings.setValue("historyCapacity", capacity)
+            self.historyCapacityChanged.emit()
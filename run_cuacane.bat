@@ -25,6 +25,10 @@ set PYTHONPATH=%cd%
 set QTWEBENGINE_DISABLE_SANDBOX=1
 set QT_OPENGL=angle
 
+REM Sumber data sensor (default cloud). Contoh koneksi langsung:
+REM set CUACANE_SOURCE=tcp://192.168.1.50:4001
+REM set CUACANE_SOURCE=serial://COM3?baudrate=19200
+
 REM ✅ Jalankan langsung main.py, BUKAN -m
 echo.
 echo [INFO] Menjalankan Cuacane App...
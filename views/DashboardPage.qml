@@ -12,7 +12,10 @@ Item {
 
     property var currentData: sensorManager.latest_data_qml
     property string selectedParameter: "temp_air"
-    property var chartModel: []
+    // 15 titik terakhir (model mentah) atau jendela panjang: LTTB dari memori, atau rollup
+    // di disk bila melebihi kapasitas history
+    property int chartWindow: 15
+    property var chartModel: chartWindow > 15 ? sensorManager.historyRangeModel : sensorManager.historyChartModel
     property bool showLabels: true
     property real scaleFactor: settingsManager.uiScale
 
@@ -38,6 +41,23 @@ Item {
                     color: settingsManager.darkMode ? Theme.darkText : Theme.lightText
                 }
 
+                // Pilih stasiun (hanya tampil jika lebih dari satu mast)
+                ComboBox {
+                    id: stationSelector
+                    visible: sensorManager.stationList.length > 1
+                    model: sensorManager.stationList
+                    textRole: "name"
+                    font.pixelSize: 18 * scaleFactor
+                    currentIndex: {
+                        var stations = sensorManager.stationList
+                        for (var i = 0; i < stations.length; ++i) {
+                            if (stations[i].id === sensorManager.currentStation) return i
+                        }
+                        return 0
+                    }
+                    onActivated: sensorManager.setCurrentStation(sensorManager.stationList[index].id)
+                }
+
                 Item { Layout.fillWidth: true }
 
                 Label {
@@ -95,7 +115,7 @@ Item {
                             anchors.fill: parent
                             onClicked: {
                                 selectedParameter = modelData.key
-                                updateGraph(selectedParameter)
+                                sensorManager.setChartParameter(selectedParameter)
                             }
                         }
 
@@ -145,7 +165,7 @@ Item {
                     title: "History: " + selectedParameter
                     titleFont.pixelSize: 20 * scaleFactor
 
-                    ValueAxis { id: xAxis; min: 0; max: 14; titleText: "Index" }
+                    ValueAxis { id: xAxis; min: 0; max: 14; titleText: "Sample" }
                     ValueAxis { id: yAxis; min: 0; max: 14; titleText: "Value" }
 
                     LineSeries {
@@ -153,14 +173,43 @@ Item {
                         axisX: xAxis
                         axisY: yAxis
                         name: selectedParameter
-                        pointsVisible: true
+                        pointsVisible: chartWindow <= 15
+                    }
+
+                    // Titik grafik mengikuti rowsInserted/rowsRemoved dari model (tanpa clear + append ulang)
+                    VXYModelMapper {
+                        model: chartModel
+                        series: series
+                        xColumn: 0
+                        yColumn: 1
                     }
                 }
 
 
+                // Pilihan jendela history; jendela panjang diperkecil ke lebar plot
+                ComboBox {
+                    id: rangeSelector
+                    anchors.top: parent.top
+                    anchors.right: parent.right
+                    anchors.margins: 8 * scaleFactor
+                    z: 10
+                    textRole: "label"
+                    model: [
+                        { label: "15 titik", samples: 15 },
+                        { label: "1 jam", samples: 720 },
+                        { label: "6 jam", samples: 4320 },
+                        { label: "24 jam", samples: 17280 },
+                        { label: "7 hari", samples: 120960 }
+                    ]
+                    onActivated: {
+                        chartWindow = model[index].samples
+                        sensorManager.setChartRange(chartWindow, Math.round(chartView.plotArea.width))
+                    }
+                }
+
                 Loader {
                     id: chartLabels
-                    active: showLabels
+                    active: showLabels && chartWindow <= 15
                     asynchronous: true
                     sourceComponent: labelOverlayComponent
                 }
@@ -177,15 +226,15 @@ Item {
                             delegate: Item {
                                 width: 1; height: 1
 
-                                property var pt: (typeof modelData.value === 'number' && !isNaN(modelData.value))
-                                                ? chartView.mapToPosition(Qt.point(modelData.index, modelData.value), series)
+                                property var pt: (typeof model.value === 'number' && !isNaN(model.value))
+                                                ? chartView.mapToPosition(Qt.point(model.sample, model.value), series)
                                                 : Qt.point(0, 0)
 
                                 Text {
                                     visible: !isNaN(pt.x) && !isNaN(pt.y)
                                     x: pt.x - 15 * scaleFactor
                                     y: pt.y - 30 * scaleFactor
-                                    text: (typeof modelData.value === "number") ? modelData.value.toFixed(2) : "-"
+                                    text: (typeof model.value === "number") ? model.value.toFixed(2) : "-"
                                     font.pixelSize: 12 * scaleFactor
                                     color: settingsManager.darkMode ? Theme.darkText : "black"
                                     z: 100
@@ -195,7 +244,7 @@ Item {
                                     visible: !isNaN(pt.x) && !isNaN(pt.y)
                                     x: pt.x - 15 * scaleFactor
                                     y: pt.y - 15 * scaleFactor
-                                    text: modelData.timestamp !== undefined ? modelData.timestamp : ""
+                                    text: model.timestamp !== undefined ? model.timestamp : ""
                                     font.pixelSize: 10 * scaleFactor
                                     color: settingsManager.darkMode ? "#aaa" : "gray"
                                     z: 100
@@ -208,48 +257,17 @@ Item {
         }
     }
 
+    // Sumbu & label grafik disesuaikan saat isi model berubah
     Connections {
-        target: sensorManager
-        function onLatestDataChanged() {
-            updateGraph(selectedParameter)
-        }
-    }
-
-    function updateChartModel(paramKey) {
-        chartModel = []
-        var history = sensorManager["history_" + paramKey] || []
-        var timestamp = Qt.formatTime(new Date(), "hh:mm:ss")
-        for (var i = 0; i < history.length; ++i) {
-            chartModel.push({ index: i, value: history[i], timestamp: timestamp })
+        target: chartModel
+        function onRangeChanged() {
+            updateAxes(selectedParameter)
         }
     }
 
-    // --- Update fungsi updateGraph() ---
-    function updateGraph(paramKey) {
-        series.clear()
-        chartModel = []
-
-        var history = sensorManager["history_" + paramKey] || []
-        var limitedHistory = history.slice(-15)
-
-        var minY = Number.POSITIVE_INFINITY
-        var maxY = Number.NEGATIVE_INFINITY
-
-        for (var i = 0; i < limitedHistory.length; ++i) {
-            let item = limitedHistory[i]
-            let val = (typeof item === 'object') ? item.value : item
-            let timeLabel = (typeof item === 'object') ? item.timestamp : Qt.formatTime(new Date(), "hh:mm")
-
-            if (typeof val === "number" && isFinite(val)) {
-                series.append(i, val)
-                chartModel.push({ index: i, value: val, timestamp: timeLabel })
-                if (val < minY) minY = val
-                if (val > maxY) maxY = val
-            } else {
-                // tetap push timestamp agar overlay tidak error
-                chartModel.push({ index: i, value: NaN, timestamp: timeLabel })
-            }
-        }
+    function updateAxes(paramKey) {
+        var minY = chartModel.minValue
+        var maxY = chartModel.maxValue
 
         // fallback jika belum ada data valid
         if (!isFinite(minY) || !isFinite(maxY)) {
@@ -272,12 +290,15 @@ Item {
         }
         yAxis.max = maxY + pad
 
-        // X axis: dari 0 sampai jumlah titik-1 (min 10 supaya enak dilihat)
-        xAxis.min = 0
-        xAxis.max = Math.max(limitedHistory.length - 1, 10)
+        // X axis: nomor sampel pertama s/d terakhir (min 10 titik supaya enak dilihat)
+        xAxis.min = chartModel.firstSample
+        xAxis.max = Math.max(chartModel.lastSample, chartModel.firstSample + 10)
 
         // Refresh overlay label (timestamp di atas titik)
         showLabels = false
         Qt.callLater(function(){ showLabels = true })
     }
+
+    onChartModelChanged: updateAxes(selectedParameter)
+    Component.onCompleted: updateAxes(selectedParameter)
 }
@@ -148,7 +148,7 @@ Item {
     // === Perbaiki Connections: gunakan function handler ===
     Connections {
         target: sensorManager
-        function onLatestDataChanged() {
+        function onDispersionStateChanged() {
             isSimulating = sensorManager.isDispersionRunning
         }
     }
@@ -15,15 +15,8 @@ Item {
     property var speedText: "-"
     property var chartModel: []
     property bool showLabels: false
-    property string bufferStatusText: "⏳ Buffer not Enough"
-    property var dirChartModel: []
-    property var speedChartModel: []
-    property var chart1hDirModel: []
-    property var chart1hSpeedModel: []
-    property var chart3hDirModel: []
-    property var chart3hSpeedModel: []
-    property var chart6hDirModel: []
-    property var chart6hSpeedModel: []
+    // Binding ke bufferReady (NOTIFY bufferReadyChanged), tidak ikut tiap predictionChanged
+    property string bufferStatusText: windPredictionModel.bufferReady ? "✅ Ready for Prediction" : "⏳ Buffer not Ready"
     property bool showDirLabels: false
     property bool showSpeedLabels: false
     property bool show1hLabels: false
@@ -67,59 +60,8 @@ Item {
 
             directionText = deg.toFixed(1) + "° (" + getCardinalDirection(deg) + ")"
             speedText = windPredictionModel.predictionSpeed.toFixed(2) + " m/s"
-            bufferStatusText = windPredictionModel.bufferReady ? "✅ Ready for Prediction" : "⏳ Buffer not Ready"
-
-            // Bersihkan semua series
-            series15mDir.clear();  series15mSpeed.clear()
-            series1hDir.clear();   series1hSpeed.clear()
-            series3hDir.clear();   series3hSpeed.clear()
-            series6hDir.clear();   series6hSpeed.clear()
-
-            // Model Chart per horizon
-            dirChartModel = []
-            speedChartModel = []
-            chart1hDirModel = []
-            chart1hSpeedModel = []
-            chart3hDirModel = []
-            chart3hSpeedModel = []
-            chart6hDirModel = []
-            chart6hSpeedModel = []
-
-            // === 15m ===
-            for (let i = 0; i < windPredictionModel.chart15m.length; i++) {
-                let d = windPredictionModel.chart15m[i]
-                series15mDir.append(i, d.dir)
-                series15mSpeed.append(i, d.speed)
-                dirChartModel.push({ index: i, value: d.dir, timestamp: d.timestamp })
-                speedChartModel.push({ index: i, value: d.speed, timestamp: d.timestamp })
-            }
-
-            // === 1h ===
-            for (let i = 0; i < windPredictionModel.chart1h.length; i++) {
-                let d = windPredictionModel.chart1h[i]
-                series1hDir.append(i, d.dir)
-                series1hSpeed.append(i, d.speed)
-                chart1hDirModel.push({ index: i, value: d.dir, timestamp: d.timestamp })
-                chart1hSpeedModel.push({ index: i, value: d.speed, timestamp: d.timestamp })
-            }
 
-            // === 3h ===
-            for (let i = 0; i < windPredictionModel.chart3h.length; i++) {
-                let d = windPredictionModel.chart3h[i]
-                series3hDir.append(i, d.dir)
-                series3hSpeed.append(i, d.speed)
-                chart3hDirModel.push({ index: i, value: d.dir, timestamp: d.timestamp })
-                chart3hSpeedModel.push({ index: i, value: d.speed, timestamp: d.timestamp })
-            }
-
-            // === 6h ===
-            for (let i = 0; i < windPredictionModel.chart6h.length; i++) {
-                let d = windPredictionModel.chart6h[i]
-                series6hDir.append(i, d.dir)
-                series6hSpeed.append(i, d.speed)
-                chart6hDirModel.push({ index: i, value: d.dir, timestamp: d.timestamp })
-                chart6hSpeedModel.push({ index: i, value: d.speed, timestamp: d.timestamp })
-            }
+            // Titik grafik & label mengikuti model list per horizon (VXYModelMapper / Repeater)
 
             // Tampilkan label setelah update
             showDirLabels = false
@@ -306,13 +248,64 @@ Item {
                         }
                     }
 
-                    Button {
-                        text: "🔮 Predict"
-                        font.pixelSize: 16
-                        width: 220
-                        height: 42
+                    RowLayout {
+                        spacing: 12
+                        Layout.alignment: Qt.AlignHCenter
+
+                        Button {
+                            text: "🔮 Predict"
+                            font.pixelSize: 16
+                            implicitWidth: 160
+                            implicitHeight: 42
+                            enabled: !windPredictionModel.busy
+                            onClicked: windPredictionModel.predictNow()
+                        }
+
+                        // Semua horizon sekaligus (fitur dibangun sekali, hasil tampil bersamaan)
+                        Button {
+                            text: "🔮 Predict All"
+                            font.pixelSize: 16
+                            implicitWidth: 160
+                            implicitHeight: 42
+                            enabled: !windPredictionModel.busy
+                            onClicked: windPredictionModel.predictAll()
+                        }
+                    }
+
+                    RowLayout {
+                        spacing: 16
+                        visible: windPredictionModel.forecastAll.length > 1
+                        Layout.alignment: Qt.AlignHCenter
+
+                        Repeater {
+                            model: windPredictionModel.forecastAll
+                            delegate: Text {
+                                text: "+" + modelData.horizon + ": " + modelData.speed.toFixed(2) + " m/s, " + modelData.dir.toFixed(0) + "°"
+                                font.pixelSize: 14
+                                color: settingsManager.darkMode ? Theme.darkText : Theme.lightText
+                            }
+                        }
+                    }
+
+                    // Verifikasi forecast vs observasi (rolling per horizon)
+                    Column {
+                        spacing: 2
                         Layout.alignment: Qt.AlignHCenter
-                        onClicked: windPredictionModel.predictNow()
+
+                        Repeater {
+                            model: windPredictionModel.verification
+                            delegate: Text {
+                                function fmt(v, digits) { return v === null || v === undefined ? "-" : v.toFixed(digits) }
+                                text: "+" + modelData.horizon + "  n=" + modelData.n +
+                                      "  MAE " + fmt(modelData.mae, 2) + " m/s" +
+                                      "  RMSE " + fmt(modelData.rmse, 2) + " m/s" +
+                                      "  Dir " + fmt(modelData.dirError, 0) + "°" +
+                                      "  Vec " + fmt(modelData.vectorRmse, 2) + " m/s"
+                                visible: modelData.n > 0
+                                font.pixelSize: 13
+                                color: settingsManager.darkMode ? "#aaa" : "gray"
+                            }
+                        }
                     }
 
                     Text {
@@ -343,19 +336,19 @@ Item {
                                 height: dirChart.height
 
                                 Repeater {
-                                    model: dirChartModel
+                                    model: windPredictionModel.chart15mModel
                                     delegate: Item {
                                         width: 1; height: 1
 
-                                        property var pt: (typeof modelData.value === 'number')
-                                                        ? dirChart.mapToPosition(Qt.point(modelData.index, modelData.value), series15mDir)
+                                        property var pt: (typeof model.dir === 'number')
+                                                        ? dirChart.mapToPosition(Qt.point(model.sample, model.dir), series15mDir)
                                                         : Qt.point(0, 0)
 
                                         Text {
-                                            visible: modelData.value !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.dir !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 30
-                                            text: modelData.value !== undefined ? modelData.value.toFixed(1) + "°" : "-"
+                                            text: model.dir !== undefined ? model.dir.toFixed(1) + "°" : "-"
                                             font.pixelSize: 12
                                             font.bold: true
                                             color: settingsManager.darkMode ? "white" : "black"
@@ -363,10 +356,10 @@ Item {
                                         }
 
                                         Text {
-                                            visible: modelData.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 15
-                                            text: modelData.timestamp !== undefined ? modelData.timestamp : "-"
+                                            text: model.timestamp !== undefined ? model.timestamp : "-"
                                             font.pixelSize: 10
                                             color: "gray"
                                             z: 100
@@ -383,19 +376,19 @@ Item {
                                 height: speedChart.height
 
                                 Repeater {
-                                    model: speedChartModel
+                                    model: windPredictionModel.chart15mModel
                                     delegate: Item {
                                         width: 1; height: 1
 
-                                        property var pt: (typeof modelData.value === 'number')
-                                                        ? speedChart.mapToPosition(Qt.point(modelData.index, modelData.value), series15mSpeed)
+                                        property var pt: (typeof model.speed === 'number')
+                                                        ? speedChart.mapToPosition(Qt.point(model.sample, model.speed), series15mSpeed)
                                                         : Qt.point(0, 0)
 
                                         Text {
-                                            visible: modelData.value !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.speed !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 30
-                                            text: modelData.value !== undefined ? modelData.value.toFixed(2) + " m/s" : "-"
+                                            text: model.speed !== undefined ? model.speed.toFixed(2) + " m/s" : "-"
                                             font.pixelSize: 12
                                             font.bold: true
                                             color: settingsManager.darkMode ? "white" : "black"
@@ -403,10 +396,10 @@ Item {
                                         }
 
                                         Text {
-                                            visible: modelData.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 15
-                                            text: modelData.timestamp !== undefined ? modelData.timestamp : "-"
+                                            text: model.timestamp !== undefined ? model.timestamp : "-"
                                             font.pixelSize: 10
                                             color: "gray"
                                             z: 100
@@ -423,19 +416,19 @@ Item {
                                 height: dirChart1h.height
 
                                 Repeater {
-                                    model: chart1hDirModel
+                                    model: windPredictionModel.chart1hModel
                                     delegate: Item {
                                         width: 1; height: 1
 
-                                        property var pt: (typeof modelData.value === 'number')
-                                                        ? dirChart1h.mapToPosition(Qt.point(modelData.index, modelData.value), series1hDir)
+                                        property var pt: (typeof model.dir === 'number')
+                                                        ? dirChart1h.mapToPosition(Qt.point(model.sample, model.dir), series1hDir)
                                                         : Qt.point(0, 0)
 
                                         Text {
-                                            visible: modelData.value !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.dir !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 30
-                                            text: modelData.value !== undefined ? modelData.value.toFixed(1) + "°" : "-"
+                                            text: model.dir !== undefined ? model.dir.toFixed(1) + "°" : "-"
                                             font.pixelSize: 12
                                             font.bold: true
                                             color: settingsManager.darkMode ? "white" : "black"
@@ -443,10 +436,10 @@ Item {
                                         }
 
                                         Text {
-                                            visible: modelData.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 15
-                                            text: modelData.timestamp !== undefined ? modelData.timestamp : "-"
+                                            text: model.timestamp !== undefined ? model.timestamp : "-"
                                             font.pixelSize: 10
                                             color: "gray"
                                             z: 100
@@ -462,19 +455,19 @@ Item {
                                 height: speedChart1h.height
 
                                 Repeater {
-                                    model: chart1hSpeedModel
+                                    model: windPredictionModel.chart1hModel
                                     delegate: Item {
                                         width: 1; height: 1
 
-                                        property var pt: (typeof modelData.value === 'number')
-                                                        ? speedChart1h.mapToPosition(Qt.point(modelData.index, modelData.value), series1hSpeed)
+                                        property var pt: (typeof model.speed === 'number')
+                                                        ? speedChart1h.mapToPosition(Qt.point(model.sample, model.speed), series1hSpeed)
                                                         : Qt.point(0, 0)
 
                                         Text {
-                                            visible: modelData.value !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.speed !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 30
-                                            text: modelData.value !== undefined ? modelData.value.toFixed(2) + " m/s" : "-"
+                                            text: model.speed !== undefined ? model.speed.toFixed(2) + " m/s" : "-"
                                             font.pixelSize: 12
                                             font.bold: true
                                             color: settingsManager.darkMode ? "white" : "black"
@@ -482,10 +475,10 @@ Item {
                                         }
 
                                         Text {
-                                            visible: modelData.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 15
-                                            text: modelData.timestamp !== undefined ? modelData.timestamp : "-"
+                                            text: model.timestamp !== undefined ? model.timestamp : "-"
                                             font.pixelSize: 10
                                             color: "gray"
                                             z: 100
@@ -501,19 +494,19 @@ Item {
                                 height: dirChart3h.height
 
                                 Repeater {
-                                    model: chart3hDirModel
+                                    model: windPredictionModel.chart3hModel
                                     delegate: Item {
                                         width: 1; height: 1
 
-                                        property var pt: (typeof modelData.value === 'number')
-                                                        ? dirChart3h.mapToPosition(Qt.point(modelData.index, modelData.value), series3hDir)
+                                        property var pt: (typeof model.dir === 'number')
+                                                        ? dirChart3h.mapToPosition(Qt.point(model.sample, model.dir), series3hDir)
                                                         : Qt.point(0, 0)
 
                                         Text {
-                                            visible: modelData.value !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.dir !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 30
-                                            text: modelData.value !== undefined ? modelData.value.toFixed(1) + "°" : "-"
+                                            text: model.dir !== undefined ? model.dir.toFixed(1) + "°" : "-"
                                             font.pixelSize: 12
                                             font.bold: true
                                             color: settingsManager.darkMode ? "white" : "black"
@@ -521,10 +514,10 @@ Item {
                                         }
 
                                         Text {
-                                            visible: modelData.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 15
-                                            text: modelData.timestamp !== undefined ? modelData.timestamp : "-"
+                                            text: model.timestamp !== undefined ? model.timestamp : "-"
                                             font.pixelSize: 10
                                             color: "gray"
                                             z: 100
@@ -540,19 +533,19 @@ Item {
                                 height: speedChart3h.height
 
                                 Repeater {
-                                    model: chart3hSpeedModel
+                                    model: windPredictionModel.chart3hModel
                                     delegate: Item {
                                         width: 1; height: 1
 
-                                        property var pt: (typeof modelData.value === 'number')
-                                                        ? speedChart3h.mapToPosition(Qt.point(modelData.index, modelData.value), series3hSpeed)
+                                        property var pt: (typeof model.speed === 'number')
+                                                        ? speedChart3h.mapToPosition(Qt.point(model.sample, model.speed), series3hSpeed)
                                                         : Qt.point(0, 0)
 
                                         Text {
-                                            visible: modelData.value !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.speed !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 30
-                                            text: modelData.value !== undefined ? modelData.value.toFixed(2) + " m/s" : "-"
+                                            text: model.speed !== undefined ? model.speed.toFixed(2) + " m/s" : "-"
                                             font.pixelSize: 12
                                             font.bold: true
                                             color: settingsManager.darkMode ? "white" : "black"
@@ -560,10 +553,10 @@ Item {
                                         }
 
                                         Text {
-                                            visible: modelData.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 15
-                                            text: modelData.timestamp !== undefined ? modelData.timestamp : "-"
+                                            text: model.timestamp !== undefined ? model.timestamp : "-"
                                             font.pixelSize: 10
                                             color: "gray"
                                             z: 100
@@ -579,19 +572,19 @@ Item {
                                 height: dirChart6h.height
 
                                 Repeater {
-                                    model: chart6hDirModel
+                                    model: windPredictionModel.chart6hModel
                                     delegate: Item {
                                         width: 1; height: 1
 
-                                        property var pt: (typeof modelData.value === 'number')
-                                                        ? dirChart6h.mapToPosition(Qt.point(modelData.index, modelData.value), series6hDir)
+                                        property var pt: (typeof model.dir === 'number')
+                                                        ? dirChart6h.mapToPosition(Qt.point(model.sample, model.dir), series6hDir)
                                                         : Qt.point(0, 0)
 
                                         Text {
-                                            visible: modelData.value !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.dir !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 30
-                                            text: modelData.value !== undefined ? modelData.value.toFixed(1) + "°" : "-"
+                                            text: model.dir !== undefined ? model.dir.toFixed(1) + "°" : "-"
                                             font.pixelSize: 12
                                             font.bold: true
                                             color: settingsManager.darkMode ? "white" : "black"
@@ -599,10 +592,10 @@ Item {
                                         }
 
                                         Text {
-                                            visible: modelData.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 15
-                                            text: modelData.timestamp !== undefined ? modelData.timestamp : "-"
+                                            text: model.timestamp !== undefined ? model.timestamp : "-"
                                             font.pixelSize: 10
                                             color: "gray"
                                             z: 100
@@ -618,19 +611,19 @@ Item {
                                 height: speedChart6h.height
 
                                 Repeater {
-                                    model: chart6hSpeedModel
+                                    model: windPredictionModel.chart6hModel
                                     delegate: Item {
                                         width: 1; height: 1
 
-                                        property var pt: (typeof modelData.value === 'number')
-                                                        ? speedChart6h.mapToPosition(Qt.point(modelData.index, modelData.value), series6hSpeed)
+                                        property var pt: (typeof model.speed === 'number')
+                                                        ? speedChart6h.mapToPosition(Qt.point(model.sample, model.speed), series6hSpeed)
                                                         : Qt.point(0, 0)
 
                                         Text {
-                                            visible: modelData.value !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.speed !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 30
-                                            text: modelData.value !== undefined ? modelData.value.toFixed(2) + " m/s" : "-"
+                                            text: model.speed !== undefined ? model.speed.toFixed(2) + " m/s" : "-"
                                             font.pixelSize: 12
                                             font.bold: true
                                             color: settingsManager.darkMode ? "white" : "black"
@@ -638,10 +631,10 @@ Item {
                                         }
 
                                         Text {
-                                            visible: modelData.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
+                                            visible: model.timestamp !== undefined && !isNaN(pt.x) && !isNaN(pt.y)
                                             x: pt.x - 15
                                             y: pt.y - 15
-                                            text: modelData.timestamp !== undefined ? modelData.timestamp : "-"
+                                            text: model.timestamp !== undefined ? model.timestamp : "-"
                                             font.pixelSize: 10
                                             color: "gray"
                                             z: 100
@@ -671,7 +664,7 @@ Item {
                                     antialiasing: true
                                     theme: settingsManager.darkMode ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
 
-                                    ValueAxis { id: xAxis15d; min: 0; max: 4; titleText: "Index" }
+                                    ValueAxis { id: xAxis15d; min: windPredictionModel.chart15mModel.firstSample; max: windPredictionModel.chart15mModel.firstSample + 4; titleText: "Index" }
                                     ValueAxis { id: yAxis15d; min: 0; max: 360; titleText: "°" }
 
                                     LineSeries {
@@ -682,6 +675,12 @@ Item {
                                         color: "orange"
                                         pointsVisible: true
                                     }
+                                    VXYModelMapper {
+                                        model: windPredictionModel.chart15mModel
+                                        series: series15mDir
+                                        xColumn: 0
+                                        yColumn: 3
+                                    }
                                 }
                                 // === LABEL OVERLAY UNTUK DIRECTION +15m ===
                                 Loader {
@@ -706,7 +705,7 @@ Item {
                                     antialiasing: true
                                     theme: settingsManager.darkMode ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
 
-                                    ValueAxis { id: xAxis15s; min: 0; max: 4; titleText: "Index" }
+                                    ValueAxis { id: xAxis15s; min: windPredictionModel.chart15mModel.firstSample; max: windPredictionModel.chart15mModel.firstSample + 4; titleText: "Index" }
                                     ValueAxis { id: yAxis15s; min: 0; max: 10; titleText: "m/s" }
 
                                     LineSeries {
@@ -717,6 +716,12 @@ Item {
                                         color: "teal"
                                         pointsVisible: true
                                     }
+                                    VXYModelMapper {
+                                        model: windPredictionModel.chart15mModel
+                                        series: series15mSpeed
+                                        xColumn: 0
+                                        yColumn: 2
+                                    }
                                 }
                                 // === LABEL OVERLAY UNTUK SPEED +15m ===
                                 Loader {
@@ -741,7 +746,7 @@ Item {
                                     antialiasing: true
                                     theme: settingsManager.darkMode ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
 
-                                    ValueAxis { id: xAxis1d; min: 0; max: 4; titleText: "Index" }
+                                    ValueAxis { id: xAxis1d; min: windPredictionModel.chart1hModel.firstSample; max: windPredictionModel.chart1hModel.firstSample + 4; titleText: "Index" }
                                     ValueAxis { id: yAxis1d; min: 0; max: 360; titleText: "°" }
 
                                     LineSeries {
@@ -752,6 +757,12 @@ Item {
                                         color: "orange"
                                         name: "+1h Direction"
                                     }
+                                    VXYModelMapper {
+                                        model: windPredictionModel.chart1hModel
+                                        series: series1hDir
+                                        xColumn: 0
+                                        yColumn: 3
+                                    }
                                 }
 
                                 Loader {
@@ -775,7 +786,7 @@ Item {
                                     antialiasing: true
                                     theme: settingsManager.darkMode ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
 
-                                    ValueAxis { id: xAxis1s; min: 0; max: 4; titleText: "Index" }
+                                    ValueAxis { id: xAxis1s; min: windPredictionModel.chart1hModel.firstSample; max: windPredictionModel.chart1hModel.firstSample + 4; titleText: "Index" }
                                     ValueAxis { id: yAxis1s; min: 0; max: 10; titleText: "m/s" }
 
                                     LineSeries {
@@ -786,6 +797,12 @@ Item {
                                         color: "teal"
                                         name: "+1h Speed"
                                     }
+                                    VXYModelMapper {
+                                        model: windPredictionModel.chart1hModel
+                                        series: series1hSpeed
+                                        xColumn: 0
+                                        yColumn: 2
+                                    }
                                 }
 
                                 Loader {
@@ -809,7 +826,7 @@ Item {
                                     antialiasing: true
                                     theme: settingsManager.darkMode ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
 
-                                    ValueAxis { id: xAxis3d; min: 0; max: 4; titleText: "Index" }
+                                    ValueAxis { id: xAxis3d; min: windPredictionModel.chart3hModel.firstSample; max: windPredictionModel.chart3hModel.firstSample + 4; titleText: "Index" }
                                     ValueAxis { id: yAxis3d; min: 0; max: 360; titleText: "°" }
 
                                     LineSeries {
@@ -820,6 +837,12 @@ Item {
                                         color: "orange"
                                         name: "+3h Direction"
                                     }
+                                    VXYModelMapper {
+                                        model: windPredictionModel.chart3hModel
+                                        series: series3hDir
+                                        xColumn: 0
+                                        yColumn: 3
+                                    }
                                 }
 
                                 Loader {
@@ -842,7 +865,7 @@ Item {
                                     antialiasing: true
                                     theme: settingsManager.darkMode ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
 
-                                    ValueAxis { id: xAxis3s; min: 0; max: 4; titleText: "Index" }
+                                    ValueAxis { id: xAxis3s; min: windPredictionModel.chart3hModel.firstSample; max: windPredictionModel.chart3hModel.firstSample + 4; titleText: "Index" }
                                     ValueAxis { id: yAxis3s; min: 0; max: 10; titleText: "m/s" }
 
                                     LineSeries {
@@ -853,6 +876,12 @@ Item {
                                         color: "teal"
                                         name: "+3h Speed"
                                     }
+                                    VXYModelMapper {
+                                        model: windPredictionModel.chart3hModel
+                                        series: series3hSpeed
+                                        xColumn: 0
+                                        yColumn: 2
+                                    }
                                 }
 
                                 Loader {
@@ -876,7 +905,7 @@ Item {
                                     antialiasing: true
                                     theme: settingsManager.darkMode ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
 
-                                    ValueAxis { id: xAxis6d; min: 0; max: 4; titleText: "Index" }
+                                    ValueAxis { id: xAxis6d; min: windPredictionModel.chart6hModel.firstSample; max: windPredictionModel.chart6hModel.firstSample + 4; titleText: "Index" }
                                     ValueAxis { id: yAxis6d; min: 0; max: 360; titleText: "°" }
 
                                     LineSeries {
@@ -887,6 +916,12 @@ Item {
                                         color: "orange"
                                         name: "+6h Direction"
                                     }
+                                    VXYModelMapper {
+                                        model: windPredictionModel.chart6hModel
+                                        series: series6hDir
+                                        xColumn: 0
+                                        yColumn: 3
+                                    }
                                 }
 
                                 Loader {
@@ -909,7 +944,7 @@ Item {
                                     antialiasing: true
                                     theme: settingsManager.darkMode ? ChartView.ChartThemeDark : ChartView.ChartThemeLight
 
-                                    ValueAxis { id: xAxis6s; min: 0; max: 4; titleText: "Index" }
+                                    ValueAxis { id: xAxis6s; min: windPredictionModel.chart6hModel.firstSample; max: windPredictionModel.chart6hModel.firstSample + 4; titleText: "Index" }
                                     ValueAxis { id: yAxis6s; min: 0; max: 10; titleText: "m/s" }
 
                                     LineSeries {
@@ -920,6 +955,12 @@ Item {
                                         color: "teal"
                                         name: "+6h Speed"
                                     }
+                                    VXYModelMapper {
+                                        model: windPredictionModel.chart6hModel
+                                        series: series6hSpeed
+                                        xColumn: 0
+                                        yColumn: 2
+                                    }
                                 }
 
                                 Loader {
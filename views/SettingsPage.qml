@@ -146,6 +146,33 @@ Item {
                     }
                 }
 
+                // History Window (jumlah sampel ring buffer; 1 sampel ≈ 5 detik)
+                GroupBox {
+                    title: "History Window"
+                    Layout.fillWidth: true
+
+                    ColumnLayout {
+                        Layout.fillWidth: true
+                        spacing: 8
+
+                        Repeater {
+                            model: [
+                                { label: "1 jam", samples: 720 },
+                                { label: "6 jam", samples: 4320 },
+                                { label: "24 jam", samples: 17280 },
+                                { label: "3 hari", samples: 51840 }
+                            ]
+
+                            RadioButton {
+                                text: modelData.label
+                                Layout.fillWidth: true
+                                checked: settingsManager.historyCapacity === modelData.samples
+                                onClicked: settingsManager.setHistoryCapacity(modelData.samples)
+                            }
+                        }
+                    }
+                }
+
                 // Spacer agar footer tetap di bawah
                 Item { Layout.fillHeight: true }
 